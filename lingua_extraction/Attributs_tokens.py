@@ -0,0 +1,75 @@
+from functools import lru_cache
+import numpy as np
+from spacy.attrs import POS, TAG, DEP, HEAD, IS_STOP, IS_ALPHA, IS_PUNCT, LOWER, LEMMA
+from spacy.strings import get_string_id
+
+# Attributs lus pour chaque token, dans l'ordre des colonnes du tableau
+colonnes_attributs = [POS, TAG, DEP, HEAD, IS_STOP, IS_ALPHA, IS_PUNCT, LOWER, LEMMA]
+
+
+@lru_cache(maxsize=None)
+def identifiants(chaines):
+    """
+    Retourne les identifiants spaCy (symbole ou empreinte) d'un ensemble d'étiquettes, calculés une seule
+    fois par processus.
+
+    Args:
+        chaines (tuple): Les étiquettes ('VERB', 'VBG', 'nsubj', ...).
+
+    Returns:
+        numpy.ndarray: Les identifiants, comparables aux colonnes d'AttributsTokens.
+    """
+    return np.array([get_string_id(chaine) for chaine in chaines], dtype=np.uint64)
+
+
+class AttributsTokens:
+    """
+    Attributs de tous les tokens d'un Doc, lus en un seul appel à `Doc.to_array`.
+
+    Chaque attribut est une colonne NumPy : les caractéristiques de comptage sont calculées avec des
+    masques, `np.isin` sur les identifiants des étiquettes recherchées et des comptes vectorisés, sans
+    lire les attributs token par token en Python.
+    """
+
+    def __init__(self, doc):
+        """
+        Args:
+            doc (spacy.tokens.Doc): Le texte déjà analysé par le modèle spaCy.
+        """
+        self.strings = doc.vocab.strings
+        tableau = doc.to_array(colonnes_attributs).reshape(len(doc), len(colonnes_attributs))
+        self.nombre = len(doc)
+        self.indices = np.arange(self.nombre)
+        self.pos = tableau[:, 0]
+        self.tag = tableau[:, 1]
+        self.dep = tableau[:, 2]
+        # HEAD est la position de la tête relative au token (0 pour la racine d'une phrase)
+        self.tete = self.indices + tableau[:, 3].astype(np.int64)
+        self.est_stop = tableau[:, 4].astype(bool)
+        self.est_alpha = tableau[:, 5].astype(bool)
+        self.est_ponctuation = tableau[:, 6].astype(bool)
+        self.minuscules = tableau[:, 7]
+        self.lemme = tableau[:, 8]
+
+    def masque(self, colonne, chaines):
+        """
+        Indique les tokens dont l'attribut est l'une des étiquettes données.
+
+        Args:
+            colonne (numpy.ndarray): La colonne de l'attribut (`self.pos`, `self.tag`, `self.dep`, ...).
+            chaines (iterable): Les étiquettes recherchées.
+
+        Returns:
+            numpy.ndarray: Un masque booléen, un élément par token.
+        """
+        return np.isin(colonne, identifiants(tuple(chaines)))
+
+    def compter(self, colonne):
+        """
+        Compte les occurrences de chaque valeur d'un attribut.
+
+        Returns:
+            dict: {étiquette: nombre}, dans l'ordre de la première occurrence de chaque étiquette.
+        """
+        valeurs, premieres, nombres = np.unique(colonne, return_index=True, return_counts=True)
+        return {self.strings[int(valeurs[k])]: int(nombres[k]) for k in np.argsort(premieres)}
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+import spacy
+from spacy.tokens import DocBin
+from .Marqueurs_transcription import marqueurs_transcription, preparer_vocabulaire
+from .load_models import analyser_textes
+
+# Clé des données utilisateur sous laquelle le tenseur du Doc est conservé (DocBin ne le sérialise pas,
+# alors que les vecteurs des tokens en dépendent pour les modèles sans vecteurs statiques)
+cle_tenseur = "lingua_extraction_tensor"
+
+def chemin_du_modele(nom_du_modele):
+    """
+    Retourne le dossier contenant les données d'un modèle spaCy, sans charger le modèle.
+
+    Args:
+        nom_du_modele (str): Le nom du paquet (par exemple 'en_core_web_sm') ou le chemin du modèle.
+
+    Returns:
+        Path: Le dossier contenant config.cfg, meta.json et le vocabulaire du modèle.
+    """
+    if spacy.util.is_package(nom_du_modele):
+        racine = spacy.util.get_package_path(nom_du_modele)
+        meta = spacy.util.get_model_meta(racine)
+        return racine / f"{meta['lang']}_{meta['name']}-{meta['version']}"
+    return Path(nom_du_modele)
+
+@lru_cache(maxsize=None)
+def empreinte_du_modele(nom_du_modele, exclude=()):
+    """
+    Calcule l'empreinte d'un modèle spaCy à partir de son nom, de sa version, de sa configuration, des
+    composants exclus et des marqueurs de transcription ajoutés au tokenizer. Deux analyses ne partagent une entrée du cache que si leurs empreintes sont égales.
+
+    Args:
+        nom_du_modele (str): Le nom du paquet ou le chemin du modèle.
+        exclude (tuple): Les composants exclus au chargement.
+
+    Returns:
+        str: L'empreinte hexadécimale du modèle.
+    """
+    chemin = chemin_du_modele(nom_du_modele)
+    meta = spacy.util.get_model_meta(chemin)
+    description = {
+        "nom": f"{meta['lang']}_{meta['name']}",
+        "version": meta["version"],
+        "spacy": spacy.__version__,
+        "config": (chemin / "config.cfg").read_text(encoding="utf-8"),
+        "exclude": sorted(exclude),
+        "marqueurs": marqueurs_transcription,
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+@lru_cache(maxsize=None)
+def charger_vocabulaire(nom_du_modele):
+    """
+    Charge uniquement le vocabulaire d'un modèle spaCy (chaînes, vecteurs et tables de recherche),
+    ce qui suffit pour relire les Doc enregistrés dans le cache sans exécuter le pipeline.
+    """
+    chemin = chemin_du_modele(nom_du_modele)
+    meta = spacy.util.get_model_meta(chemin)
+    nlp = spacy.util.get_lang_class(meta["lang"])()
+    nlp.vocab.from_disk(chemin / "vocab")
+    return preparer_vocabulaire(nlp.vocab)
+
+class CacheAnalyses:
+    """
+    Cache persistant des analyses spaCy, enregistrées sur disque au format DocBin.
+
+    Chaque Doc est indexé par l'empreinte du texte nettoyé et par celle du modèle (nom, version,
+    configuration et composants exclus). Lorsque tous les textes d'un lot sont déjà dans le cache,
+    le modèle n'est pas chargé : seul son vocabulaire l'est.
+    """
+
+    def __init__(self, dossier):
+        """
+        Args:
+            dossier (str): Le dossier dans lequel les analyses sont enregistrées.
+        """
+        self.dossier = dossier
+        self.succes = 0
+        self.echecs = 0
+
+    def cle(self, texte, empreinte):
+        """Retourne la clé d'un texte analysé par le modèle dont l'empreinte est donnée."""
+        return hashlib.sha256(f"{empreinte}\n{texte}".encode("utf-8")).hexdigest()
+
+    def _chemin(self, cle):
+        return os.path.join(self.dossier, cle[:2], f"{cle}.spacy")
+
+    def lire(self, cle, vocab):
+        """Retourne le Doc enregistré sous la clé donnée, ou None s'il est absent ou illisible."""
+        chemin = self._chemin(cle)
+        if not os.path.exists(chemin):
+            return None
+        try:
+            with open(chemin, "rb") as f:
+                doc = next(DocBin().from_bytes(f.read()).get_docs(vocab))
+        except Exception:
+            return None
+        tenseur = doc.user_data.pop(cle_tenseur, None)
+        if tenseur is not None:
+            doc.tensor = tenseur
+        return doc
+
+    def ecrire(self, cle, doc):
+        """Enregistre le Doc sous la clé donnée ; l'écriture est atomique pour les traitements parallèles."""
+        chemin = self._chemin(cle)
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        docbin = DocBin(store_user_data=True)
+        if doc.tensor is not None and doc.tensor.size:
+            doc.user_data[cle_tenseur] = doc.tensor
+        try:
+            docbin.add(doc)
+        finally:
+            doc.user_data.pop(cle_tenseur, None)
+        descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), suffix=".tmp")
+        with os.fdopen(descripteur, "wb") as f:
+            f.write(docbin.to_bytes())
+        os.replace(temporaire, chemin)
+
+    def analyser(self, textes, nom_du_modele, exclude, charger_modele, batch_size=64):
+        """
+        Analyse une suite de textes en réutilisant les Doc du cache.
+
+        Args:
+            textes (list): Les textes à analyser.
+            nom_du_modele (str): Le nom du paquet ou le chemin du modèle spaCy.
+            exclude (list): Les composants exclus au chargement du modèle.
+            charger_modele (callable): Fonction sans argument qui charge et retourne le modèle spaCy ;
+                                       elle n'est appelée que si un texte est absent du cache.
+            batch_size (int): Le nombre de textes envoyés ensemble au modèle spaCy.
+
+        Yields:
+            Doc ou Exception: L'analyse de chaque texte, ou l'erreur levée par le chargement du modèle ou par
+                              son analyse, dans l'ordre des textes. Les erreurs ne sont pas mises en cache.
+        """
+        empreinte = empreinte_du_modele(nom_du_modele, tuple(exclude or ()))
+        cles = [self.cle(texte, empreinte) for texte in textes]
+        absents = [i for i, cle in enumerate(cles) if not os.path.exists(self._chemin(cle))]
+
+        model = erreur = None
+        if absents:
+            try:
+                model = charger_modele()
+            except Exception as e:
+                # Le modèle manquant n'empêche pas de relire les textes déjà en cache
+                erreur = e
+        vocab = model.vocab if model is not None else charger_vocabulaire(nom_du_modele)
+        if model is not None:
+            nouveaux = analyser_textes(model, [textes[i] for i in absents], batch_size=batch_size)
+        else:
+            nouveaux = iter([erreur] * len(absents))
+        absents = set(absents)
+
+        for i, (texte, cle) in enumerate(zip(textes, cles)):
+            doc = None if i in absents else self.lire(cle, vocab)
+            if doc is not None:
+                self.succes += 1
+                yield doc
+                continue
+            self.echecs += 1
+            if i in absents:
+                doc = next(nouveaux)
+            else:
+                # Entrée illisible : le texte est analysé à nouveau
+                try:
+                    model = model or charger_modele()
+                    doc = model(texte)
+                except Exception as e:
+                    doc = e
+            if not isinstance(doc, Exception):
+                self.ecrire(cle, doc)
+            yield doc
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+
+class CacheInferences:
+    """
+    Cache persistant (SQLite) des étiquettes prédites par les modèles HuggingFace.
+
+    Une étiquette est indexée par l'empreinte du texte, l'identifiant du modèle et sa révision : les
+    transcriptions identiques, les segments répétés et les nouvelles exécutions ne repassent pas par le
+    modèle. Au-delà de `taille_max` entrées, les entrées les moins récemment utilisées sont supprimées.
+    """
+
+    def __init__(self, chemin, taille_max=100000):
+        """
+        Args:
+            chemin (str): Le chemin de la base SQLite (créée si besoin).
+            taille_max (int): Le nombre maximal d'entrées conservées.
+        """
+        self.chemin = chemin
+        self.taille_max = taille_max
+        self.succes = 0
+        self.echecs = 0
+        self._connexion = None
+
+    @property
+    def connexion(self):
+        # La connexion est ouverte à la première utilisation, dans le processus qui l'utilise
+        if self._connexion is None:
+            dossier = os.path.dirname(os.path.abspath(self.chemin))
+            os.makedirs(dossier, exist_ok=True)
+            self._connexion = sqlite3.connect(self.chemin, timeout=30)
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS inferences ("
+                "cle TEXT PRIMARY KEY, modele TEXT, revision TEXT, etiquette TEXT, dernier_acces REAL)")
+            self._connexion.execute("CREATE INDEX IF NOT EXISTS acces ON inferences (dernier_acces)")
+        return self._connexion
+
+    def cle(self, texte, modele, revision):
+        """Retourne la clé d'un texte pour un modèle et une révision."""
+        return hashlib.sha256(f"{modele}\n{revision}\n{texte}".encode("utf-8")).hexdigest()
+
+    def lire(self, textes, modele, revision):
+        """
+        Retourne l'étiquette en cache de chaque texte, ou None si le texte n'a pas encore été analysé.
+        """
+        cles = [self.cle(texte, modele, revision) for texte in textes]
+        trouvees = {}
+        for debut in range(0, len(cles), 500):
+            lot = cles[debut:debut + 500]
+            requete = f"SELECT cle, etiquette FROM inferences WHERE cle IN ({','.join('?' * len(lot))})"
+            trouvees.update(self.connexion.execute(requete, lot).fetchall())
+        if trouvees:
+            with self.connexion:
+                self.connexion.executemany("UPDATE inferences SET dernier_acces = ? WHERE cle = ?",
+                                           [(time.time(), cle) for cle in trouvees])
+        self.succes += sum(cle in trouvees for cle in cles)
+        self.echecs += sum(cle not in trouvees for cle in cles)
+        return [trouvees.get(cle) for cle in cles]
+
+    def ecrire(self, textes, etiquettes, modele, revision):
+        """Enregistre les étiquettes prédites, puis supprime les entrées les plus anciennes si besoin."""
+        maintenant = time.time()
+        with self.connexion:
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO inferences VALUES (?, ?, ?, ?, ?)",
+                [(self.cle(texte, modele, revision), modele, revision, etiquette, maintenant)
+                 for texte, etiquette in zip(textes, etiquettes)])
+            nombre = self.connexion.execute("SELECT COUNT(*) FROM inferences").fetchone()[0]
+            if nombre > self.taille_max:
+                self.connexion.execute(
+                    "DELETE FROM inferences WHERE cle IN "
+                    "(SELECT cle FROM inferences ORDER BY dernier_acces LIMIT ?)", (nombre - self.taille_max,))
+
+    def fermer(self):
+        if self._connexion is not None:
+            self._connexion.close()
+            self._connexion = None
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import tempfile
+from .Cache_analyses import empreinte_du_modele
+
+
+class CacheResultats:
+    """
+    Cache persistant des variables calculées, par transcription et par extracteur.
+
+    Chaque transcription a une entrée (un fichier JSON) indexée par son texte, sa langue, sa tâche et le
+    modèle spaCy utilisé. L'entrée conserve les variables de chaque extracteur avec l'empreinte de
+    l'extracteur au moment du calcul : lors d'une nouvelle exécution, seuls les extracteurs dont
+    l'empreinte a changé (code, version ou lexiques modifiés) sont recalculés, puis fusionnés avec
+    les autres. Si rien n'a changé, le texte n'est même pas analysé par spaCy.
+    """
+
+    def __init__(self, dossier):
+        """
+        Args:
+            dossier (str): Le dossier dans lequel les variables sont enregistrées.
+        """
+        self.dossier = dossier
+        self.reutilises = 0
+        self.recalcules = 0
+
+    def cle(self, transcription, nom_du_modele):
+        """Retourne la clé de la transcription analysée par le modèle donné."""
+        try:
+            modele = empreinte_du_modele(nom_du_modele)
+        except Exception:
+            # Modèle introuvable : son nom suffit, le chargement échouera de toute façon
+            modele = nom_du_modele
+        description = [modele, transcription["langue"], transcription.get("tache") or "",
+                       transcription["texte"], transcription.get("texte_original") or ""]
+        # Le découpage en interventions change la cohérence entre interventions
+        if transcription.get("interventions"):
+            description.append(transcription["interventions"])
+        return hashlib.sha256(json.dumps(description).encode("utf-8")).hexdigest()
+
+    def _chemin(self, cle):
+        return os.path.join(self.dossier, cle[:2], f"{cle}.json")
+
+    def lire(self, cle):
+        """Retourne l'entrée {nom de l'extracteur: {"empreinte", "variables"}} d'une transcription."""
+        try:
+            with open(self._chemin(cle), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def a_jour(self, entree, extracteurs):
+        """Retourne les variables en cache des extracteurs dont l'empreinte n'a pas changé {nom: variables}."""
+        return {ext.nom: entree[ext.nom]["variables"] for ext in extracteurs
+                if ext.nom in entree and entree[ext.nom].get("empreinte") == ext.empreinte}
+
+    def ecrire(self, cle, entree, par_extracteur, extracteurs):
+        """
+        Fusionne les variables calculées dans l'entrée de la transcription et l'enregistre.
+
+        Les variables des extracteurs qui n'ont pas été exécutés cette fois-ci sont conservées.
+        """
+        for ext in extracteurs:
+            entree[ext.nom] = {"empreinte": ext.empreinte, "variables": par_extracteur[ext.nom]}
+        chemin = self._chemin(cle)
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), suffix=".tmp")
+        with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+            json.dump(entree, f)
+        os.replace(temporaire, chemin)
@@ -1,8 +1,5 @@
 import math
-import pandas as pd
 import numpy as np
-import nltk
-from nltk.corpus import wordnet as wn
 import os
 from .Database_linguistique import pos_mapping, deictic_pronouns, termes_indefinis
 
@@ -28,101 +25,84 @@ def rename_pos_labels(data):
     
     return renamed_data
 
-def Parts_of_Speech(text, nlp):
+def Parts_of_Speech(contexte):
     """
-    Analyse les parties du discours (POS) dans un texte en utilisant un modèle Spacy donné.
+    Analyse les parties du discours (POS) dans un texte déjà analysé par spaCy.
 
-    :param text: Texte à analyser
-    :param nlp: Modèle Spacy chargé
+    :param contexte: Contexte d'extraction contenant le Doc spaCy
     :return: Dictionnaire avec les comptes et pourcentages de chaque classe grammaticale
     """
-    # Traitement du texte
-    doc = nlp(text)
+    attributs = contexte.attributs
 
     # Comptage des parties du discours
-    pos_counts = {}
-    for token in doc:
-        pos = token.pos_
-        pos_counts[pos] = pos_counts.get(pos, 0) + 1
+    pos_counts = attributs.compter(attributs.pos)
 
     # Calcul du nombre total de mots
-    total_words = len(doc)
+    total_words = attributs.nombre
 
     # Calculer les occurrences en nombre absolu et en pourcentage
     results = {pos: {'count': count, 'percentage': (count / total_words) * 100} for pos, count in pos_counts.items()}
 
     return rename_pos_labels(results)
 
-def count_open_closed_class_words(text, nlp):
+def count_open_closed_class_words(contexte):
     """
     Compte le nombre de mots des classes ouvertes et fermées dans un texte analysé avec le modèle SpaCy.
 
     Args:
-        text (str): Le texte à analyser.
-        nlp (spacy.language.Language): Le modèle de traitement de texte SpaCy.
+        contexte (ContexteExtraction): Le contexte d'extraction contenant le Doc spaCy.
 
     Returns:
         tuple: Un tuple contenant le nombre de mots des classes ouvertes (open class) et fermées (closed class).
     """
-    # Analyser le texte avec le modèle Spacy
-    doc = nlp(text)
+    attributs = contexte.attributs
 
     # Catégories de classes ouvertes et fermées
     open_classes = ['NOUN', 'VERB', 'ADJ', 'ADV']
     closed_classes = ['CONJ', 'PRON', 'DET', 'ADP']
 
     # Comptage
-    open_class_count = 0
-    closed_class_count = 0
-
-    for token in doc:
-        if token.pos_ in open_classes:
-            open_class_count += 1
-        elif token.pos_ in closed_classes:
-            closed_class_count += 1
+    open_class_count = int(attributs.masque(attributs.pos, open_classes).sum())
+    closed_class_count = int(attributs.masque(attributs.pos, closed_classes).sum())
 
     return open_class_count, closed_class_count
 
-def compter_verbes_conjugues(texte, langue, nlp):
+def compter_verbes_conjugues(contexte):
     """
     Compte le nombre de verbes conjugués dans un texte donné.
     
     Args:
-    texte (str): Le texte à analyser.
-    langue (str): La langue du texte ('English' ou 'Francais').
-    modele (str): Le modèle spaCy à utiliser pour l'analyse.
+    contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
 
     Returns:
     int: Le nombre de verbes conjugués.
     """
-    if langue not in ['English', 'Francais']:
+    if contexte.langue not in ['English', 'Francais']:
         return "Langue non prise en charge. Veuillez choisir 'English' ou 'Francais'."
 
-    doc = nlp(texte)
+    attributs = contexte.attributs
 
     # Comptage des verbes conjugués (en excluant la forme de base)
-    nombre_verbes = sum(1 for token in doc if token.pos_ == 'VERB' and token.tag_ != 'VB')
+    nombre_verbes = int((attributs.masque(attributs.pos, ['VERB']) & ~attributs.masque(attributs.tag, ['VB'])).sum())
     return nombre_verbes
 
-def compter_gerondifs(texte, langue, nlp):
+def compter_gerondifs(contexte):
     """
     Compte le nombre de gérondifs dans un texte donné.
     
     Args:
-    texte (str): Le texte à analyser.
-    langue (str): La langue du texte ('English' ou 'Francais').
-    modele (str): Le modèle spaCy à utiliser pour l'analyse.
+    contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
 
     Returns:
     int: Le nombre de gérondifs.
     """
-    if langue not in ['English', 'Francais']:
+    if contexte.langue not in ['English', 'Francais']:
         return "Langue non prise en charge. Veuillez choisir 'English' ou 'Francais'."
 
-    doc = nlp(texte)
+    attributs = contexte.attributs
 
     # Comptage des gérondifs (en anglais, étiquetés comme 'VBG')
-    nombre_gerondifs = sum(1 for token in doc if token.tag_ == 'VBG')
+    nombre_gerondifs = int(attributs.masque(attributs.tag, ['VBG']).sum())
     return nombre_gerondifs
 
 def calculer_ratios(total_verbes, total_noms, total_pronoms, verbes_inflexion, mots_classe_ouverte, mots_classe_fermee, gerondifs, total_mots):
@@ -153,45 +133,41 @@ def calculer_ratios(total_verbes, total_noms, total_pronoms, verbes_inflexion, m
 
     return ratios
 
-def count_light_verbs(text, langue, nlp):
+def count_light_verbs(contexte):
     """
     Compte le nombre d'occurrences de verbes légers dans un texte.
 
-    :param text: Texte à analyser
-    :param light_verbs: Liste des verbes légers
-    :param nlp: Modèle Spacy chargé
+    :param contexte: Contexte d'extraction contenant le Doc spaCy
     :return: Nombre d'occurrences des verbes légers, proportion par rapport au total des verbes
     """
 
     return None, None
 
 
-def count_deictic_pronouns(text, language, nlp_model):
+def count_deictic_pronouns(contexte):
     """
     Compte les pronoms déictiques dans un texte en anglais ou en français.
 
     Args:
-    - text (str): Le texte à analyser.
-    - language (str): La langue du texte ("fr" pour le français, "en" pour l'anglais).
-    - nlp_model (spaCy model): Le modèle de langue spaCy.
+    - contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
 
     Returns:
     - dict: Un dictionnaire avec les comptes des pronoms spatiaux, personnels, temporels et le total.
     """
 
-    if language not in deictic_pronouns:
+    if contexte.langue not in deictic_pronouns:
         raise ValueError("Langue non prise en charge. Choisissez 'en' pour l'anglais ou 'fr' pour le français.")
 
     # Sélection des ensembles de pronoms selon la langue
-    pronouns = deictic_pronouns[language]
+    pronouns = deictic_pronouns[contexte.langue]
 
-    # Traitement du texte avec le modèle spaCy
-    doc = nlp_model(text.lower())
+    # Formes en minuscules des tokens du Doc déjà analysé
+    attributs = contexte.attributs
 
     # Comptage des occurrences de chaque catégorie de pronom
-    spatial_count = sum(token.text in pronouns["spatial"] for token in doc)
-    personal_count = sum(token.text in pronouns["personal"] for token in doc)
-    temporal_count = sum(token.text in pronouns["temporal"] for token in doc)
+    spatial_count = int(attributs.masque(attributs.minuscules, pronouns["spatial"]).sum())
+    personal_count = int(attributs.masque(attributs.minuscules, pronouns["personal"]).sum())
+    temporal_count = int(attributs.masque(attributs.minuscules, pronouns["temporal"]).sum())
     total_count = spatial_count + personal_count + temporal_count
 
     return {
@@ -201,94 +177,136 @@ def count_deictic_pronouns(text, language, nlp_model):
         "total_deictic_pronouns": total_count
     }
 
-def compter_termes_indefinis(texte, langue, nlp):
+def compter_termes_indefinis(contexte):
     """
     Compte le nombre de termes indéfinis dans un texte en fonction de la langue.
 
     Args:
-        texte (str): Le texte à analyser.
-        langue (str): La langue du texte ("Francais" ou "English").
-        nlp (spacy.language.Language): Le modèle de traitement de texte SpaCy.
+        contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
 
     Returns:
         int: Le nombre de termes indéfinis trouvés dans le texte.
     """
 
-    # Tokeniser le texte
-    doc = nlp(texte)
-
     # Compter les occurrences
-    compte = sum(token.text in termes_indefinis[langue] for token in doc)
+    compte = sum(token in termes_indefinis[contexte.langue] for token in contexte.tokens)
 
     return compte
 
-def ratio_termes_indefinis(texte, langue, nlp):
+def ratio_termes_indefinis(contexte):
     """
     Calcule le ratio de termes indéfinis dans un texte en fonction de la langue.
 
     Args:
-        texte (str): Le texte à analyser.
-        langue (str): La langue du texte ("Francais" ou "English").
-        nlp (spacy.language.Language): Le modèle de traitement de texte SpaCy.
+        contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
 
     Returns:
         tuple: Un tuple contenant le ratio de termes indéfinis par rapport au nombre total de mots
                et le nombre total de termes indéfinis trouvés dans le texte.
     """
-    doc = nlp(texte)
-
     # Nombre total de mots
-    total_mots = len([token for token in doc if token.is_alpha])
+    total_mots = len(contexte.tokens_alpha)
 
     # Appel de la fonction de comptage
-    compte_indefinis = compter_termes_indefinis(texte, langue, nlp)
+    compte_indefinis = compter_termes_indefinis(contexte)
 
     # Calcul du ratio
     ratio = compte_indefinis / total_mots if total_mots > 0 else 0
 
     return ratio, compte_indefinis
 
-def calculer_mattr(texte, taille_fenetre, nlp):
+# Tailles des fenêtres du MATTR (modifiables avec --mattr)
+variable_tailles_mattr = "LINGUA_TAILLES_MATTR"
+tailles_mattr = [10, 25, 40]
+
+def definir_tailles_mattr(valeur):
     """
-    Calcule le MATTR (Moving-Average Type-Token Ratio) d'un texte donné en utilisant une fenêtre de taille spécifiée.
+    Remplace les tailles des fenêtres du MATTR.
 
     Args:
-        texte (str): Le texte à analyser.
-        taille_fenetre (int): La taille de la fenêtre de texte à utiliser.
-        modele_spacy (str): Le modèle SpaCy à utiliser pour la tokenisation (par exemple, "fr" pour le français).
+        valeur (str): Les tailles, séparées par des virgules ("10,25,40").
 
-    Returns:
-        float: La valeur MATTR calculée pour le texte.
+    Raises:
+        ValueError: Si une taille n'est pas un entier strictement positif.
+    """
+    try:
+        tailles = [int(taille) for taille in valeur.split(",") if taille.strip()]
+    except ValueError:
+        raise ValueError(f"tailles de fenêtre du MATTR invalides : '{valeur}'") from None
+    if not tailles or min(tailles) < 1:
+        raise ValueError(f"tailles de fenêtre du MATTR invalides : '{valeur}'")
+    # La liste est modifiée sur place : les modules qui l'ont importée voient les nouvelles tailles
+    tailles_mattr[:] = list(dict.fromkeys(tailles))
+
+def calculer_mattrs(contexte, tailles_fenetres):
     """
+    Calcule le MATTR (Moving-Average Type-Token Ratio) d'un texte pour plusieurs tailles de fenêtre en un
+    seul parcours des tokens.
 
-    # Tokeniser le texte
-    tokens = [token.text for token in nlp(texte) if token.is_alpha]
+    Chaque fenêtre glisse d'un token à la fois en tenant à jour le nombre d'occurrences de chaque type :
+    le token qui entre et celui qui sort ajustent le nombre de types de la fenêtre, sans reconstruire
+    d'ensemble. Les TTR des fenêtres sont relevés puis moyennés avec `sum`, comme en recalculant chaque
+    fenêtre : le résultat est identique quelle que soit la version de Python (depuis Python 3.12, `sum`
+    additionne les flottants avec compensation, ce qu'une accumulation avec `+=` ne ferait pas).
 
-    # Calculer le TTR (Type-Token Ratio) pour chaque fenêtre
-    ttr_valeurs = []
-    for i in range(len(tokens) - taille_fenetre + 1):
-        fenetre = tokens[i:i + taille_fenetre]
-        types = set(fenetre)
-        ttr = len(types) / len(fenetre)
-        ttr_valeurs.append(ttr)
+    Args:
+        contexte (ContexteExtraction): Le contexte d'extraction contenant le Doc spaCy.
+        tailles_fenetres (list): Les tailles des fenêtres de texte à utiliser.
+
+    Returns:
+        dict: La valeur MATTR pour chaque taille de fenêtre {taille: mattr}.
+    """
+    # Tokens alphabétiques du Doc, remplacés par le numéro de leur type
+    numeros = {}
+    tokens = [numeros.setdefault(token, len(numeros)) for token in contexte.tokens_alpha]
+
+    tailles_fenetres = list(dict.fromkeys(tailles_fenetres))
+    occurrences = [[0] * len(numeros) for _ in tailles_fenetres]
+    nombres_de_types = [0] * len(tailles_fenetres)
+    ttr_valeurs = [[] for _ in tailles_fenetres]
+    for i, token in enumerate(tokens):
+        for j, taille in enumerate(tailles_fenetres):
+            compteur = occurrences[j]
+            if compteur[token] == 0:
+                nombres_de_types[j] += 1
+            compteur[token] += 1
+            if i >= taille:
+                sortant = tokens[i - taille]
+                compteur[sortant] -= 1
+                if compteur[sortant] == 0:
+                    nombres_de_types[j] -= 1
+            # TTR (Type-Token Ratio) de la fenêtre qui se termine au token i
+            if i >= taille - 1:
+                ttr_valeurs[j].append(nombres_de_types[j] / taille)
+
+    return {taille: sum(valeurs) / len(valeurs) if valeurs else 0
+            for taille, valeurs in zip(tailles_fenetres, ttr_valeurs)}
+
+def calculer_mattr(contexte, taille_fenetre):
+    """
+    Calcule le MATTR (Moving-Average Type-Token Ratio) d'un texte donné en utilisant une fenêtre de taille spécifiée.
 
-    # Calculer le MATTR (Moving-Average Type-Token Ratio)
-    mattr = sum(ttr_valeurs) / len(ttr_valeurs) if ttr_valeurs else 0
+    Args:
+        contexte (ContexteExtraction): Le contexte d'extraction contenant le Doc spaCy.
+        taille_fenetre (int): La taille de la fenêtre de texte à utiliser.
 
-    return mattr
+    Returns:
+        float: La valeur MATTR calculée pour le texte.
+    """
+    return calculer_mattrs(contexte, [taille_fenetre])[taille_fenetre]
 
-def calculer_nbres_mots_unique(texte):
+def calculer_nbres_mots_unique(contexte):
     """
-    Calcule le nombre de mots uniques dans un texte donné.
+    Calcule le nombre de mots uniques dans le texte.
 
     Args:
-        texte (str): Le texte à analyser.
+        contexte (ContexteExtraction): Le contexte d'extraction contenant les mots du texte.
 
     Returns:
         int: Le nombre de mots uniques dans le texte.
     """
-    # Tokeniser le texte en mots
-    mots = texte.split()
+    # Mots relevés par le prétraitement
+    mots = contexte.mots
 
     # Créer un ensemble pour stocker les mots uniques
     mots_uniques = set(mots)
@@ -340,23 +358,22 @@ def indice_de_Brunet(Nombre_total_de_mots, Nombre_de_mots_uniques):
     Brunet_indice = Nombre_total_de_mots / (Nombre_de_mots_uniques ** (-0.165))  # Valeur de la constante = -0.165 selon la thèse de Slegers_Antoine_2021
     return Brunet_indice
 
-def analyser_texte(texte, modele_spacy):
+def analyser_texte(contexte):
     """
     Analyse un texte à l'aide d'un modèle spaCy pour extraire des informations sur les mots, noms, verbes et adjectifs.
 
     Args:
-        texte (str): Le texte à analyser.
-        modele_spacy (spacy.language.Language): Le modèle spaCy à utiliser pour l'analyse.
+        contexte (ContexteExtraction): Le contexte d'extraction contenant le Doc spaCy.
 
     Returns:
         tuple: Un tuple contenant quatre listes - mots, noms, verbes et adjectifs - extraits du texte.
 
-    Cette fonction prend en entrée un texte et un modèle spaCy. Elle analyse le texte en utilisant le modèle spaCy et extrait les mots
+    Cette fonction prend en entrée le contexte d'extraction. Elle parcourt le Doc déjà analysé par spaCy et extrait les mots
     qui ne sont ni des arrêts (stop words) ni de la ponctuation. Les mots sont stockés dans la liste 'mots'. Les noms (substantifs) sont
     stockés dans la liste 'noms', les verbes dans 'verbes' et les adjectifs dans 'adjectifs'. La fonction retourne un tuple contenant
     ces quatre listes.
     """
-    doc = modele_spacy(texte)
+    doc = contexte.doc
     mots, noms, verbes, adjectifs = [], [], [], []
     for token in doc:
         if not token.is_stop and not token.is_punct:
@@ -392,6 +409,26 @@ def calculer_frequence_moyenne(mots, base_de_donnees, colonne_frequence='SUBTLWF
             somme_frequence += base_de_donnees[base_de_donnees['Word'] == mot][colonne_frequence].iloc[0]
     return float(somme_frequence / len(mots)) if mots else 0
 
+def calculer_normes_moyennes(contexte, moteur):
+    """
+    Calcule en un seul passage toutes les normes moyennes disponibles pour les mots, noms, verbes et
+    adjectifs du texte (mêmes mots que `analyser_texte`).
+
+    Args:
+        contexte (ContexteExtraction): Le contexte d'extraction contenant le Doc spaCy.
+        moteur (MoteurNormes): Le moteur de normes compilées (voir Normes_compilees).
+
+    Returns:
+        dict: {"{préfixe}_{classe}": moyenne} pour les normes dont la base compilée est disponible.
+    """
+    classes = {'NOUN': 1, 'VERB': 2, 'ADJ': 3}
+    mots, categories = [], []
+    for token in contexte.doc:
+        if not token.is_stop and not token.is_punct:
+            mots.append(token.text)
+            categories.append(classes.get(token.pos_, 0))
+    return moteur.scorer(mots, categories)
+
 def calculer_familiarite_moyenne(mots, base_de_donnees):
     """
     Calcule la familiarité moyenne des mots dans une liste à partir d'une base de données de familiarité.
@@ -436,6 +473,7 @@ def calculer_concretude_moyenne(mots, base_de_donnees):
     Elle calcule la concretude moyenne des mots présents dans la liste en recherchant chaque mot dans la base de données et en calculant la moyenne des valeurs de concretude correspondantes. Le résultat est renvoyé sous forme de nombre flottant.
     Si aucun mot de la liste n'a de valeur de concretude valide dans la base de données, la fonction renvoie 0.
     """
+    import pandas as pd
     total_concretude, compteur = 0.0, 0
     for mot in mots:
         if mot in base_de_donnees.index:
@@ -460,6 +498,7 @@ def calculer_valence_moyenne(mots, base_de_donnees):
     Elle calcule la valence moyenne des mots présents dans la liste en recherchant chaque mot dans la base de données et en calculant la moyenne des valeurs de valence correspondantes. Le résultat est renvoyé sous forme de nombre flottant.
     Si aucun mot de la liste n'a de valeur de valence valide dans la base de données, la fonction renvoie 0.
     """
+    import pandas as pd
     total_valence, compteur = 0.0, 0
     for mot in mots:
         if mot in base_de_donnees.index:
@@ -497,3 +536,7 @@ def calculer_imageabilite_moyenne(mots, base_de_donnees):
                 # Ignorer si la valeur n'est pas convertible en float
                 pass
     return total_imageabilite / compteur if compteur > 0 else 0
+
+# Tailles déclarées par la variable d'environnement (héritée par les processus de travail)
+if os.environ.get(variable_tailles_mattr):
+    definir_tailles_mattr(os.environ[variable_tailles_mattr])
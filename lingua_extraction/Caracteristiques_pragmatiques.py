@@ -1,65 +1,98 @@
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from transformers import AutoTokenizer, AutoModelWithLMHead, pipeline
-
-tokenizer = AutoTokenizer.from_pretrained("mrm8488/t5-base-finetuned-emotion")
-model = AutoModelWithLMHead.from_pretrained("mrm8488/t5-base-finetuned-emotion")
-model_path = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+from .Modeles_transformers import gestionnaire
 
 from .Database_linguistique import uncertainty_words, formulaic_expressions, expressions, filler_expressions_dict
+from .Motifs_lexicaux import compter_motifs
+from .Caracteristiques_semantiques import normaliser_embeddings
+
+def _statistiques(nom, similarites):
+    """La moyenne (0 sans comparaison), le minimum et l'écart-type d'une série de similarités."""
+    if len(similarites) == 0:
+        return {nom: 0, f"{nom}_min": None, f"{nom}_ecart_type": None}
+    return {nom: float(similarites.mean()), f"{nom}_min": float(similarites.min()),
+            f"{nom}_ecart_type": float(similarites.std())}
 
-def calculate_cosine_similarity_between_sentences(text, spacy_model):
+def calculer_coherence(contexte, decalage_max=3):
+    """
+    Calcule la cohérence d'un texte à partir des similarités cosinus entre les vecteurs de ses phrases.
+
+    Les vecteurs des phrases sont empilés et normalisés une seule fois ; la matrice de leurs similarités
+    donne toutes les mesures :
+    - cohérence locale : similarité de chaque phrase avec la suivante ;
+    - décalage k : similarité de chaque phrase avec la k-ième suivante (k = 2 à `decalage_max`) ;
+    - cohérence globale : similarité de chaque phrase avec le centroïde du texte ;
+    - interventions : similarité entre la dernière phrase d'une intervention et la première de la
+      suivante (None si le texte n'est pas découpé en interventions).
+
+    Args:
+        contexte (ContexteExtraction): Contexte d'extraction contenant le Doc spaCy.
+        decalage_max (int): Le plus grand décalage entre deux phrases comparées.
+
+    Returns:
+        dict: La moyenne, le minimum et l'écart-type de chaque mesure.
+    """
+    phrases = contexte.phrases
+    vecteurs, _ = normaliser_embeddings([phrase.vector for phrase in phrases])
+    similarites = vecteurs @ vecteurs.T
+    suivantes = np.diagonal(similarites, 1)
+
+    resultats = _statistiques("Coherence_locale", suivantes)
+    for decalage in range(2, decalage_max + 1):
+        resultats.update(_statistiques(f"Coherence_decalage_{decalage}", np.diagonal(similarites, decalage)))
+
+    # Le centroïde donne le même poids à chaque phrase ; une phrase sans vecteur a une similarité nulle
+    centroide = vecteurs.sum(axis=0)
+    norme = np.linalg.norm(centroide)
+    resultats.update(_statistiques("Coherence_globale", vecteurs @ (centroide / norme) if norme > 0
+                                   else np.zeros(len(phrases))))
+
+    if contexte.interventions:
+        # Intervention de chaque phrase, d'après la position de son début dans le texte original
+        debuts = [contexte.pretraitement.position_originale(phrase.start_char) for phrase in phrases]
+        numeros = np.searchsorted(contexte.interventions, debuts, side="right")
+        resultats.update(_statistiques("Coherence_interventions", suivantes[numeros[1:] != numeros[:-1]]))
+    else:
+        resultats.update({"Coherence_interventions": None, "Coherence_interventions_min": None,
+                          "Coherence_interventions_ecart_type": None})
+    return resultats
+
+def calculate_cosine_similarity_between_sentences(contexte):
     """
     Calcule la similarité cosinus moyenne entre les phrases d'un texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Score moyen de similarité cosinus.
     """
-    doc = spacy_model(text)
-    sentences = list(doc.sents)
-    sentence_vectors = [sentence.vector for sentence in sentences]
-    total_similarity = 0
-    comparisons = 0
-
-    for i in range(len(sentence_vectors) - 1):
-        similarity = cosine_similarity([sentence_vectors[i]], [sentence_vectors[i + 1]])[0][0]
-        total_similarity += similarity
-        comparisons += 1
+    return calculer_coherence(contexte, decalage_max=1)["Coherence_locale"]
 
-    average_similarity = total_similarity / comparisons if comparisons else 0
-
-    return float(average_similarity)
-
-def count_uncertainty_words(text, spacy_model, langue_code, total_words):
+def count_uncertainty_words(contexte, total_words):
     """
     Compte les occurrences de mots dénotant l'incertitude.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
-    :param lang_code: Code de langue.
+    :param contexte: Contexte d'extraction (Doc spaCy et langue du texte).
+    :param total_words: Nombre total de mots dans l'échantillon.
     :return: Nombre total d'occurrences de ces mots.
     """
+    langue_code = contexte.langue
 
     # Vérifie si la langue est prise en charge
     if langue_code not in uncertainty_words:
         raise ValueError(f"La langue '{langue_code}' n'est pas prise en charge")
     
-    doc = spacy_model(text)
-    count = sum(token.text.lower() in uncertainty_words[langue_code] for token in doc)
+    count = sum(forme in uncertainty_words[langue_code] for forme in contexte.formes_minuscules)
 
     return {
         "Nombre_absolu_mots_incertitude": count,
         "Frequence_relative_mots_incertitude": count / total_words if total_words else 0
     }
 
-def count_lexical_access_difficulty_words(text, spacy_model, lang_code, total_words):
+def count_lexical_access_difficulty_words(contexte, total_words):
     """
     Compte les instances de mots indiquant des difficultés d'accès lexical.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
-    :param lang_code: Code de langue.
+    :param contexte: Contexte d'extraction (Doc spaCy et langue du texte).
     :param total_words: Nombre total de mots dans l'échantillon.
     :return: Dictionnaire avec le nombre absolu et relatif de ces mots.
     """
+    lang_code = contexte.langue
+
     # Mots indiquant des difficultés d'accès lexical en anglais et en français
     difficulty_words = {
         'English': {"know", "remember", "unable"},
@@ -70,49 +103,50 @@ def count_lexical_access_difficulty_words(text, spacy_model, lang_code, total_wo
     if lang_code not in difficulty_words:
         raise ValueError(f"La langue '{lang_code}' n'est pas prise en charge")
     
-    doc = spacy_model(text)
-    count = sum(token.text.lower() in difficulty_words[lang_code] for token in doc)
+    count = sum(forme in difficulty_words[lang_code] for forme in contexte.formes_minuscules)
 
     return {
         "Nombre_absolu": count,
         "Frequence_relative": count / total_words if total_words else 0
     }
 
-def count_formulaic_expressions(text, lang_code, total_words):
+def count_formulaic_expressions(contexte, total_words):
     """
     Compte les occurrences d'expressions formulaiques dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
-    :param lang_code: Code de langue.
+    :param contexte: Contexte d'extraction (texte et langue du texte).
     :param total_words: Nombre total de mots dans l'échantillon.
     :return: Dictionnaire avec le nombre absolu et relatif de ces expressions.
     """
+    lang_code = contexte.langue
+    text = contexte.texte
+
     # Vérifie si la langue est prise en charge
     if lang_code not in formulaic_expressions:
         raise ValueError(f"La langue '{lang_code}' n'est pas prise en charge")
     
-    count = sum(text.count(expression) for expression in formulaic_expressions[lang_code])
+    count = compter_motifs(text, lang_code)["expressions_formulaiques"]
 
     return {
         "Nombre_absolu": count,
         "Frequence_relative": count / total_words if total_words else 0
     }
 
-def analyze_modal_expressions(text, spacy_model, lang_code):
+def analyze_modal_expressions(contexte):
     """
     Analyse et compte les expressions de modalisation dans le texte. 
     Opinions d’un individu concernant le contenu de sa description 
     (ou ce qui se passe sur l’image à décrire) incluant les doutes et les inquiétudes par rapport à sa production.
     
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
-    :param lang_code: Code de langue ('English' pour anglais, 'Francais' pour français).
+    :param contexte: Contexte d'extraction (Doc spaCy et langue du texte, 'English' ou 'Francais').
     :return: Dictionnaire avec le nombre absolu et relatif des expressions de modalisation.
     """
 
-    doc = spacy_model(text)
+    doc = contexte.doc
+    lang_code = contexte.langue
     total_words = len([token for token in doc if not token.is_punct and not token.is_space])
-    count = sum(doc.text.count(expression) for expression in expressions[lang_code])
+    if lang_code not in expressions:
+        raise ValueError(f"La langue '{lang_code}' n'est pas prise en charge")
+    count = compter_motifs(doc.text, lang_code)["modalisations"]
     relative_frequency = count / total_words if total_words else 0
 
     return {
@@ -120,26 +154,21 @@ def analyze_modal_expressions(text, spacy_model, lang_code):
         "Frequence_relative": relative_frequency
     }
 
-def analyze_filler_words(text, spacy_model, total_words, lang_code):
+def analyze_filler_words(contexte, total_words):
     """
     Analyse et compte les mots de remplissage dans le texte en fonction de la langue.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction (Doc spaCy et langue du texte, 'English' ou 'Francais').
     :param total_words: Nombre total de mots dans le texte.
-    :param lang_code: Code de langue ('English' pour l'anglais, 'Francais' pour le français).
     :return: Dictionnaire avec le nombre absolu et relatif des mots de remplissage.
     """
+    lang_code = contexte.langue
+
     # Vérification de la prise en charge de la langue
     if lang_code not in filler_expressions_dict:
         return {"Erreur": "Langue non prise en charge"}
 
-    filler_expressions = filler_expressions_dict[lang_code]
-
-    # Utilisation de spaCy pour une tokenisation plus précise
-    doc = spacy_model(text)
-    
-    # Comptage des expressions de remplissage
-    count = sum(doc.text.count(expression) for expression in filler_expressions)
+    # Comptage des expressions de remplissage (mots entiers, en un seul parcours partagé avec les autres comptages)
+    count = compter_motifs(contexte.texte, lang_code)["remplissage"]
     
     # Calcul de la fréquence relative
     relative_frequency = count / total_words if total_words else 0
@@ -150,24 +179,19 @@ def analyze_filler_words(text, spacy_model, total_words, lang_code):
     }
 
 def get_emotion(text):
-    input_ids = tokenizer.encode(text + '</s>', return_tensors='pt')
-    output = model.generate(input_ids=input_ids, max_length=2)
-    dec = [tokenizer.decode(ids) for ids in output]
-    label = dec[0]
-    # Supprimer le token <pad> de la sortie
-    label = label.replace("<pad>", "").strip()
-    return label
+    """
+    Détecte l'émotion d'un texte avec le modèle mrm8488/t5-base-finetuned-emotion.
+    Le modèle est chargé une seule fois par processus par le gestionnaire de modèles.
+    :param text: Texte à analyser.
+    :return: Étiquette d'émotion.
+    """
+    return gestionnaire.predict("emotion", [text])[0]
 
 def get_sentiment(text):
     """
-    Analyse le sentiment d'un texte utilisant le modèle mrm8488/t5-base-finetuned-emotion
+    Analyse le sentiment d'un texte avec le modèle cardiffnlp/twitter-xlm-roberta-base-sentiment.
+    La pipeline est construite une seule fois par processus par le gestionnaire de modèles.
     :param text: Texte à analyser.
     :return: Étiquette de sentiment.
     """
-    # Création de la pipeline de sentiment analysis
-    sentiment_task = pipeline("sentiment-analysis", model=model_path, tokenizer=model_path, max_length=512, truncation=True)
-    # Analyse du sentiment
-    result = sentiment_task(text)
-    # Récupération de l'étiquette de sentiment
-    label = result[0]['label']
-    return label
+    return gestionnaire.predict("sentiment", [text])[0]
@@ -1,6 +1,9 @@
-import itertools
+import json
+import os
+from functools import lru_cache
 import numpy as np
 from .Database_linguistique import dictICU_cookie_fr, dictICU_cookie_en, dictICU_picnic_en
+from .Motifs_lexicaux import MultiMotifs, tokeniser_motifs
 
 dict_ICUs = {
     "English": {
@@ -12,37 +15,103 @@ dict_ICUs = {
     }
 }
 
-def analyse_text(text, language, task):
+# Fichiers JSON de tâches ICU supplémentaires, séparés par os.pathsep
+variable_taches_icu = "LINGUA_TACHES_ICU"
+
+def charger_taches_icu(chemin):
+    """
+    Ajoute les tâches (images) décrites dans un fichier JSON aux dictionnaires ICU, sans modifier le module.
+
+    Le fichier a la forme {langue: {tâche: {ICU: [synonymes]}}}, par exemple
+    {"English": {"beach_scene": {"sun": ["sun", "sunshine"], "swimming": ["swim", "swimming"]}}}.
+    Une tâche existante portant le même nom est remplacée.
+
+    Args:
+        chemin (str): Le chemin du fichier JSON.
+
+    Returns:
+        list: Les tâches ajoutées [(langue, tâche)].
+    """
+    with open(chemin, "r", encoding="utf-8") as f:
+        taches = json.load(f)
+    ajoutees = []
+    for langue, taches_de_la_langue in taches.items():
+        for tache, icus in taches_de_la_langue.items():
+            if not isinstance(icus, dict) or not all(isinstance(synonymes, list) for synonymes in icus.values()):
+                raise ValueError(f"{chemin} : la tâche '{tache}' ({langue}) doit associer chaque ICU à une liste de synonymes.")
+            dict_ICUs.setdefault(langue, {})[tache] = icus
+            ajoutees.append((langue, tache))
+    moteur_icu.cache_clear()
+    return ajoutees
+
+@lru_cache(maxsize=None)
+def moteur_icu(langue):
+    """
+    Compile une seule fois tous les dictionnaires ICU d'une langue en un MultiMotifs dont les catégories
+    sont les couples (tâche, ICU) : toutes les tâches sont évaluées en un seul parcours des tokens.
+    Les synonymes sont comparés en minuscules.
+    """
+    return MultiMotifs({(tache, icu): [synonyme.lower() for synonyme in synonymes]
+                        for tache, icus in dict_ICUs.get(langue, {}).items()
+                        for icu, synonymes in icus.items()})
+
+def _formes_icu(doc):
+    """
+    Les formes de chaque position du texte analysé : le token en minuscules et son lemme. Les tokens sont
+    redécoupés comme les synonymes (l'élision "l'" de spaCy donne "l" et "'").
+    """
+    positions = []
+    for token in doc:
+        parties = tokeniser_motifs(token.lower_)
+        if len(parties) == 1:
+            positions.append(tuple({parties[0], token.lemma_.lower()} - {""}))
+        else:
+            positions.extend((partie,) for partie in parties)
+    return positions
+
+def analyse_taches(contexte, taches=None):
+    """
+    Détecte la présence des ICUs de plusieurs tâches en un seul parcours des tokens du texte.
+
+    Un synonyme est trouvé s'il correspond à des tokens entiers, par leur forme ou par leur lemme
+    ("cookies" trouve "cookie", mais "ma" n'est pas trouvé dans "machine").
+
+    Args:
+        contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
+        taches (list): Les tâches à évaluer ; toutes les tâches de la langue par défaut.
+
+    Returns:
+        dict: {tâche: {ICU: True ou False}} pour chaque tâche connue dans la langue du texte.
+    """
+    taches_de_la_langue = dict_ICUs.get(contexte.langue, {})
+    taches = [tache for tache in (taches_de_la_langue if taches is None else taches) if tache in taches_de_la_langue]
+    if not taches:
+        return {}
+    comptes = moteur_icu(contexte.langue).compter_formes(_formes_icu(contexte.doc))
+    return {tache: {icu: comptes[(tache, icu)] > 0 for icu in taches_de_la_langue[tache]} for tache in taches}
+
+def analyse_text(contexte):
     """
     Analyse le texte pour détecter la présence d'ICUs (Informations de Contenu Uniques) associées à des sujets,
-    lieux, objets et actions spécifiques. Le code est conçu pour être utilisé dans le contexte de l'image "Cookie Theft".
-    
+    lieux, objets et actions spécifiques, pour l'image utilisée pour la production du texte.
+
     Args:
-        text (str): Le texte à analyser.
-        language (str): La langue du texte ("Francais" ou "English").
-        task (str): image utilisée pour la production du texte ("cookie_theft" ou "picnic").
+        contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy, langue et image utilisée pour la
+            production du texte, "cookie_theft", "picnic" ou une tâche ajoutée avec charger_taches_icu).
 
     Returns:
         dict: Un dictionnaire contenant des informations sur la présence des ICUs. Chaque ICU est associée à une clé
               et la valeur correspondante est True si l'ICU est trouvée dans le texte, sinon False.
     """
-    dictICU = dict_ICUs.get(language, {}).get(task, None)
-
-    if not dictICU:
+    if not dict_ICUs.get(contexte.langue, {}).get(contexte.tache):
         print("Langue non reconnue pour le moment.")
         return dict()
 
-    # Initialisation du dictionnaire de résultats
-    results = {key: False for key in dictICU}
+    return analyse_taches(contexte, [contexte.tache])[contexte.tache]
 
-    # Vérification de la présence de chaque ICU dans le texte
-    for key, values in dictICU.items():
-        for value in values:
-            if value in text:
-                results[key] = True
-                break  # Passe à la clé suivante dès qu'une correspondance est trouvée
-
-    return results
+# Tâches supplémentaires déclarées par la variable d'environnement (héritée par les processus de travail)
+for _chemin in filter(None, os.environ.get(variable_taches_icu, "").split(os.pathsep)):
+    charger_taches_icu(_chemin)
 
 def nombre_ICU(dict_ICUs):
     """
@@ -81,6 +150,23 @@ def calculer_ratio_mots_par_ICU_VRAI(nombre_total_de_mots, nombre_ICU_VRAI):
         ratio = nombre_total_de_mots / nombre_ICU_VRAI
         return ratio
 
+def normaliser_embeddings(embeddings):
+    """
+    Empile des embeddings dans une matrice float32 dont chaque ligne est de norme 1.
+
+    Args:
+        embeddings (list): Une liste d'embeddings (vecteurs) de même dimension.
+
+    Returns:
+        tuple: La matrice des embeddings normalisés et le masque des embeddings valides ; les lignes des
+               vecteurs nuls (mots sans vecteur) sont laissées à zéro et marquées invalides.
+    """
+    matrice = np.array(embeddings, dtype=np.float32).reshape(len(embeddings), -1 if len(embeddings) else 0)
+    normes = np.linalg.norm(matrice, axis=1)
+    valides = normes > 0
+    matrice[valides] /= normes[valides, np.newaxis]
+    return matrice, valides
+
 def calculer_similarite(embeddings):
     """
     Calcule la similarité moyenne entre les paires d'embeddings fournis en utilisant le produit scalaire normalisé.
@@ -90,44 +176,58 @@ def calculer_similarite(embeddings):
 
     Returns:
         float: La similarité moyenne entre les paires d'embeddings normalisée entre -1 (dissimilaire) et 1 (similaire).
+               NaN s'il y a moins de deux embeddings ou si l'un d'eux est un vecteur nul.
     """
-    similarites = []
-    for emb1, emb2 in itertools.combinations(embeddings, 2):
-        similarite = np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
-        similarites.append(similarite)
-    return np.mean(similarites)
+    matrice, valides = normaliser_embeddings(embeddings)
+    if len(matrice) < 2 or not valides.all():
+        return np.nan
+    similarites = matrice @ matrice.T
+    return float(similarites[np.triu_indices(len(matrice), 1)].mean())
 
-def densite_idees(texte, modele, tailles_fenetres=[3, 10, 25, 40]):
+def densite_idees(contexte, tailles_fenetres=[3, 10, 25, 40]):
     """
     Calcule la densité d'idées pour différentes tailles de fenêtres dans un texte en utilisant des embeddings
     et la similarité moyenne entre les mots dans ces fenêtres.
 
+    La matrice des similarités cosinus entre tous les mots est calculée une seule fois par texte (un seul
+    produit matriciel), puis ses sommes cumulées en deux dimensions donnent la somme de n'importe quel bloc
+    en quatre lectures : la similarité moyenne de toutes les fenêtres de toutes les tailles se déduit des
+    blocs diagonaux, sans parcourir les paires de mots.
+
     Args:
-        texte (str): Le texte à analyser.
-        modele (spacy.language.Language): Le modèle de traitement de texte Spacy.
+        contexte (ContexteExtraction): Le contexte d'extraction contenant le Doc spaCy.
         tailles_fenetres (list): Une liste de tailles de fenêtres à utiliser pour le calcul de densité.
 
     Returns:
         dict: Un dictionnaire contenant les tailles de fenêtres en tant que clés et la densité d'idées associée
               en tant que valeurs. Les valeurs peuvent être NaN si les moyennes sont indéfinies pour certaines fenêtres.
     """
-    doc = modele(texte)
+    doc = contexte.doc
     embeddings = [token.vector for token in doc if not token.is_stop and not token.is_punct]
+    matrice, valides = normaliser_embeddings(embeddings)
+    n = len(matrice)
+
+    # Sommes cumulées (en float64) des similarités cosinus et du nombre de mots sans vecteur
+    similarites = matrice @ matrice.T
+    cumul = np.zeros((n + 1, n + 1))
+    cumul[1:, 1:] = similarites.cumsum(axis=0, dtype=np.float64).cumsum(axis=1)
+    # La diagonale (similarité d'un mot avec lui-même) est retirée de chaque bloc
+    diagonale = np.concatenate([[0], np.cumsum(np.diagonal(similarites), dtype=np.float64)])
+    sans_vecteur = np.concatenate([[0], np.cumsum(~valides)])
     resultats = {}
 
     for taille in tailles_fenetres:
-        moyennes = []
-        for i in range(0, len(embeddings) - taille + 1, taille // 2):
-            fenetre = embeddings[i:i + taille]
-            moyenne = calculer_similarite(fenetre)
-            moyennes.append(moyenne)
-        
-        # Vérifiez si moyennes n'est pas vide avant d'appeler np.nanmean()
-        if moyennes:
-            moyenne_sans_NaN = np.nanmean(moyennes)
-        else:
-            moyenne_sans_NaN = np.nan  # Ou une autre valeur par défaut si nécessaire
-        
-        resultats[taille] = moyenne_sans_NaN
+        # Début et fin de chaque fenêtre (les fenêtres se chevauchent de moitié)
+        debuts = np.arange(0, n - taille + 1, max(taille // 2, 1))
+        fins = debuts + taille
+        if len(debuts) == 0 or taille < 2:
+            resultats[taille] = np.nan
+            continue
+        blocs = cumul[fins, fins] - cumul[debuts, fins] - cumul[fins, debuts] + cumul[debuts, debuts]
+        blocs -= diagonale[fins] - diagonale[debuts]
+        moyennes = blocs / (taille * (taille - 1))
+        # Une fenêtre contenant un mot sans vecteur n'a pas de similarité moyenne définie
+        moyennes = moyennes[sans_vecteur[fins] == sans_vecteur[debuts]]
+        resultats[taille] = float(moyennes.mean()) if len(moyennes) else np.nan
 
     return resultats
@@ -1,18 +1,93 @@
+import numpy as np
 from .Database_linguistique import dep_labels_fr, translation_dict, coordination_conjunctions
 
-def get_dependency_counts(text, spacy_model):
+# Relations des clauses subordonnées, dans l'ordre des variables de sortie
+relations_subordonnees = ["csubj", "xcomp", "ccomp", "advcl", "acl"]
+
+def analyse_syntaxique(contexte):
+    """
+    Parcourt une seule fois l'arbre de dépendances du texte et remplit ensemble les mesures syntaxiques
+    (dépendances, longueurs, enfants, clauses, noms avec déterminant, temps verbaux et mesures par phrase).
+
+    Le parcours lit les colonnes POS, TAG, DEP et HEAD de `contexte.attributs` : chaque mesure est un masque
+    ou une somme sur les indices des têtes, et les mesures par phrase sont des sommes par segment entre
+    les débuts de phrases. Le résultat est partagé par tous les extracteurs syntaxiques du Doc.
+
+    Args:
+        contexte (ContexteExtraction): Contexte d'extraction contenant le Doc spaCy.
+
+    Returns:
+        dict: Les mesures syntaxiques ; "phrases" vaut None si le Doc n'a pas de frontières de phrases.
+    """
+    return contexte.partage("analyse_syntaxique", lambda: _parcourir_arbre(contexte))
+
+def _parcourir_arbre(contexte):
+    attributs = contexte.attributs
+    indices, tete = attributs.indices, attributs.tete
+    # La racine d'une phrase est sa propre tête : elle n'est l'enfant d'aucun token
+    dependants = tete != indices
+    verbes = attributs.masque(attributs.pos, ["VERB"])
+    # Têtes ayant au moins un enfant déterminant, ou un objet (de préposition ou direct)
+    tetes_determinants = tete[dependants & attributs.masque(attributs.dep, ["det"])]
+    tetes_objets = tete[dependants & attributs.masque(attributs.dep, ["pobj", "dobj"])]
+    noms = attributs.masque(attributs.pos, ["NOUN"])
+
+    mesures = {
+        "dependances": attributs.compter(attributs.dep),
+        "longueurs_dependances": np.abs(tete - indices),
+        "enfants_gauches": int(np.sum(tete > indices)),
+        "enfants_droits": int(np.sum(tete < indices)),
+        "clauses": {relation: int(np.sum(attributs.masque(attributs.dep, [relation])))
+                    for relation in relations_subordonnees},
+        "noms": int(np.sum(noms)),
+        "noms_determinants": int(np.sum(noms & np.isin(indices, tetes_determinants))),
+        "temps": {
+            # Tags typiques pour le présent en anglais
+            "present": int(np.sum(verbes & attributs.masque(attributs.tag, ["VBP", "VBZ", "VBG"]))),
+            # Tags typiques pour le passé en anglais
+            "past": int(np.sum(verbes & attributs.masque(attributs.tag, ["VBD", "VBN"]))),
+            # Remarque: le futur en anglais est souvent marqué par des auxiliaires et n'a pas de tag spécifique.
+            "future": 0,
+        },
+        "phrases": None,
+    }
+
+    if attributs.nombre and not contexte.doc.has_annotation("SENT_START"):
+        return mesures
+    debuts = np.array([phrase.start for phrase in contexte.phrases] if attributs.nombre else [], dtype=np.int64)
+    # Relations de sujet ("nsubj", "csubj", "nsubjpass", ...) présentes dans le texte
+    sujets = [attributs.strings[int(dep)] for dep in np.unique(attributs.dep)]
+    sujets = attributs.masque(attributs.dep, [dep for dep in sujets if "subj" in dep])
+    prepositions = attributs.masque(attributs.pos, ["ADP"]) & np.isin(indices, tetes_objets)
+    mesures["phrases"] = {
+        "debuts": debuts,
+        "longueurs": np.diff(np.append(debuts, attributs.nombre)),
+        "avec_verbe": par_phrase(verbes, debuts),
+        "avec_sujet": par_phrase(sujets, debuts),
+        "avec_preposition": par_phrase(prepositions, debuts),
+    }
+    return mesures
+
+def par_phrase(masque, debuts):
+    """Indique, pour chaque phrase commençant aux positions `debuts`, si l'un de ses tokens est dans le masque."""
+    if len(debuts) == 0:
+        return np.zeros(0, dtype=bool)
+    return np.add.reduceat(masque.astype(np.int64), debuts) > 0
+
+def _mesures_des_phrases(contexte):
+    phrases = analyse_syntaxique(contexte)["phrases"]
+    if phrases is None:
+        raise ValueError("Les frontières de phrases ne sont pas disponibles : le modèle spaCy doit contenir "
+                         "un parser ou un sentencizer.")
+    return phrases
+
+def get_dependency_counts(contexte):
     """
     Analyse les dépendances syntaxiques d'un texte.
-    :param text: Le texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Dictionnaire des dépendances syntaxiques avec leur comptage.
     """
-    doc = spacy_model(text)
-    dep_counts = {}
-    for token in doc:
-        dep = token.dep_
-        dep_counts[dep] = dep_counts.get(dep, 0) + 1
-    return dep_counts
+    return dict(analyse_syntaxique(contexte)["dependances"])
 
 def get_relative_dependency_frequencies(dep_counts, total_words):
     """
@@ -23,15 +98,15 @@ def get_relative_dependency_frequencies(dep_counts, total_words):
     """
     return {dep: count / total_words for dep, count in dep_counts.items()}
 
-def analyze_text_dependencies(text, spacy_model):
+def analyze_text_dependencies(contexte):
     """
     Analyse les dépendances syntaxiques d'un texte dans une langue donnée.
-    :param text: Texte à analyser.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Deux dictionnaires : comptes absolus et fréquences relatives des dépendances.
     """
     
-    dep_counts = get_dependency_counts(text, spacy_model)
-    total_words = len(text.split())
+    dep_counts = get_dependency_counts(contexte)
+    total_words = len(contexte.texte.split())
     relative_freqs = get_relative_dependency_frequencies(dep_counts, total_words)
     return dep_counts, relative_freqs
 
@@ -61,55 +136,45 @@ def add_dependency_info(output_data, dep_absolue, dep_relative):
 
     return output_data
 
-def analyze_dependency_lengths(text, spacy_model):
+def analyze_dependency_lengths(contexte):
     """
     Calcule la longueur moyenne et maximale des dépendances syntaxiques.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Tuple contenant la longueur moyenne et maximale des dépendances.
     """
-    doc = spacy_model(text)
-    lengths = []
-    
-    for token in doc:
-        head = token.head
-        distance = abs(token.i - head.i)  # Calcul de la distance entre les tokens
-        lengths.append(distance)
-    
-    avg_length = sum(lengths) / len(lengths) if lengths else 0
-    max_length = max(lengths) if lengths else 0
+    lengths = analyse_syntaxique(contexte)["longueurs_dependances"]
+
+    avg_length = int(lengths.sum()) / len(lengths) if len(lengths) else 0
+    max_length = int(lengths.max()) if len(lengths) else 0
 
     return avg_length, max_length
 
-def main_dependency_analysis(text, model):
+def main_dependency_analysis(contexte):
     """
     Analyse les dépendances syntaxiques d'un texte dans une langue donnée.
-    :param text: Texte à analyser.
-    :param lang_code: Code de langue.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Dictionnaire avec les longueurs moyennes et maximales des dépendances.
     """
 
-    avg_length, max_length = analyze_dependency_lengths(text, model)
+    avg_length, max_length = analyze_dependency_lengths(contexte)
     return {
         "Longueur_moyenne_des_dependances": avg_length,
         "Longueur_maximale_des_dependances": max_length
     }
 
-def analyze_children(text, spacy_model):
+def analyze_children(contexte):
     """
     Analyse le nombre d'enfants gauches et droits pour chaque mot.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Tuple contenant les sommes totales des enfants gauches et droits.
     """
-    doc = spacy_model(text)
-    left_children, right_children = 0, 0
+    mesures = analyse_syntaxique(contexte)
 
-    for token in doc:
-        left_children += token.n_lefts
-        right_children += token.n_rights
+    # Un enfant gauche précède sa tête, un enfant droit la suit (la racine est sa propre tête)
+    left_children = mesures["enfants_gauches"]
+    right_children = mesures["enfants_droits"]
 
-    total_tokens = len(text.split())
+    total_tokens = len(contexte.texte.split())
 
     avg_left_children = left_children / total_tokens if total_tokens else 0
     avg_right_children = right_children / total_tokens if total_tokens else 0
@@ -130,27 +195,17 @@ def verbe_inflection_relatif(nombre_verbe_inflexion, nombre_mots):
     """
     return nombre_verbe_inflexion / nombre_mots if nombre_mots else 0
 
-def analyze_subordinate_clauses(text, spacy_model):
+def analyze_subordinate_clauses(contexte):
     """
     Analyse et compte les clauses subordonnées dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Dictionnaire avec le comptage des types de clauses subordonnées.
     """
-    doc = spacy_model(text)
-    clause_counts = {
-        "csubj": 0,  # Sujets clausaux
-        "xcomp": 0,  # Compléments clausaux (sujet contrôlé)
-        "ccomp": 0,  # Compléments clausaux (sujet non contrôlé)
-        "advcl": 0,  # Modificateurs de clauses adverbiaux
-        "acl": 0     # Modificateurs de clauses adnominaux
-    }
+    # Sujets clausaux (csubj), compléments clausaux à sujet contrôlé (xcomp) ou non (ccomp), modificateurs
+    # de clauses adverbiaux (advcl) et adnominaux (acl)
+    clause_counts = dict(analyse_syntaxique(contexte)["clauses"])
 
-    for token in doc:
-        if token.dep_ in clause_counts:
-            clause_counts[token.dep_] += 1
-            
-    total_tokens = len(text.split())
+    total_tokens = len(contexte.texte.split())
 
     # Calcul des fréquences relatives
     relative_frequencies = {dep: count / total_tokens for dep, count in clause_counts.items()}
@@ -177,95 +232,67 @@ def translate_variables_subordinate_close_to_french(input_dict):
         'Frequence_relative': new_relative_freqs
     }
 
-def calculate_average_sentence_length(text, spacy_model):
+def calculate_average_sentence_length(contexte):
     """
     Calcule la longueur moyenne des phrases dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Longueur moyenne des phrases.
     """
-    doc = spacy_model(text)
-    sentences = list(doc.sents)
-    total_words = sum(len(sentence) for sentence in sentences)
-    average_length = total_words / len(sentences) if sentences else 0
+    longueurs = _mesures_des_phrases(contexte)["longueurs"]
+    total_words = int(longueurs.sum())
+    average_length = total_words / len(longueurs) if len(longueurs) else 0
 
     return average_length
 
-def count_incomplete_sentences(text, spacy_model, total_words):
+def count_incomplete_sentences(contexte, total_words):
     """
     Compte les phrases incomplètes dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Nombre total de phrases incomplètes.
     """
-    doc = spacy_model(text)
-    incomplete_sentences = 0
-
-    for sentence in doc.sents:
-        has_verb = has_subject = False
-        for token in sentence:
-            if token.pos_ == "VERB":
-                has_verb = True
-            if "subj" in token.dep_:
-                has_subject = True
-        if not (has_verb and has_subject):
-            incomplete_sentences += 1
+    phrases = _mesures_des_phrases(contexte)
+    # Une phrase est incomplète s'il lui manque un verbe ou un sujet
+    incomplete_sentences = int(np.sum(~(phrases["avec_verbe"] & phrases["avec_sujet"])))
 
     return {
         "Nombre_absolu_phrases_incompletes": incomplete_sentences,
         "Frequence_relative_phrases_incompletes": incomplete_sentences / total_words if total_words else 0
     }
 
-def count_prepositional_sentences(text, spacy_model, total_words):
+def count_prepositional_sentences(contexte, total_words):
     """
     Compte les phrases prépositionnelles dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Nombre total de phrases prépositionnelles.
     """
-    doc = spacy_model(text)
-    prepositional_sentences = 0
-
-    for sentence in doc.sents:
-        for token in sentence:
-            if token.pos_ == "ADP":  # ADP est la catégorie de préposition en spaCy
-                if any(child.dep_ in ["pobj", "dobj"] for child in token.children):  # Objet de la préposition
-                    prepositional_sentences += 1
-                    break
+    # Phrases contenant une préposition (ADP) qui a un objet (pobj ou dobj) parmi ses enfants
+    prepositional_sentences = int(np.sum(_mesures_des_phrases(contexte)["avec_preposition"]))
 
     return {
         "Nombre_absolu_phrases_prepositionnelles": prepositional_sentences,
         "Frequence_relative_phrases_prepositionnelles": prepositional_sentences / total_words if total_words else 0
     }
 
-def count_verbal_sentences(text, spacy_model, total_words):
+def count_verbal_sentences(contexte, total_words):
     """
     Compte les phrases verbales dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Nombre total de phrases verbales.
     """
-    doc = spacy_model(text)
-    verbal_sentences = 0
-
-    for sentence in doc.sents:
-        if any(token.pos_ == "VERB" for token in sentence):
-            verbal_sentences += 1
+    verbal_sentences = int(np.sum(_mesures_des_phrases(contexte)["avec_verbe"]))
 
     return {
         "Nombre_absolu_phrases_verbales": verbal_sentences,
         "Frequence_relative_phrases_verbales": verbal_sentences / total_words if total_words else 0
     }
 
-def analyze_nominal_sentences(text, spacy_model, total_words):
+def analyze_nominal_sentences(contexte, total_words):
     """
     Analyse et calcule le nombre et la longueur moyenne des phrases nominales.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Nombre total et longueur moyenne des phrases nominales.
     """
-    doc = spacy_model(text)
-    nominal_sentences = [chunk for chunk in doc.noun_chunks]
+    nominal_sentences = [chunk for chunk in contexte.doc.noun_chunks]
     total_nominal_sentences = len(nominal_sentences)
     total_length = sum(len(chunk) for chunk in nominal_sentences)
     average_length = total_length / total_nominal_sentences if total_nominal_sentences else 0
@@ -276,92 +303,62 @@ def analyze_nominal_sentences(text, spacy_model, total_words):
         "Frequence_relative_phrases_nominales": total_nominal_sentences / total_words if total_words else 0
     }
 
-def count_verb_tenses(text, spacy_model, total_words):
+def count_verb_tenses(contexte, total_words):
     """
     Compte les verbes conjugués au présent, au passé et au futur.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Dictionnaire avec le nombre de verbes pour chaque temps.
     """
-    doc = spacy_model(text)
-    tenses = {
-        "present": 0,
-        "past": 0,
-        "future": 0
-    }
-
-    for token in doc:
-        if token.pos_ == "VERB":
-            if token.tag_ in ["VBP", "VBZ", "VBG"]:  # Tags typiques pour le présent en anglais
-                tenses["present"] += 1
-            elif token.tag_ in ["VBD", "VBN"]:  # Tags typiques pour le passé en anglais
-                tenses["past"] += 1
-            # Remarque: le futur en anglais est souvent marqué par des auxiliaires et n'a pas de tag spécifique.
+    tenses = dict(analyse_syntaxique(contexte)["temps"])
 
     return {
         "Nombre_absolu": tenses,
         "Frequence_relative": {tense: count / total_words for tense, count in tenses.items()}
     }
 
-def calculate_clauses_per_sentence(text, spacy_model):
+def calculate_clauses_per_sentence(contexte):
     """
     Calcule le nombre moyen de clauses par phrase.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Nombre moyen de clauses par phrase.
     """
-    doc = spacy_model(text)
-    total_sentences = len(list(doc.sents))
-    total_clauses = 0
-
-    for sentence in doc.sents:
-        clauses = [tok for tok in sentence if tok.dep_ in ["csubj", "ccomp", "xcomp"]]
-        total_clauses += len(clauses)
+    # Les phrases couvrent tout le Doc : le total des clauses est celui du texte
+    total_sentences = len(_mesures_des_phrases(contexte)["debuts"])
+    clauses = analyse_syntaxique(contexte)["clauses"]
+    total_clauses = clauses["csubj"] + clauses["ccomp"] + clauses["xcomp"]
 
     average_clauses = total_clauses / total_sentences if total_sentences else 0
 
     return average_clauses
 
-def calculate_nouns_with_determiners_proportion(text, spacy_model):
+def calculate_nouns_with_determiners_proportion(contexte):
     """
     Calcule la proportion de noms accompagnés de déterminants.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
+    :param contexte: Contexte d'extraction contenant le Doc spaCy.
     :return: Proportion de noms avec déterminants.
     """
-    doc = spacy_model(text)
-    total_nouns = 0
-    nouns_with_determiners = 0
-
-    for token in doc:
-        if token.pos_ == "NOUN":
-            total_nouns += 1
-            if any(child.dep_ == "det" for child in token.children):
-                nouns_with_determiners += 1
+    mesures = analyse_syntaxique(contexte)
+    total_nouns = mesures["noms"]
+    nouns_with_determiners = mesures["noms_determinants"]
 
     proportion = nouns_with_determiners / total_nouns if total_nouns else 0
 
     return proportion
 
-def count_coordinated_sentences(text, spacy_model, lang_code, total_words):
+def count_coordinated_sentences(contexte, total_words):
     """
     Compte les phrases coordonnées dans le texte.
-    :param text: Texte à analyser.
-    :param spacy_model: Modèle spaCy chargé.
-    :param lang_code: Code de langue.
+    :param contexte: Contexte d'extraction (Doc spaCy et langue du texte).
     :return: Dictionnaire contenant les informations sur les phrases coordonnées.
     """
-    doc = spacy_model(text)
-    coordinated_sentences = 0
-
-    if lang_code in coordination_conjunctions:
-        conjunctions_for_lang = coordination_conjunctions[lang_code]
+    if contexte.langue in coordination_conjunctions:
+        conjunctions_for_lang = coordination_conjunctions[contexte.langue]
     else:
         conjunctions_for_lang = set()
 
-    for sentence in doc.sents:
-        if any(token.lower_ in conjunctions_for_lang for token in sentence):
-            coordinated_sentences += 1
+    attributs = contexte.attributs
+    conjonctions = attributs.masque(attributs.minuscules, conjunctions_for_lang)
+    coordinated_sentences = int(np.sum(par_phrase(conjonctions, _mesures_des_phrases(contexte)["debuts"])))
 
     return {
         "Nombre_absolu_phrases_coordonnees": coordinated_sentences,
@@ -0,0 +1,117 @@
+from functools import cached_property
+from .Attributs_tokens import AttributsTokens
+from .Preprocessing.Pretraitement import pretraiter
+
+
+class ContexteExtraction:
+    """
+    Regroupe le Doc spaCy d'une transcription et les vues qui en sont dérivées.
+
+    Le texte n'est analysé qu'une seule fois par le modèle spaCy ; toutes les fonctions des modules
+    Caracteristiques_* lisent ensuite le même Doc au travers de ce contexte. Les vues dérivées
+    (formes en minuscules, tokens alphabétiques, phrases, ...) sont calculées à la première demande
+    puis conservées.
+    """
+
+    def __init__(self, doc, langue, tache=None, texte_original=None, pretraitement=None, interventions=None):
+        """
+        Args:
+            doc (spacy.tokens.Doc): Le texte déjà analysé par le modèle spaCy.
+            langue (str): La langue du texte ('English' ou 'Francais').
+            tache (str): L'image utilisée pour la production du texte ('cookie_theft' ou 'picnic') (optionnel).
+            texte_original (str): Le texte avant la suppression des marqueurs de disfluence UCSF (optionnel).
+            pretraitement (TranscriptionPretraitee): Le prétraitement du texte original, s'il a déjà été fait (optionnel).
+            interventions (list): La position, dans le texte original, du début de chaque intervention (optionnel).
+        """
+        self.doc = doc
+        self.langue = langue
+        self.tache = tache
+        self.texte_original = texte_original if texte_original is not None else doc.text
+        self.interventions = interventions
+        self._partages = {}
+        if pretraitement is not None:
+            self.pretraitement = pretraitement
+
+    @classmethod
+    def depuis_texte(cls, texte, nlp, langue, tache=None, texte_original=None):
+        """
+        Analyse le texte avec le modèle spaCy et construit le contexte correspondant.
+
+        Args:
+            texte (str): Le texte à analyser.
+            nlp (spacy.language.Language): Le modèle spaCy chargé.
+            langue (str): La langue du texte ('English' ou 'Francais').
+            tache (str): L'image utilisée pour la production du texte (optionnel).
+            texte_original (str): Le texte avant la suppression des marqueurs UCSF (optionnel).
+
+        Returns:
+            ContexteExtraction: Le contexte contenant l'unique Doc du texte.
+        """
+        return cls(nlp(texte), langue, tache, texte_original)
+
+    def partage(self, cle, calcul):
+        """
+        Retourne le résultat d'un calcul commun à plusieurs extracteurs, effectué une seule fois par Doc.
+
+        Args:
+            cle (str): Le nom du calcul.
+            calcul (callable): La fonction sans argument qui effectue le calcul.
+        """
+        if cle not in self._partages:
+            self._partages[cle] = calcul()
+        return self._partages[cle]
+
+    @property
+    def texte(self):
+        """Le texte brut tel qu'il a été analysé."""
+        return self.doc.text
+
+    @cached_property
+    def tokens(self):
+        """Le texte de chaque token du Doc."""
+        return [token.text for token in self.doc]
+
+    @cached_property
+    def attributs(self):
+        """Les attributs de tous les tokens du Doc, en colonnes NumPy (POS, TAG, DEP, HEAD, ...)."""
+        return AttributsTokens(self.doc)
+
+    @cached_property
+    def formes_minuscules(self):
+        """La forme en minuscules de chaque token du Doc."""
+        return [token.lower_ for token in self.doc]
+
+    @cached_property
+    def tokens_alpha(self):
+        """Le texte des tokens alphabétiques."""
+        return [token.text for token in self.doc if token.is_alpha]
+
+    @cached_property
+    def tokens_sans_stop(self):
+        """Le texte des tokens qui ne sont pas des mots vides."""
+        return [token.text for token in self.doc if not token.is_stop]
+
+    @cached_property
+    def lemmes_sans_stop(self):
+        """Les lemmes des tokens qui ne sont pas des mots vides."""
+        return [token.lemma_ for token in self.doc if not token.is_stop]
+
+    @cached_property
+    def phrases(self):
+        """La liste des phrases du Doc."""
+        return list(self.doc.sents)
+
+    @cached_property
+    def pretraitement(self):
+        """Le prétraitement du texte original (disfluences UCSF, mots et table des positions)."""
+        return pretraiter(self.texte_original)
+
+    @property
+    def mots(self):
+        """Les mots du texte, sans la ponctuation ni les marqueurs de transcription."""
+        return self.pretraitement.mots
+
+    @property
+    def total_des_mots(self):
+        """Le nombre de mots du texte, utilisé comme dénominateur des fréquences relatives."""
+        return self.pretraitement.nombre_de_mots
@@ -18,6 +18,11 @@ words_targets = {
 
 # Database Fluence
 
+## Marqueurs de transcription analysés comme un seul token, par type de marqueur
+marqueurs_transcription = {
+    'pause_silencieuse': ['[pause]', '[break]'],
+}
+
 ## Liste des mots cibles pour identifier des pauses
 dictPauses = {
     'English': {'filled': ['uhm', 'uh', 'uhummm', 'hum', 'hummmm', 'humm', 'mm', 'mmm', 'Mm', 'um', 'hmmm', 'hmm', 'hm', 'eh', 'err']},
@@ -1,13 +1,15 @@
 from collections import Counter
 import re
 from .Database_linguistique import dictPauses
+from .Motifs_lexicaux import compter_motifs
+from . import Marqueurs_transcription  # Déclare Token._.marqueur, qui type les pauses remplies
 
 def pauses_silencieuses(texte, langue):
     """
     Compte le nombre total d'occurrences de "[pause]" dans le texte, selon la langue spécifiée.
     
     Args:
-    texte (str): Le texte à analyser.
+    texte (str ou list): Le texte à analyser, ou ses tokens (le marqueur est alors un token unique).
     langue (str): La langue du texte ('English' ou 'Francais').
     
     Returns:
@@ -26,9 +28,11 @@ def pauses_silencieuses(texte, langue):
 def pauses_remplies(texte, langue, kind="filled"):
     """
     Compte le nombre total d'occurrences des mots spécifiés dans le texte, selon la langue.
+    Les pauses ne sont comptées que comme mots entiers ('hm' n'est pas compté dans 'uhm').
 
     Args:
-    texte (str): Le texte à analyser.
+    texte (str ou Doc): Le texte à analyser, ou son Doc spaCy : les pauses remplies sont alors les tokens
+                        typés `token._.marqueur == 'pause_remplie'` (voir Marqueurs_transcription).
     langue (str): La langue du texte ('English' ou 'Francais').
     kind (str): kind of pauses ('filled' ou 'silent').
 
@@ -36,10 +40,11 @@ def pauses_remplies(texte, langue, kind="filled"):
     int: Le nombre d'occurrences des pauses remplies ou -1 si la langue n'est pas prise en charge.
     """
 
+    if langue in dictPauses and not isinstance(texte, str):
+        return sum(token._.marqueur == "pause_remplie" for token in texte)
     if langue in dictPauses:
-        filled_pauses = dictPauses[langue].get(kind, list())
-        count = sum(texte.count(pause) for pause in filled_pauses)
-        return count
+        categorie = {"filled": "pauses_remplies", "silent": "pauses_silencieuses"}.get(kind)
+        return compter_motifs(texte, langue).get(categorie, 0)
     else:
         return -1  # Retourne -1 pour indiquer que la langue n'est pas prise en charge.
 
@@ -1,5 +1,5 @@
 import json
-import pandas as pd
+import os
 
 
 def read_json_file(file_name):
@@ -36,6 +36,7 @@ def read_json_file(file_name):
 
 
 def lire_base_de_donnees(chemin_fichier, type_de_donnees):
+    import pandas as pd
     if type_de_donnees == 'frequence':
         return pd.read_excel(chemin_fichier)
     elif type_de_donnees == 'familiarite':
@@ -50,3 +51,63 @@ def lire_base_de_donnees(chemin_fichier, type_de_donnees):
     else:
         raise ValueError("Type de données non reconnu")
 
+
+# Noms courts acceptés pour la langue
+langues = {"en": "English", "fr": "Francais"}
+
+def normaliser_langue(langue):
+    """
+    Convertit les codes de langue courts ("en", "fr") en noms utilisés par la bibliothèque.
+
+    Args:
+        langue (str): La langue telle qu'indiquée dans le fichier d'entrée ou en ligne de commande.
+
+    Returns:
+        str: "English", "Francais" ou la valeur d'origine si elle n'est pas reconnue.
+    """
+    return langues.get(langue, langue)
+
+def lire_transcription(chemin_fichier, langue=None, participant_id=None):
+    """
+    Lit une transcription au format JSON ({"ID", "Langue", "Texte"}) ou texte brut.
+
+    Dans un fichier JSON, "Texte" peut aussi être la liste des interventions du participant : elles sont
+    réunies en un seul texte, séparées par une espace, et la position du début de chacune est conservée.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier JSON ou TXT.
+        langue (str): La langue du texte, utilisée pour les fichiers TXT (optionnel).
+        participant_id (str): L'identifiant du participant, utilisé pour les fichiers TXT (optionnel).
+
+    Returns:
+        dict ou None: Le nom du fichier sans extension ("nom"), l'identifiant du participant, la langue,
+                      le texte de la transcription et la position du début de chaque intervention
+                      ("interventions", None si le texte n'est pas découpé), ou None si le fichier ne
+                      peut pas être lu.
+    """
+    nom = ".".join(os.path.basename(chemin_fichier).split(".")[:-1])
+    interventions = None
+    if chemin_fichier.endswith("json"):
+        contenu = read_json_file(chemin_fichier)
+        if contenu is None:
+            return None
+        langue = contenu.get("Langue", "N/A")
+        participant_id = contenu.get("ID", "N/A")
+        texte = contenu.get("Texte", "N/A")
+        if isinstance(texte, list):
+            interventions = [0]
+            for intervention in texte[:-1]:
+                interventions.append(interventions[-1] + len(intervention) + 1)
+            texte = " ".join(texte)
+    else:
+        with open(chemin_fichier, "r") as f:
+            texte = "".join(f.read().split("\n"))
+
+    return {
+        "chemin": chemin_fichier,
+        "nom": nom,
+        "participant_id": participant_id,
+        "langue": normaliser_langue(langue),
+        "texte": texte,
+        "interventions": interventions,
+    }
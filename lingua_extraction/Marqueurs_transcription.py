@@ -0,0 +1,62 @@
+from spacy.language import Language
+from spacy.tokens import Token
+from .Database_linguistique import marqueurs_transcription, dictPauses
+from .Importation_database import langues
+
+# Type de chaque marqueur de transcription
+type_des_marqueurs = {marqueur: type_de_marqueur for type_de_marqueur, marqueurs in marqueurs_transcription.items()
+                      for marqueur in marqueurs}
+
+# Mots des pauses remplies de chaque langue, selon le code de langue du modèle spaCy ('en', 'fr')
+mots_des_pauses_remplies = {code: set(dictPauses[langue]["filled"]) for code, langue in langues.items()
+                            if langue in dictPauses}
+
+def type_du_token(token):
+    """
+    Retourne le type de marqueur d'un token : 'pause_silencieuse' pour "[pause]" et "[break]",
+    'pause_remplie' pour un mot de pause remplie de la langue du Doc ("uh", "euh", ...), sinon None.
+    """
+    marqueur = type_des_marqueurs.get(token.text)
+    if marqueur is None and token.text in mots_des_pauses_remplies.get(token.doc.lang_, ()):
+        return "pause_remplie"
+    return marqueur
+
+# Token._.marqueur : le type du marqueur de transcription ('pause_silencieuse', 'pause_remplie') ou None
+if not Token.has_extension("marqueur"):
+    Token.set_extension("marqueur", getter=type_du_token)
+
+@Language.component("marqueurs_transcription")
+def etiqueter_marqueurs(doc):
+    """Étiquette les marqueurs de transcription comme ponctuation, quelle que soit la prédiction du tagger."""
+    for token in doc:
+        if token.text in type_des_marqueurs:
+            token.pos_ = "PUNCT"
+    return doc
+
+def preparer_vocabulaire(vocab):
+    """
+    Marque les marqueurs de transcription comme ponctuation dans le vocabulaire : ils sont ainsi exclus
+    des mots comptés par les caractéristiques lexicales, syntaxiques et sémantiques.
+    """
+    for marqueur in type_des_marqueurs:
+        vocab[marqueur].is_punct = True
+    return vocab
+
+def preparer_modele(nlp):
+    """
+    Prépare un modèle spaCy chargé pour les transcriptions : chaque marqueur ("[pause]", "[break]", ...)
+    devient un seul token au lieu de trois ("[", "pause", "]"), marqué comme ponctuation, et les
+    marqueurs peuvent être comptés sur les tokens du Doc sans parcourir à nouveau le texte.
+
+    Args:
+        nlp (spacy.language.Language): Le modèle chargé.
+
+    Returns:
+        spacy.language.Language: Le même modèle.
+    """
+    for marqueur in type_des_marqueurs:
+        nlp.tokenizer.add_special_case(marqueur, [{"ORTH": marqueur}])
+    preparer_vocabulaire(nlp.vocab)
+    if "marqueurs_transcription" not in nlp.pipe_names:
+        nlp.add_pipe("marqueurs_transcription", last=True)
+    return nlp
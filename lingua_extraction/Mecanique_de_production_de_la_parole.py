@@ -1,9 +1,11 @@
-import nltk
-from nltk.corpus import words
 import string
 import json
+import os
+from functools import lru_cache
 import importlib_resources
-from .Database_linguistique import liste_fragments, words_targets
+from .Database_linguistique import dictPauses
+from .Motifs_lexicaux import motifs_de_la_langue
+from .Normes_compilees import NormesCompilees, compiler_vocabulaire, dossier_compile, empreinte_fichier, version_format
 # Téléchargement des listes de mots pour l'anglais a faire la premiere fois
 #nltk.download('words')
 
@@ -24,6 +26,61 @@ def charger_mots_francais(chemin_fichier):
 
     return mots_francais  # Retourne l'ensemble des mots français
 
+def _source_lexique(langue):
+    """
+    Retourne la source du lexique de mots valides d'une langue : (description, empreinte, fonction de lecture),
+    ou None si la source n'est pas disponible.
+    """
+    if langue == 'English':
+        # Le corpus words de NLTK ne change pas : son nom suffit comme empreinte
+        def lire():
+            from nltk.corpus import words
+            return words.words()
+        return "nltk:words", "nltk:words", lire
+    if langue == 'Francais':
+        chemin = importlib_resources.files(__package__) / "Documents" / 'french_words.json'
+        if not chemin.is_file():
+            return None
+        return 'french_words.json', empreinte_fichier(chemin), lambda: charger_mots_francais(chemin)
+    return None
+
+@lru_cache(maxsize=None)
+def charger_lexique_valide(langue):
+    """
+    Charge le lexique de mots valides d'une langue, une seule fois par processus.
+
+    Le lexique est compilé à la première utilisation en un vocabulaire trié (voir Normes_compilees), puis
+    projeté en mémoire : les transcriptions et les processus de travail partagent la même copie.
+
+    Args:
+        langue (str): La langue du lexique ('English' ou 'Francais').
+
+    Returns:
+        NormesCompilees ou None: Le lexique, ou None si sa source n'est pas disponible.
+    """
+    source = _source_lexique(langue)
+    if source is None:
+        print(f"La liste de mots valides n'est pas disponible pour la langue '{langue}'.")
+        return None
+    description, empreinte, lire = source
+
+    dossier = os.path.join(dossier_compile(), "lexiques", langue)
+    chemin_meta = os.path.join(dossier, "meta.json")
+    if os.path.isfile(chemin_meta):
+        with open(chemin_meta, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version_format") == version_format and meta.get("empreinte_source") == empreinte:
+            return NormesCompilees(dossier)
+
+    try:
+        mots = lire()
+    except LookupError as e:
+        # Corpus NLTK non téléchargé (nltk.download('words'))
+        print(f"La liste de mots valides n'est pas disponible pour la langue '{langue}' : {e}")
+        return None
+    compiler_vocabulaire(mots, dossier, description, empreinte)
+    return NormesCompilees(dossier)
+
 def compter_lemmes(liste_mots):
     """
     Compte le nombre de mots dans une liste, en excluant la ponctuation.
@@ -37,6 +94,27 @@ def compter_lemmes(liste_mots):
     mots_sans_ponctuation = [mot for mot in liste_mots if mot not in string.punctuation]
     return len(mots_sans_ponctuation)
 
+def consulter_lexique_valide(tokens, langue):
+    """
+    Cherche chaque token dans le lexique de mots valides de la langue.
+
+    Args:
+    tokens (list): La liste des tokens.
+    langue (str): La langue des tokens ('english' ou 'francais').
+
+    Returns:
+    numpy.ndarray: Pour chaque token, vrai s'il figure dans le lexique, ou None si la liste de mots valides
+    de la langue n'est pas disponible.
+    """
+    if langue not in ('English', 'Francais'):
+        print("Langue non reconnue pour le moment.")
+        return None
+    # Lexique de mots valides compilé, chargé une seule fois par processus
+    mots_valides = charger_lexique_valide(langue)
+    if mots_valides is None:
+        return None
+    return mots_valides.contient([token.lower() for token in tokens])
+
 def identification_fragments(tokens, langue):
     """
     Identifie les fragments de mots dans une liste de tokens.
@@ -46,22 +124,16 @@ def identification_fragments(tokens, langue):
     langue (str): La langue des tokens ('english' ou 'francais').
 
     Returns:
-    list: Une liste des fragments de mots identifiés.
+    list: Une liste des fragments de mots identifiés, ou None si la liste de mots valides de la langue
+    n'est pas disponible.
     """
-    if langue == 'English':
-        # Dictionnaire de mots anglais
-        mots_valides = set(words.words())
-    elif langue == 'Francais':
-        # Utilisation de la liste des mots français chargée
-        resources = importlib_resources.files(__name__) / "Documents"
-        mots_valides = charger_mots_francais(resources / 'french_words.json')
-    else:
-        print("Langue non reconnue pour le moment.")
+    valides = consulter_lexique_valide(tokens, langue)
+    if valides is None:
         return None
 
     # Identification des fragments
-    fragments = [token for token in tokens if token.lower() not in mots_valides]
-    
+    fragments = [token for token, valide in zip(tokens, valides) if not valide]
+
     return fragments
 
 def compteur_fragments(tokens, langue, print_fragments=False):
@@ -90,7 +162,7 @@ def compteur_fragment_anciennce_version(texte, langue):
     Compte le nombre d'occurrences de fragments spécifiques dans le texte en fonction de la langue.
 
     Args:
-        texte (str): Le texte dans lequel compter les fragments.
+        texte (str ou list): Le texte, ou la liste de ses tokens, dans lequel compter les fragments.
         langue (str): La langue du texte ('English' ou 'Francais').
 
     Returns:
@@ -100,13 +172,10 @@ def compteur_fragment_anciennce_version(texte, langue):
     spécifiée ('English' ou 'Francais'). Elle retourne le nombre total d'occurrences de fragments dans le texte.
     Si la langue n'est pas reconnue, la fonction retourne None.
     """
-    eventCount = 0
-
     if langue == 'English':
-        fragments = liste_fragments[langue]
-        for fragment in fragments:
-            eventCount += texte.count(fragment)
-        
+        # Les fragments ne sont comptés que comme mots entiers ('i' n'est pas compté dans 'picnic')
+        eventCount = motifs_de_la_langue(langue).compter(texte)["fragments"]
+
     elif langue == 'Francais':
         print("Le français n'est pas encore supporté.")
         return None
@@ -117,43 +186,80 @@ def compteur_fragment_anciennce_version(texte, langue):
     
     return eventCount
 
-def context_fragments(text, language, nlp):
+def detecter_fragments(contexte, fenetre=3, longueur_minimale=3):
     """
-    Cette fonction compte les fragments contextuels dans un texte en fonction de la langue spécifiée.
+    Détecte les fragments de mots en un seul parcours des tokens du texte, sans liste de fragments fixée à l'avance.
+
+    Deux sortes de fragments sont relevées :
+        - 'repetition' : un mot est le préfixe strict du mot qui le suit ("cook cookie", "wa uh washing").
+          Seul le mot suivant est comparé : les pauses remplies, la ponctuation et les marqueurs entre les
+          deux mots (au plus `fenetre` tokens) sont ignorés, mais pas les autres mots ("cook the cookie"
+          n'est pas une répétition). Pour ne pas relever les mots valides qui commencent le mot suivant
+          ("on one", "we went", "to today"), le premier mot doit être absent du lexique de mots valides,
+          ou ne pas être un mot vide et compter au moins `longueur_minimale` lettres ;
+        - 'prefixe' : un mot absent du lexique de mots valides de la langue, mais préfixe strict d'un mot
+          du lexique ("chil", "laun"). Le lexique compilé étant trié, les mots qui commencent par un
+          préfixe sont rangés juste après lui : une recherche dichotomique par mot suffit.
 
     Args:
-        text (str): Le texte à analyser.
-        language (str): La langue du texte (par exemple, "fr" pour le français, "en" pour l'anglais).
-        nlp: Le modèle de tokenization spécifique à la langue.
+        contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
+        fenetre (int): Le nombre maximal de tokens ignorés entre le fragment et le mot qui le complète.
+        longueur_minimale (int): La longueur minimale d'un mot valide relevé comme répétition.
 
     Returns:
-        int: Le nombre de fragments contextuels trouvés dans le texte.
+        list: Un dictionnaire {"fragment", "mot", "type", "position"} par fragment, dans l'ordre du texte ; "mot"
+        est le mot qui complète le fragment (None pour un préfixe) et "position" sa position dans le texte brut.
     """
+    pauses = {pause.lower() for pause in dictPauses.get(contexte.langue, {}).get('filled', [])}
+    # Indices des tokens qui sont des mots (ni ponctuation, ni marqueur, ni pause remplie)
+    est_mot = [token.is_alpha and token.lower_ not in pauses for token in contexte.doc]
+    mots = [i for i, mot in enumerate(est_mot) if mot]
+    formes = contexte.formes_minuscules
+
+    # Mots du lexique, et mots absents du lexique mais préfixes d'un mot du lexique, en une seule recherche vectorisée
+    lexique = charger_lexique_valide(contexte.langue) if contexte.langue in ('English', 'Francais') else None
+    if lexique is not None and mots:
+        candidats = [formes[i] for i in mots]
+        # Un mot est valide sous sa forme en minuscules ou telle qu'elle est écrite ("I")
+        valides = lexique.contient(candidats) | lexique.contient([contexte.tokens[i] for i in mots])
+        non_mots = ~valides & lexique.prefixes(candidats)
+        prefixes = {i for i, non_mot in zip(mots, non_mots) if non_mot}
+        mots_valides = {i for i, valide in zip(mots, valides) if valide}
+    else:
+        # Sans lexique, tous les mots sont considérés comme valides
+        prefixes = set()
+        mots_valides = set(mots)
+
+    fragments = []
+    for i in mots:
+        mot_suivant = None
+        for j in range(i + 1, min(i + 2 + fenetre, len(est_mot))):
+            if est_mot[j]:
+                mot_suivant = formes[j]
+                break
+        token = contexte.doc[i]
+        repetition = (i not in mots_valides
+                      or (not token.is_stop and len(formes[i]) >= longueur_minimale))
+        if (repetition and mot_suivant is not None and len(mot_suivant) > len(formes[i])
+                and mot_suivant.startswith(formes[i])):
+            type_de_fragment = 'repetition'
+        elif i in prefixes:
+            type_de_fragment, mot_suivant = 'prefixe', None
+        else:
+            continue
+        fragments.append({"fragment": token.text, "mot": mot_suivant, "type": type_de_fragment,
+                          "position": contexte.pretraitement.position_originale(token.idx)})
+    return fragments
 
-    # Vérifiez si la langue est prise en charge
-    if language not in words_targets:
-        # Si la langue spécifiée n'est pas dans la liste des langues prises en charge
-        print(f"Langue '{language}' non prise en charge.")
-        return 0
-
-    # Récupérez les mots cibles à partir du dictionnaire
-    words_target = words_targets[language]
-
-    # Tokenize le texte en fonction de la langue
-    tokens = [token.text for token in nlp(text)]
-
-    # Initialisez une liste pour stocker les paires de mots consécutives
-    combs = []
-
-    # Parcourez les tokens pour créer des paires de mots consécutives
-    for token_comb in zip(tokens, tokens[1:]):
-        combs.append(token_comb)
-
-    # Comptez combien de paires de mots consécutives correspondent aux mots cibles
-    count = sum(f in words_target for f in combs)
-
-    # Retournez le nombre de fragments contextuels trouvés
-    return count
-
+def context_fragments(contexte):
+    """
+    Cette fonction compte les fragments contextuels dans un texte : les mots qui sont le préfixe strict
+    du mot qui les suit ("cook cookie"), voir `detecter_fragments`.
 
+    Args:
+        contexte (ContexteExtraction): Le contexte d'extraction (Doc spaCy et langue du texte).
 
+    Returns:
+        int: Le nombre de fragments contextuels trouvés dans le texte.
+    """
+    return sum(fragment["type"] == 'repetition' for fragment in detecter_fragments(contexte))
@@ -0,0 +1,216 @@
+from abc import ABC, abstractmethod
+
+# Modèles HuggingFace utilisés par les caractéristiques pragmatiques
+emotion_model_path = "mrm8488/t5-base-finetuned-emotion"
+model_path = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+
+
+class ModeleHuggingFace(ABC):
+    """
+    Modèle HuggingFace chargé à la première prédiction puis conservé jusqu'à `decharger`.
+
+    transformers et torch ne sont importés qu'au chargement du modèle. Les sous-classes définissent
+    `_charger` et `predict` ; une sous-classe incomplète ne peut pas être instanciée.
+    """
+
+    def __init__(self, identifiant, revision=None, batch_size=16):
+        """
+        Args:
+            identifiant (str): L'identifiant du modèle sur le hub HuggingFace (ou un chemin local).
+            revision (str): La révision du modèle (branche, étiquette ou commit) ; la plus récente par défaut.
+            batch_size (int): Le nombre de textes envoyés ensemble au modèle.
+        """
+        self.identifiant = identifiant
+        self.revision = revision
+        self.batch_size = batch_size
+        self._composants = None
+
+    @property
+    def est_charge(self):
+        return self._composants is not None
+
+    def charger(self):
+        """Charge le modèle s'il ne l'est pas déjà et retourne ses composants."""
+        if self._composants is None:
+            self._composants = self._charger()
+        return self._composants
+
+    def decharger(self):
+        """Libère le modèle ; il sera rechargé à la prochaine prédiction."""
+        self._composants = None
+
+    @abstractmethod
+    def _charger(self):
+        """Charge le modèle et retourne ses composants (tokenizer, modèle, ...)."""
+
+    @abstractmethod
+    def predict(self, textes):
+        """
+        Prédit l'étiquette de chaque texte.
+
+        Args:
+            textes (list): Les textes à analyser.
+
+        Returns:
+            list: Une étiquette par texte, dans l'ordre des textes.
+        """
+
+
+class ModeleEmotion(ModeleHuggingFace):
+    """Modèle T5 générant l'émotion d'un texte (joy, sadness, anger, fear, love, surprise)."""
+
+    def _charger(self):
+        from transformers import AutoTokenizer, AutoModelWithLMHead
+        tokenizer = AutoTokenizer.from_pretrained(self.identifiant, revision=self.revision)
+        model = AutoModelWithLMHead.from_pretrained(self.identifiant, revision=self.revision)
+        model.eval()
+        return tokenizer, model
+
+    def predict(self, textes):
+        import torch
+        tokenizer, model = self.charger()
+        etiquettes = []
+        for debut in range(0, len(textes), self.batch_size):
+            lot = [texte + '</s>' for texte in textes[debut:debut + self.batch_size]]
+            entrees = tokenizer(lot, padding=True, return_tensors='pt')
+            with torch.no_grad():
+                sorties = model.generate(input_ids=entrees["input_ids"], attention_mask=entrees["attention_mask"],
+                                         max_length=2)
+            # Supprimer le token <pad> de la sortie
+            etiquettes.extend(tokenizer.decode(ids).replace("<pad>", "").strip() for ids in sorties)
+        return etiquettes
+
+
+class ModeleSentiment(ModeleHuggingFace):
+    """
+    Modèle XLM-RoBERTa de classification du sentiment (Positive, Negative, Neutral).
+
+    Les textes plus longs que la fenêtre du modèle ne sont pas tronqués : ils sont découpés en fenêtres
+    de tokens qui se chevauchent, toutes les fenêtres sont classées ensemble, puis les probabilités des
+    fenêtres d'un texte sont moyennées, pondérées par leur nombre de tokens.
+    """
+
+    def __init__(self, identifiant, revision=None, batch_size=16, taille_fenetre=512, chevauchement=128):
+        """
+        Args:
+            taille_fenetre (int): Le nombre maximal de tokens d'une fenêtre, tokens spéciaux compris.
+            chevauchement (int): Le nombre de tokens communs à deux fenêtres consécutives.
+        """
+        super().__init__(identifiant, revision, batch_size)
+        self.taille_fenetre = taille_fenetre
+        self.chevauchement = chevauchement
+
+    def _charger(self):
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        tokenizer = AutoTokenizer.from_pretrained(self.identifiant, revision=self.revision)
+        model = AutoModelForSequenceClassification.from_pretrained(self.identifiant, revision=self.revision)
+        model.eval()
+        return tokenizer, model
+
+    def scores(self, textes):
+        """
+        Calcule les probabilités de chaque étiquette de sentiment pour chaque texte.
+
+        Args:
+            textes (list): Les textes à analyser.
+
+        Returns:
+            list: Un dictionnaire {étiquette: probabilité} par texte, dans l'ordre des textes.
+        """
+        import torch
+        tokenizer, model = self.charger()
+        if not textes:
+            return []
+        # Découpage de tous les textes en fenêtres chevauchantes en un seul appel au tokenizer
+        fenetres = tokenizer(list(textes), truncation=True, max_length=self.taille_fenetre, stride=self.chevauchement,
+                             return_overflowing_tokens=True, padding=True, return_tensors='pt')
+        texte_de_fenetre = fenetres["overflow_to_sample_mapping"]
+        probabilites = []
+        with torch.no_grad():
+            for debut in range(0, len(texte_de_fenetre), self.batch_size):
+                fin = debut + self.batch_size
+                logits = model(input_ids=fenetres["input_ids"][debut:fin],
+                               attention_mask=fenetres["attention_mask"][debut:fin]).logits
+                probabilites.append(torch.softmax(logits, dim=-1))
+        probabilites = torch.cat(probabilites)
+
+        # Moyenne des fenêtres de chaque texte, pondérée par leur nombre de tokens
+        poids = fenetres["attention_mask"].sum(dim=1, keepdim=True).to(probabilites.dtype)
+        sommes = torch.zeros(len(textes), probabilites.shape[1], dtype=probabilites.dtype)
+        sommes.index_add_(0, texte_de_fenetre, probabilites * poids)
+        totaux = torch.zeros(len(textes), 1, dtype=probabilites.dtype)
+        totaux.index_add_(0, texte_de_fenetre, poids)
+        moyennes = sommes / totaux.clamp(min=1)
+
+        etiquettes = [model.config.id2label[i] for i in range(moyennes.shape[1])]
+        return [dict(zip(etiquettes, ligne.tolist())) for ligne in moyennes]
+
+    def predict(self, textes):
+        return [max(scores, key=scores.get) for scores in self.scores(textes)]
+
+
+# Modèles connus du gestionnaire : nom -> (classe, identifiant HuggingFace)
+modeles_disponibles = {
+    "emotion": (ModeleEmotion, emotion_model_path),
+    "sentiment": (ModeleSentiment, model_path),
+}
+
+class GestionnaireModeles:
+    """
+    Conserve une instance de chaque modèle HuggingFace pour toute la durée du processus.
+
+    Les modèles sont créés à la première demande et chargés à la première prédiction ; ils sont ensuite
+    réutilisés pour toutes les transcriptions (traitement d'un corpus, processus de travail, service).
+    Avec un cache d'inférences, seuls les textes absents du cache sont envoyés au modèle, qui n'est
+    pas chargé si tous les textes y sont.
+    """
+
+    def __init__(self):
+        self.modeles = {}
+        self.cache = None
+
+    def activer_cache(self, cache):
+        """Utilise le cache d'inférences donné (CacheInferences) pour toutes les prédictions."""
+        self.cache = cache
+
+    def obtenir(self, nom):
+        """Retourne le modèle demandé ('emotion' ou 'sentiment'), sans forcément le charger."""
+        if nom not in self.modeles:
+            if nom not in modeles_disponibles:
+                raise ValueError(f"Modèle inconnu : '{nom}'. Modèles disponibles : {', '.join(modeles_disponibles)}.")
+            classe, identifiant = modeles_disponibles[nom]
+            self.modeles[nom] = classe(identifiant)
+        return self.modeles[nom]
+
+    def precharger(self, nom):
+        """Charge le modèle à l'avance, sauf si un cache d'inférences peut éviter son chargement."""
+        if self.cache is None:
+            self.obtenir(nom).charger()
+
+    def predict(self, nom, textes):
+        """Prédit l'étiquette de chaque texte avec le modèle demandé."""
+        modele = self.obtenir(nom)
+        if self.cache is None:
+            return modele.predict(textes)
+        revision = modele.revision or "main"
+        etiquettes = self.cache.lire(textes, modele.identifiant, revision)
+        # Les textes absents du cache ne sont prédits qu'une fois, même s'ils sont répétés
+        absents = list(dict.fromkeys(texte for texte, etiquette in zip(textes, etiquettes) if etiquette is None))
+        if absents:
+            nouvelles = dict(zip(absents, modele.predict(absents)))
+            self.cache.ecrire(absents, list(nouvelles.values()), modele.identifiant, revision)
+            etiquettes = [nouvelles.get(texte, etiquette) for texte, etiquette in zip(textes, etiquettes)]
+        return etiquettes
+
+    def decharger(self, nom=None):
+        """Libère un modèle, ou tous les modèles si aucun nom n'est donné."""
+        for modele in ([self.obtenir(nom)] if nom else self.modeles.values()):
+            modele.decharger()
+
+    def modeles_charges(self):
+        """Retourne les noms des modèles actuellement chargés."""
+        return [nom for nom, modele in self.modeles.items() if modele.est_charge]
+
+
+# Gestionnaire partagé par le processus
+gestionnaire = GestionnaireModeles()
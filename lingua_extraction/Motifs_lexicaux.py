@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+from .Database_linguistique import dictPauses, liste_fragments, formulaic_expressions, expressions, filler_expressions_dict
+
+# Découpage en mots et en signes de ponctuation : les motifs ne sont trouvés que sur des frontières de mots
+_tokens = re.compile(r"\w+|[^\w\s]")
+
+def tokeniser_motifs(texte):
+    """Découpe un texte en mots et en signes de ponctuation, comme les motifs recherchés."""
+    return _tokens.findall(texte)
+
+
+class MultiMotifs:
+    """
+    Recherche simultanée de plusieurs catégories de motifs (mots ou expressions de plusieurs mots).
+
+    Les motifs de toutes les catégories sont compilés une fois en un arbre préfixe de tokens. Le texte est
+    parcouru une seule fois : à chaque position, l'arbre donne toutes les catégories dont un motif commence
+    là. Les occurrences d'une même catégorie ne se chevauchent pas (le motif le plus long l'emporte), et un
+    motif n'est jamais trouvé à l'intérieur d'un autre mot ('hm' n'est pas compté dans 'uhm').
+    """
+
+    def __init__(self, categories):
+        """
+        Args:
+            categories (dict): {catégorie: motifs}, chaque motif étant un mot ou une expression.
+        """
+        self.categories = list(categories)
+        self.arbre = {}
+        for categorie, motifs in categories.items():
+            for motif in motifs:
+                noeud = self.arbre
+                for token in tokeniser_motifs(motif):
+                    noeud = noeud.setdefault(token, {})
+                # La clé None d'un nœud contient les catégories dont un motif se termine à ce nœud
+                noeud.setdefault(None, set()).add(categorie)
+
+    def compter(self, texte):
+        """
+        Compte les occurrences de chaque catégorie de motifs.
+
+        Args:
+            texte (str ou list): Le texte, ou une liste de tokens déjà découpés.
+
+        Returns:
+            dict: Le nombre d'occurrences de chaque catégorie {catégorie: nombre}.
+        """
+        tokens = tokeniser_motifs(texte) if isinstance(texte, str) else [str(token) for token in texte]
+        return self.compter_formes([(token,) for token in tokens])
+
+    def compter_formes(self, positions):
+        """
+        Compte les occurrences de chaque catégorie de motifs dans une suite de positions ayant chacune
+        plusieurs formes possibles (la forme du token et son lemme, par exemple) : un motif est trouvé si
+        chacun de ses tokens correspond à l'une des formes de la position.
+
+        Args:
+            positions (list): Une liste de tuples de formes, une par position.
+
+        Returns:
+            dict: Le nombre d'occurrences de chaque catégorie {catégorie: nombre}.
+        """
+        comptes = dict.fromkeys(self.categories, 0)
+        # Position à partir de laquelle une nouvelle occurrence de chaque catégorie peut commencer
+        disponible = dict.fromkeys(self.categories, 0)
+        for debut in range(len(positions)):
+            noeuds = [self.arbre]
+            fins = {}
+            for position in range(debut, len(positions)):
+                noeuds = [noeud[forme] for noeud in noeuds for forme in positions[position] if forme in noeud]
+                if not noeuds:
+                    break
+                for noeud in noeuds:
+                    for categorie in noeud.get(None, ()):
+                        fins[categorie] = position + 1
+            for categorie, fin in fins.items():
+                if debut >= disponible[categorie]:
+                    comptes[categorie] += 1
+                    disponible[categorie] = fin
+        return comptes
+
+
+@lru_cache(maxsize=None)
+def motifs_de_la_langue(langue):
+    """
+    Retourne le MultiMotifs des listes de Database_linguistique pour une langue, compilé une seule fois.
+
+    Catégories : 'pauses_remplies', 'pauses_silencieuses', 'fragments', 'expressions_formulaiques',
+    'modalisations' et 'remplissage' (seulement celles qui existent pour la langue).
+    """
+    pauses = dictPauses.get(langue, {})
+    categories = {}
+    for categorie, motifs in [("pauses_remplies", pauses.get("filled")),
+                              ("pauses_silencieuses", pauses.get("silent")),
+                              ("fragments", liste_fragments.get(langue)),
+                              ("expressions_formulaiques", formulaic_expressions.get(langue)),
+                              ("modalisations", expressions.get(langue)),
+                              ("remplissage", filler_expressions_dict.get(langue))]:
+        if motifs:
+            categories[categorie] = motifs
+    return MultiMotifs(categories)
+
+@lru_cache(maxsize=64)
+def compter_motifs(texte, langue):
+    """
+    Compte toutes les catégories de motifs d'une langue en un seul parcours du texte.
+
+    Le résultat est conservé pour les derniers textes : les fonctions de comptage appelées sur le même
+    texte (pauses, expressions formulaiques, modalisations, remplissage) partagent le même parcours.
+    """
+    return motifs_de_la_langue(langue).compter(texte)
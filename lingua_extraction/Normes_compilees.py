@@ -0,0 +1,575 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+import importlib_resources
+
+# Version du format des normes compilées ; une version différente impose une nouvelle compilation
+version_format = 1
+
+# Dossier des bases de normes fournies avec la bibliothèque
+dossier_documents = importlib_resources.files(__package__) / "Documents"
+
+# Dossier des normes compilées ; la variable d'environnement LINGUA_NORMES_COMPILEES permet d'en choisir un autre
+# (par exemple lorsque le paquet est installé dans un dossier en lecture seule)
+variable_dossier_compile = "LINGUA_NORMES_COMPILEES"
+
+# Bases de normes : fichier Excel, type de données pour `lire_base_de_donnees`, colonne des mots et colonnes
+# numériques conservées
+bases_de_normes = {
+    "frequence": {"fichier": "Frequency_Database.xlsx", "type": "frequence",
+                  "mot": "Word", "colonnes": ["SUBTLWF"]},
+    "familiarite": {"fichier": "Familiarity_Imageability_Database.xlsx", "type": "familiarite",
+                    "mot": "Words", "colonnes": ["FAM", "IMAG"]},
+    "concretude": {"fichier": "Concreteness_Database.xlsx", "type": "concreteness",
+                   "mot": "Word", "colonnes": ["Conc.M"]},
+    "valence": {"fichier": "Valence_Database.xlsx", "type": "valence",
+                "mot": "Word", "colonnes": ["V.Mean.Sum"]},
+}
+
+# Normes moyennes calculées par le moteur : préfixe de sortie -> (base, colonne, moyenne sur tous les mots).
+# La fréquence est divisée par le nombre total de mots ; les autres normes par le nombre de mots trouvés.
+normes_moyennes = {
+    "Familiarite_moyenne": ("familiarite", "FAM", False),
+    "Imageabilite_moyenne": ("familiarite", "IMAG", False),
+    "Concretude_moyenne": ("concretude", "Conc.M", False),
+    "Frequence_moyenne": ("frequence", "SUBTLWF", True),
+    "Valence_moyenne": ("valence", "V.Mean.Sum", False),
+}
+
+# Classes de mots pour lesquelles chaque norme est moyennée
+categories_normes = ["mots", "noms", "verbes", "adjectifs"]
+
+# Mots absents de chaque base, relevés par les moteurs de normes du processus : {(langue, base): Counter}
+hors_vocabulaire = {}
+
+def dossier_compile():
+    """Retourne le dossier dans lequel les normes compilées sont lues et écrites."""
+    return os.environ.get(variable_dossier_compile) or os.path.join(str(dossier_documents), "normes_compilees")
+
+def dossier_normes(nom, langue="English", destination=None):
+    """
+    Retourne le dossier d'une base compilée : `{dossier}/{nom}` pour l'anglais, `{dossier}/{langue}/{nom}`
+    pour les autres langues.
+    """
+    racine = destination or dossier_compile()
+    return os.path.join(racine, nom) if langue == "English" else os.path.join(racine, langue, nom)
+
+def empreinte_fichier(chemin):
+    """Retourne l'empreinte SHA-256 du contenu d'un fichier."""
+    hachage = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            hachage.update(bloc)
+    return hachage.hexdigest()
+
+def compiler_base(nom, dossier_source=None, destination=None):
+    """
+    Compile une base de normes Excel en un vocabulaire trié et des colonnes float32 au format .npy.
+
+    Les mots vides ou absents sont ignorés, seule la première ligne d'un mot répété est conservée et les
+    valeurs non numériques deviennent NaN (elles sont ignorées lors du calcul des moyennes).
+
+    Args:
+        nom (str): Le nom de la base ('frequence', 'familiarite', 'concretude' ou 'valence').
+        dossier_source (str): Le dossier contenant le fichier Excel (par défaut, le dossier Documents du paquet).
+        destination (str): Le dossier des normes compilées (par défaut, `dossier_compile()`).
+
+    Returns:
+        int ou None: Le nombre de mots compilés, ou None si le fichier Excel n'est pas disponible.
+    """
+    import pandas as pd
+    from .Importation_database import lire_base_de_donnees
+
+    description = bases_de_normes[nom]
+    chemin_source = os.path.join(str(dossier_source or dossier_documents), description["fichier"])
+    if not os.path.isfile(chemin_source):
+        return None
+
+    base = lire_base_de_donnees(chemin_source, description["type"])
+    if base.index.name is not None:
+        base = base.reset_index()
+    base = base[base[description["mot"]].notna()]
+    mots = base[description["mot"]].astype(str)
+    base = base[~mots.duplicated()]
+    mots = mots[~mots.duplicated()].to_numpy()
+    valeurs = {colonne: pd.to_numeric(base[colonne], errors="coerce").to_numpy(dtype=np.float32)
+               for colonne in description["colonnes"]}
+    return _enregistrer_base(dossier_normes(nom, destination=destination), mots, valeurs, {
+        "source": description["fichier"],
+        "empreinte_source": empreinte_fichier(chemin_source),
+    })
+
+def _enregistrer_base(dossier, mots, valeurs, meta):
+    """
+    Enregistre une base compilée : le vocabulaire trié, une colonne float32 par norme et meta.json.
+
+    Args:
+        dossier (str): Le dossier de la base compilée.
+        mots (numpy.ndarray): Les mots, sans doublons.
+        valeurs (dict): Les valeurs de chaque colonne {colonne: tableau aligné sur les mots}.
+        meta (dict): La description de la source, complétée par le format, les colonnes et le nombre de mots.
+
+    Returns:
+        int: Le nombre de mots compilés.
+    """
+    mots = np.asarray(mots, dtype=str)
+    ordre = np.argsort(mots, kind="stable")
+    tableaux = {"vocabulaire": mots[ordre]}
+    for colonne, valeurs_colonne in valeurs.items():
+        tableaux[colonne] = np.asarray(valeurs_colonne, dtype=np.float32)[ordre]
+    meta = dict(meta, version_format=version_format, colonnes=list(valeurs), nombre_de_mots=int(len(mots)))
+    _installer_base(dossier, tableaux, meta)
+    return len(mots)
+
+def _installer_base(dossier, tableaux, meta):
+    """
+    Écrit les tableaux d'une base compilée et son meta.json sans jamais exposer de base incomplète.
+
+    Les processus qui lisent la base ont projeté ses fichiers en mémoire : ils ne doivent être ni tronqués
+    ni réécrits. Les tableaux sont donc écrits dans un dossier temporaire, puis installés par `os.replace`
+    dans un sous-dossier nommé d'après leur contenu (la génération) ; meta.json, qui désigne la génération,
+    est remplacé en dernier. Deux processus qui compilent la même base en même temps produisent la même
+    génération : le second garde celle du premier. Les générations précédentes sont ensuite supprimées ;
+    les processus qui les ont déjà projetées en mémoire continuent de les lire.
+
+    Args:
+        dossier (str): Le dossier de la base compilée.
+        tableaux (dict): Les tableaux à enregistrer {nom du fichier sans extension: tableau}.
+        meta (dict): Le contenu de meta.json, auquel la génération est ajoutée.
+    """
+    empreinte = hashlib.sha256()
+    for nom, tableau in tableaux.items():
+        empreinte.update(f"{nom}:{tableau.dtype.str}:{len(tableau)}".encode("utf-8"))
+        empreinte.update(np.ascontiguousarray(tableau).tobytes())
+    generation = empreinte.hexdigest()[:16]
+
+    os.makedirs(dossier, exist_ok=True)
+    cible = os.path.join(dossier, generation)
+    if not os.path.isdir(cible):
+        temporaire = tempfile.mkdtemp(dir=dossier, prefix=".tmp-")
+        try:
+            for nom, tableau in tableaux.items():
+                np.save(os.path.join(temporaire, f"{nom}.npy"), tableau)
+            os.replace(temporaire, cible)
+        except OSError:
+            shutil.rmtree(temporaire, ignore_errors=True)
+            # Un autre processus a installé la même génération entre-temps
+            if not os.path.isdir(cible):
+                raise
+
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+    with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+        json.dump(dict(meta, generation=generation), f, indent=4, ensure_ascii=False)
+    os.replace(temporaire, os.path.join(dossier, "meta.json"))
+
+    # Générations précédentes et fichiers écrits directement dans le dossier par les versions antérieures
+    for nom in os.listdir(dossier):
+        chemin = os.path.join(dossier, nom)
+        if nom.endswith(".npy"):
+            os.remove(chemin)
+        elif os.path.isdir(chemin) and nom != generation and not nom.startswith(".tmp-"):
+            shutil.rmtree(chemin, ignore_errors=True)
+
+def _lignes_source(chemin, separateur=None, feuille=None):
+    """
+    Lit une à une les lignes d'un fichier CSV, TSV ou Excel (.xlsx), sans charger tout le fichier en mémoire.
+    La première ligne contient les noms des colonnes.
+    """
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        from openpyxl import load_workbook
+        classeur = load_workbook(chemin, read_only=True, data_only=True)
+        try:
+            onglet = classeur[feuille] if feuille else classeur.active
+            yield from onglet.iter_rows(values_only=True)
+        finally:
+            classeur.close()
+        return
+    with open(chemin, "r", encoding="utf-8-sig", newline="") as f:
+        if separateur is None:
+            if extension in (".tsv", ".tab"):
+                separateur = "\t"
+            else:
+                separateur = csv.Sniffer().sniff(f.read(1 << 16), delimiters=",;\t").delimiter
+                f.seek(0)
+        yield from csv.reader(f, delimiter=separateur)
+
+def _nombre(valeur):
+    """Convertit une cellule en nombre (virgule décimale acceptée) ; NaN si la cellule n'est pas numérique."""
+    if isinstance(valeur, (int, float)):
+        return float(valeur)
+    try:
+        return float(str(valeur).strip().replace(",", "."))
+    except ValueError:
+        return float("nan")
+
+def importer_normes(chemin, langue, nom, mot, colonnes, destination=None, separateur=None, feuille=None):
+    """
+    Importe une base de normes externe (Lexique 3, par exemple) dans le format compilé, pour une langue.
+
+    Le fichier est lu ligne par ligne : seules la colonne des mots et les colonnes demandées sont conservées,
+    dans des tableaux compacts, si bien qu'une base de plusieurs centaines de milliers de lignes et de
+    dizaines de colonnes n'est jamais chargée en entier. Seule la première ligne d'un mot répété est conservée.
+
+    Args:
+        chemin (str): Le fichier CSV, TSV ou Excel (.xlsx).
+        langue (str): La langue de la base ('Francais', 'English', ...).
+        nom (str): La base de normes alimentée ('frequence', 'familiarite', 'concretude' ou 'valence').
+        mot (str): La colonne du fichier contenant les mots.
+        colonnes (dict): La correspondance {colonne de la base compilée: colonne du fichier}, par exemple
+                         {"SUBTLWF": "freqfilms2"} ; les colonnes compilées sont celles de `bases_de_normes`.
+        destination (str): Le dossier des normes compilées (par défaut, `dossier_compile()`).
+        separateur (str): Le séparateur d'un fichier CSV (détecté par défaut).
+        feuille (str): La feuille d'un fichier Excel (la feuille active par défaut).
+
+    Returns:
+        int: Le nombre de mots importés.
+    """
+    if nom not in bases_de_normes:
+        raise ValueError(f"Base inconnue : '{nom}'. Bases disponibles : {', '.join(bases_de_normes)}.")
+    inconnues = [colonne for colonne in colonnes if colonne not in bases_de_normes[nom]["colonnes"]]
+    if inconnues:
+        raise ValueError(f"Colonnes inconnues pour la base '{nom}' : {', '.join(inconnues)} "
+                         f"(colonnes possibles : {', '.join(bases_de_normes[nom]['colonnes'])}).")
+
+    lignes = _lignes_source(chemin, separateur, feuille)
+    entete = [str(cellule).strip() if cellule is not None else "" for cellule in next(lignes, [])]
+    absentes = [colonne for colonne in [mot, *colonnes.values()] if colonne not in entete]
+    if absentes:
+        raise ValueError(f"{chemin} : colonnes absentes du fichier : {', '.join(absentes)}.")
+    position_mot = entete.index(mot)
+    positions = {colonne: entete.index(source) for colonne, source in colonnes.items()}
+
+    mots, vus = [], set()
+    valeurs = {colonne: array("f") for colonne in colonnes}
+    for ligne in lignes:
+        if position_mot >= len(ligne) or ligne[position_mot] is None:
+            continue
+        forme = str(ligne[position_mot]).strip()
+        if not forme or forme in vus:
+            continue
+        vus.add(forme)
+        mots.append(forme)
+        for colonne, position in positions.items():
+            valeurs[colonne].append(_nombre(ligne[position]) if position < len(ligne) else float("nan"))
+
+    return _enregistrer_base(dossier_normes(nom, langue, destination), mots, valeurs, {
+        "source": os.path.basename(chemin),
+        "empreinte_source": empreinte_fichier(chemin),
+        "langue": langue,
+        "correspondance": dict(colonnes, mot=mot),
+    })
+
+
+class NormesCompilees:
+    """
+    Base de normes compilée : un vocabulaire trié et une colonne float32 par norme, projetés en mémoire.
+
+    Les fichiers sont ouverts avec `mmap_mode='r'` : le chargement est immédiat et les pages sont
+    partagées par tous les processus qui lisent la même base. Ils sont lus dans la génération désignée
+    par meta.json (voir `_installer_base`), ou dans le dossier lui-même pour les bases compilées avant
+    l'introduction des générations.
+    """
+
+    def __init__(self, dossier, tentatives=3):
+        for tentative in range(tentatives):
+            with open(os.path.join(dossier, "meta.json"), "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            fichiers = os.path.join(dossier, self.meta["generation"]) if "generation" in self.meta else dossier
+            try:
+                self.vocabulaire = np.load(os.path.join(fichiers, "vocabulaire.npy"), mmap_mode="r")
+                self.colonnes = {colonne: np.load(os.path.join(fichiers, f"{colonne}.npy"), mmap_mode="r")
+                                 for colonne in self.meta["colonnes"]}
+                return
+            except FileNotFoundError:
+                # La base vient d'être remplacée par une nouvelle génération : meta.json est relu
+                if tentative == tentatives - 1:
+                    raise
+
+    def contient(self, mots):
+        """Indique, pour chaque mot, s'il figure dans le vocabulaire."""
+        return self.indices(mots) >= 0
+
+    def indices(self, mots):
+        """Retourne la ligne de chaque mot dans la base, ou -1 si le mot n'y figure pas."""
+        mots = np.asarray(mots, dtype=str)
+        if not len(mots) or not len(self.vocabulaire):
+            return np.full(len(mots), -1, dtype=np.int64)
+        positions = np.searchsorted(self.vocabulaire, mots)
+        positions = np.minimum(positions, len(self.vocabulaire) - 1)
+        return np.where(self.vocabulaire[positions] == mots, positions, -1)
+
+    def prefixes(self, mots):
+        """Indique, pour chaque mot, s'il est le préfixe strict d'un mot du vocabulaire ('chil' pour 'child')."""
+        mots = np.asarray(mots, dtype=str)
+        if not len(mots) or not len(self.vocabulaire):
+            return np.zeros(len(mots), dtype=bool)
+        # Les mots qui commencent par un préfixe sont rangés juste après lui dans le vocabulaire trié
+        positions = np.searchsorted(self.vocabulaire, mots, side="right")
+        suivants = self.vocabulaire[np.minimum(positions, len(self.vocabulaire) - 1)]
+        return (positions < len(self.vocabulaire)) & np.char.startswith(suivants, mots) & (suivants != mots)
+
+    def valeurs(self, mots, colonne):
+        """Retourne la valeur de la norme pour chaque mot (NaN si le mot ou sa valeur est absent)."""
+        indices = self.indices(mots)
+        valeurs = np.full(len(indices), np.nan, dtype=np.float32)
+        trouves = indices >= 0
+        valeurs[trouves] = self.colonnes[colonne][indices[trouves]]
+        return valeurs
+
+def compiler_vocabulaire(mots, dossier, source, empreinte_source):
+    """
+    Compile une liste de mots sans normes (lexique de mots valides, par exemple) en un vocabulaire trié.
+
+    Args:
+        mots (iterable): Les mots du lexique.
+        dossier (str): Le dossier de destination.
+        source (str): La description de la source du lexique.
+        empreinte_source (str): L'empreinte de la source, pour détecter une compilation périmée.
+
+    Returns:
+        int: Le nombre de mots compilés.
+    """
+    vocabulaire = np.unique(np.asarray(list(mots), dtype=str))
+    # Plusieurs processus de travail peuvent compiler le même lexique en même temps (voir `_installer_base`)
+    _installer_base(dossier, {"vocabulaire": vocabulaire}, {
+        "version_format": version_format,
+        "source": source,
+        "empreinte_source": empreinte_source,
+        "colonnes": [],
+        "nombre_de_mots": int(len(vocabulaire)),
+    })
+    return len(vocabulaire)
+
+def empreinte_des_bases():
+    """
+    Décrit les bases de normes et les lexiques de mots valides compilés ou importés présents dans le dossier
+    des normes compilées, pour détecter les résultats calculés avant une compilation ou une importation.
+
+    Returns:
+        list: "{dossier relatif}:{version du format}:{empreinte de la source}" pour chaque meta.json, triés.
+    """
+    racine = dossier_compile()
+    bases = []
+    for dossier, _, fichiers in os.walk(racine):
+        if "meta.json" not in fichiers:
+            continue
+        try:
+            with open(os.path.join(dossier, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        bases.append(f"{os.path.relpath(dossier, racine)}:{meta.get('version_format')}:{meta.get('empreinte_source')}")
+    return sorted(bases)
+
+@lru_cache(maxsize=None)
+def charger_normes_compilees(nom, langue="English"):
+    """
+    Charge une base de normes compilée ou importée, une seule fois par processus.
+
+    Returns:
+        NormesCompilees ou None: La base compilée, ou None si elle n'a pas été compilée ou si le fichier
+        Excel d'origine (fourni avec la bibliothèque) a changé depuis la compilation.
+    """
+    dossier = dossier_normes(nom, langue)
+    if not os.path.isfile(os.path.join(dossier, "meta.json")):
+        return None
+    normes = NormesCompilees(dossier)
+    chemin_source = os.path.join(str(dossier_documents), bases_de_normes[nom]["fichier"])
+    # Seules les bases compilées à partir des fichiers Excel du paquet sont comparées à leur source
+    compilee = normes.meta.get("source") == bases_de_normes[nom]["fichier"] and langue == "English"
+    if normes.meta.get("version_format") != version_format or (
+            compilee and os.path.isfile(chemin_source) and empreinte_fichier(chemin_source) != normes.meta["empreinte_source"]):
+        print(f"Les normes compilées '{nom}' ne sont plus à jour ; relancez `text2variable compile-norms`.")
+        return None
+    return normes
+
+class MoteurNormes:
+    """
+    Calcule toutes les normes moyennes (`*_moyenne_*`) d'un texte en un seul passage.
+
+    Chaque type de mot est associé une seule fois à sa ligne dans chaque base compilée ; ces indices sont
+    mémorisés pour toutes les transcriptions traitées par le processus. Les colonnes de toutes les
+    normes sont ensuite lues par une seule indexation de tableau, puis moyennées par classe de mots.
+    """
+
+    def __init__(self, bases, langue="English"):
+        """
+        Args:
+            bases (dict): Les bases compilées disponibles {nom: NormesCompilees}.
+            langue (str): La langue des bases, sous laquelle les mots hors vocabulaire sont relevés.
+        """
+        self.bases = bases
+        self.langue = langue
+        self.normes = {prefixe: (base, colonne, sur_tous_les_mots)
+                       for prefixe, (base, colonne, sur_tous_les_mots) in normes_moyennes.items()
+                       if base in bases and colonne in bases[base].colonnes}
+        self.indices_memorises = {}
+
+    def _indices(self, types):
+        """Retourne la ligne de chaque type de mot dans chaque base (une colonne par base, -1 si absent)."""
+        nouveaux = [mot for mot in types if mot not in self.indices_memorises]
+        if nouveaux:
+            lignes = np.stack([self.bases[nom].indices(nouveaux) for nom in self.bases], axis=1)
+            self.indices_memorises.update(zip(nouveaux, lignes))
+        if not types:
+            return np.empty((0, len(self.bases)), dtype=np.int64)
+        return np.stack([self.indices_memorises[mot] for mot in types])
+
+    def scorer(self, mots, categories):
+        """
+        Calcule les normes moyennes disponibles pour chaque classe de mots, ainsi que leur couverture : la
+        part des mots de la classe qui ont une valeur dans la base. Les mots absents de chaque base sont
+        relevés au passage dans `hors_vocabulaire`.
+
+        Args:
+            mots (list): Les mots du texte (hors mots vides et ponctuation).
+            categories (list): La classe de chaque mot : un indice de `categories_normes` (1 pour les noms,
+                               2 pour les verbes, 3 pour les adjectifs) ou 0 pour les autres mots.
+
+        Returns:
+            dict: {"{préfixe}_{classe}": moyenne, "{préfixe}_couverture_{classe}": couverture} pour les normes
+            dont la base compilée est disponible.
+        """
+        types, inverse = np.unique(np.asarray(mots, dtype=str), return_inverse=True)
+        indices = self._indices(list(types))
+        noms_des_bases = list(self.bases)
+
+        # Occurrences des types absents de chaque base
+        occurrences = np.bincount(inverse.reshape(-1), minlength=len(types))
+        for b, nom in enumerate(noms_des_bases):
+            absents = indices[:, b] < 0
+            if absents.any():
+                hors_vocabulaire.setdefault((self.langue, nom), Counter()).update(
+                    dict(zip(types[absents].tolist(), occurrences[absents].tolist())))
+
+        # Valeurs de chaque norme pour chaque type de mot (NaN si le mot n'a pas de valeur)
+        valeurs = np.full((len(types), len(self.normes)), np.nan)
+        for j, (base, colonne, _) in enumerate(self.normes.values()):
+            lignes = indices[:, noms_des_bases.index(base)]
+            trouves = lignes >= 0
+            valeurs[trouves, j] = self.bases[base].colonnes[colonne][lignes[trouves]]
+        valeurs = valeurs[inverse.reshape(-1)]
+
+        # Appartenance de chaque mot aux classes : tous les mots, puis noms, verbes et adjectifs
+        categories = np.asarray(categories, dtype=np.int64)
+        classes = np.stack([np.ones(len(categories), dtype=bool)] +
+                           [categories == k for k in range(1, len(categories_normes))]).astype(np.float64)
+        presentes = ~np.isnan(valeurs)
+        sommes = classes @ np.where(presentes, valeurs, 0.0)
+        trouves = classes @ presentes.astype(np.float64)
+        totaux = classes.sum(axis=1)
+
+        scores = {}
+        for j, (prefixe, (_, _, sur_tous_les_mots)) in enumerate(self.normes.items()):
+            for k, categorie in enumerate(categories_normes):
+                denominateur = totaux[k] if sur_tous_les_mots else trouves[k, j]
+                scores[f"{prefixe}_{categorie}"] = float(sommes[k, j] / denominateur) if denominateur > 0 else 0
+                scores[f"{prefixe}_couverture_{categorie}"] = float(trouves[k, j] / totaux[k]) if totaux[k] > 0 else 0
+        return scores
+
+@lru_cache(maxsize=None)
+def moteur_normes(langue="English"):
+    """Retourne le moteur de normes d'une langue, construit avec les bases compilées ou importées disponibles."""
+    bases = {}
+    for nom in bases_de_normes:
+        normes = charger_normes_compilees(nom, langue)
+        if normes is not None:
+            bases[nom] = normes
+    return MoteurNormes(bases, langue)
+
+def extraire_hors_vocabulaire():
+    """Retourne les mots hors vocabulaire relevés par le processus depuis le dernier appel, puis les oublie."""
+    releve = dict(hors_vocabulaire)
+    hors_vocabulaire.clear()
+    return releve
+
+def fusionner_hors_vocabulaire(releve):
+    """Ajoute les mots hors vocabulaire relevés par un autre processus à ceux du processus."""
+    for cle, compteur in releve.items():
+        hors_vocabulaire.setdefault(cle, Counter()).update(compteur)
+
+def ecrire_rapport_hors_vocabulaire(chemin, nombre=50):
+    """
+    Écrit, pour chaque langue et chaque base, les mots hors vocabulaire les plus fréquents du corpus.
+
+    Args:
+        chemin (str): Le fichier CSV du rapport (colonnes langue, base, mot, occurrences).
+        nombre (int): Le nombre de mots retenus par base.
+
+    Returns:
+        int: Le nombre de lignes écrites.
+    """
+    lignes = [(langue, base, mot, occurrences) for (langue, base), compteur in sorted(hors_vocabulaire.items())
+              for mot, occurrences in compteur.most_common(nombre)]
+    with open(chemin, "w", encoding="utf-8", newline="") as f:
+        ecrivain = csv.writer(f)
+        ecrivain.writerow(["langue", "base", "mot", "occurrences"])
+        ecrivain.writerows(lignes)
+    return len(lignes)
+
+def main_compilation(argv):
+    """
+    Compile les bases de normes Excel une fois pour toutes :
+
+        text2variable compile-norms [--source DOSSIER] [-o DOSSIER] [--bases frequence,familiarite]
+    """
+    parser = argparse.ArgumentParser(prog="text2variable compile-norms",
+                                     description="Compile les bases de normes Excel en fichiers binaires projetables en mémoire.")
+    parser.add_argument("--source", help="Dossier contenant les fichiers Excel (défaut : Documents du paquet)")
+    parser.add_argument("-o", "--output_dir",
+                        help=f"Dossier des normes compilées (défaut : {variable_dossier_compile} ou Documents/normes_compilees)")
+    parser.add_argument("--bases", help=f"Bases à compiler, séparées par des virgules (défaut : {','.join(bases_de_normes)})")
+    args = parser.parse_args(argv)
+
+    noms = [nom.strip() for nom in args.bases.split(",")] if args.bases else list(bases_de_normes)
+    for nom in noms:
+        if nom not in bases_de_normes:
+            parser.error(f"base inconnue : '{nom}'")
+        nombre = compiler_base(nom, args.source, args.output_dir)
+        if nombre is None:
+            print(f"{nom} : le fichier {bases_de_normes[nom]['fichier']} n'est pas disponible.")
+        else:
+            print(f"{nom} : {nombre} mots compilés.")
+
+def main_importation(argv):
+    """
+    Importe une base de normes externe (CSV, TSV ou Excel) pour une langue :
+
+        text2variable import-norms Lexique383.tsv --langue Francais --base frequence --mot ortho --colonnes SUBTLWF=freqfilms2
+    """
+    parser = argparse.ArgumentParser(prog="text2variable import-norms",
+                                     description="Importe une base de normes CSV/TSV/Excel dans le format compilé, pour une langue.")
+    parser.add_argument("fichier", help="Fichier CSV, TSV ou Excel (.xlsx) de la base de normes")
+    parser.add_argument("--langue", required=True, help="Langue de la base (Francais, English, ...)")
+    parser.add_argument("--base", required=True, choices=list(bases_de_normes), help="Base de normes alimentée")
+    parser.add_argument("--mot", required=True, help="Colonne du fichier contenant les mots")
+    parser.add_argument("--colonnes", required=True,
+                        help="Correspondance des colonnes, séparées par des virgules : COLONNE_COMPILEE=COLONNE_DU_FICHIER "
+                             "(par exemple FAM=familiarite,IMAG=imageabilite)")
+    parser.add_argument("--separateur", help="Séparateur d'un fichier CSV (détecté par défaut)")
+    parser.add_argument("--feuille", help="Feuille d'un fichier Excel (la feuille active par défaut)")
+    parser.add_argument("-o", "--output_dir",
+                        help=f"Dossier des normes compilées (défaut : {variable_dossier_compile} ou Documents/normes_compilees)")
+    args = parser.parse_args(argv)
+
+    colonnes = {}
+    for correspondance in args.colonnes.split(","):
+        compilee, _, source = correspondance.partition("=")
+        if not compilee.strip() or not source.strip():
+            parser.error(f"correspondance invalide : '{correspondance}' (attendu : COLONNE_COMPILEE=COLONNE_DU_FICHIER)")
+        colonnes[compilee.strip()] = source.strip()
+    try:
+        nombre = importer_normes(args.fichier, args.langue, args.base, args.mot, colonnes, args.output_dir,
+                                 args.separateur, args.feuille)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"{args.base} ({args.langue}) : {nombre} mots importés.")
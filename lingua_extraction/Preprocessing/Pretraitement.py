@@ -0,0 +1,96 @@
+import re
+from bisect import bisect_right
+
+# Marqueurs de disfluence des transcriptions UCSF
+marqueurs_ucsf = "=@&#%$"
+
+# Une seule expression pour tout le prétraitement : les marqueurs UCSF (comptés puis supprimés), le contenu
+# entre crochets (conservé pour spaCy, mais qui n'est pas un mot) et les mots (les traits d'union et les
+# apostrophes internes ne coupent pas un mot)
+_motif = re.compile(rf"(?P<ucsf>[{re.escape(marqueurs_ucsf)}])|(?P<crochets>\[[^\]]*\])|(?P<mot>\w+(?:[’'-]\w+)*)")
+
+
+class TranscriptionPretraitee:
+    """
+    Résultat du prétraitement d'une transcription brute : le texte sans marqueurs UCSF envoyé à spaCy,
+    le nombre de chaque marqueur UCSF, les mots de la transcription et la table de correspondance des
+    positions du texte prétraité vers celles du texte brut.
+
+    La table ne contient qu'une entrée par marqueur supprimé : pour une position du texte prétraité, le
+    nombre de caractères supprimés avant elle est retrouvé par recherche dichotomique.
+    """
+
+    def __init__(self, texte, disfluences, mots, positions, decalages):
+        """
+        Args:
+            texte (str): Le texte prétraité.
+            disfluences (dict): Le nombre d'occurrences de chaque marqueur UCSF {marqueur: nombre}.
+            mots (list): Les mots du texte, sans la ponctuation ni le contenu entre crochets.
+            positions (list): Les positions du texte prétraité où un marqueur a été supprimé.
+            decalages (list): Le nombre cumulé de caractères supprimés à chacune de ces positions.
+        """
+        self.texte = texte
+        self.disfluences = disfluences
+        self.mots = mots
+        self.positions = positions
+        self.decalages = decalages
+
+    @property
+    def nombre_de_mots(self):
+        return len(self.mots)
+
+    def position_originale(self, position):
+        """
+        Retourne la position dans le texte brut d'un caractère du texte prétraité (par exemple
+        `token.idx` d'un token du Doc spaCy).
+        """
+        indice = bisect_right(self.positions, position)
+        return position + (self.decalages[indice - 1] if indice else 0)
+
+    def intervalle_original(self, debut, fin):
+        """
+        Retourne l'intervalle [début, fin) du texte brut correspondant à un intervalle non vide du texte
+        prétraité (par exemple `span.start_char` et `span.end_char` d'une phrase du Doc spaCy).
+        """
+        return self.position_originale(debut), self.position_originale(fin - 1) + 1
+
+
+def pretraiter(texte_brut):
+    """
+    Prétraite une transcription en un seul parcours du texte brut : compte et supprime les marqueurs de
+    disfluence UCSF (=@&#%$), relève les mots (le contenu entre crochets comme "[pause]" et la ponctuation
+    ne sont pas des mots) et construit la table des positions vers le texte brut.
+
+    Args:
+        texte_brut (str): Le texte de la transcription.
+
+    Returns:
+        TranscriptionPretraitee: Le texte prétraité, les statistiques de disfluence, les mots et la table des positions.
+    """
+    morceaux = []
+    disfluences = dict.fromkeys(marqueurs_ucsf, 0)
+    mots = []
+    positions = []
+    decalages = []
+    debut_morceau = 0
+    supprimes = 0
+    # Fin, dans le texte prétraité, du dernier mot : un mot coupé par un marqueur ("wa=ter") reste un seul mot
+    fin_dernier_mot = -1
+    for correspondance in _motif.finditer(texte_brut):
+        type_de_motif = correspondance.lastgroup
+        debut, fin = correspondance.span()
+        if type_de_motif == "ucsf":
+            disfluences[correspondance.group()] += 1
+            morceaux.append(texte_brut[debut_morceau:debut])
+            debut_morceau = fin
+            positions.append(debut - supprimes)
+            supprimes += fin - debut
+            decalages.append(supprimes)
+        elif type_de_motif == "mot":
+            if debut - supprimes == fin_dernier_mot:
+                mots[-1] += correspondance.group()
+            else:
+                mots.append(correspondance.group())
+            fin_dernier_mot = fin - supprimes
+    morceaux.append(texte_brut[debut_morceau:])
+    return TranscriptionPretraitee("".join(morceaux), disfluences, mots, positions, decalages)
@@ -0,0 +1,812 @@
+import fnmatch
+import hashlib
+import inspect
+import string
+import types
+from functools import cached_property, lru_cache
+import importlib_resources
+from .Importation_database import lire_base_de_donnees
+from . import Database_linguistique
+from .Mecanique_de_production_de_la_parole import (
+    charger_lexique_valide,
+    compter_lemmes,
+    compteur_fragment_anciennce_version,
+    consulter_lexique_valide,
+    detecter_fragments)
+from .Fluence import pauses_remplies, pauses_silencieuses, nombre_repetition_mot
+from .Caracteristiques_lexicales import (
+    Parts_of_Speech,
+    count_open_closed_class_words,
+    compter_verbes_conjugues,
+    compter_gerondifs,
+    calculer_ratios,
+    indice_de_Brunet,
+    count_deictic_pronouns,
+    ratio_termes_indefinis,
+    calculer_mattrs,
+    tailles_mattr,
+    calculer_nbres_mots_unique,
+    stat_R_Honore,
+    analyser_texte,
+    calculer_frequence_moyenne,
+    calculer_familiarite_moyenne,
+    calculer_concretude_moyenne,
+    calculer_valence_moyenne,
+    calculer_imageabilite_moyenne,
+    calculer_normes_moyennes)
+from .Caracteristiques_semantiques import (
+    analyse_text,
+    nombre_ICU,
+    calculer_ratio_mots_par_ICU_VRAI,
+    densite_idees)
+from .Caracteristiques_syntaxiques import (
+    analyze_text_dependencies,
+    add_dependency_info,
+    main_dependency_analysis,
+    analyze_children,
+    verbe_inflection_relatif,
+    analyze_subordinate_clauses,
+    translate_variables_subordinate_close_to_french,
+    calculate_average_sentence_length,
+    count_incomplete_sentences,
+    count_prepositional_sentences,
+    count_verbal_sentences,
+    analyze_nominal_sentences,
+    count_verb_tenses,
+    calculate_clauses_per_sentence,
+    calculate_nouns_with_determiners_proportion,
+    count_coordinated_sentences)
+from .Caracteristiques_pragmatiques import (
+    calculer_coherence,
+    count_uncertainty_words,
+    count_lexical_access_difficulty_words,
+    count_formulaic_expressions,
+    analyze_modal_expressions,
+    analyze_filler_words,
+    get_emotion,
+    get_sentiment)
+from .Modeles_transformers import gestionnaire
+from .Normes_compilees import charger_normes_compilees, moteur_normes, empreinte_des_bases
+from .Contexte_extraction import ContexteExtraction
+from .Marqueurs_transcription import type_des_marqueurs
+
+# Besoins qu'un extracteur peut déclarer
+TOKENS = "tokens"            # Tokenizer et attributs lexicaux seulement (is_alpha, is_stop, ...)
+TAGGER = "tagger"            # Étiquettes POS, morphologie et lemmes
+PARSER = "parser"            # Arbre de dépendances et segmentation en phrases
+VECTORS = "vectors"          # Vecteurs de mots ou tenseurs contextuels
+TRANSFORMER = "transformer"  # Modèles HuggingFace (émotion, sentiment)
+NORMES = "normes"            # Bases de données de normes lexicales (fichiers Excel)
+
+
+class Extracteur:
+    """
+    Décrit un extracteur de variables : la fonction qui le calcule, les variables de sortie qu'il produit,
+    ses besoins (composants spaCy, modèles, bases de données) et les extracteurs dont il dépend.
+    La fonction de préchargement, optionnelle, charge à l'avance les ressources de l'extracteur
+    (bases de normes, modèles HuggingFace) pour une liste de langues. La version est à incrémenter
+    lorsqu'un changement de comportement n'est pas visible dans le code (une ressource externe, par exemple).
+    """
+
+    def __init__(self, nom, fonction, categorie, variables, besoins, dependances=(), prechargement=None, version=1):
+        self.nom = nom
+        self.fonction = fonction
+        self.categorie = categorie
+        self.variables = list(variables)
+        self.besoins = set(besoins)
+        self.dependances = list(dependances)
+        self.prechargement = prechargement
+        self.version = version
+
+    def produit(self, variable):
+        """Indique si la variable (nom exact ou motif glob) fait partie des sorties de l'extracteur."""
+        return any(fnmatch.fnmatchcase(sortie, variable) or fnmatch.fnmatchcase(variable, sortie)
+                   for sortie in self.variables)
+
+    @cached_property
+    def lexiques(self):
+        """Les noms des lexiques de Database_linguistique utilisés par l'extracteur."""
+        return sorted(nom for nom in _references(self.fonction) if nom.startswith("lexique:"))
+
+    @cached_property
+    def empreinte(self):
+        """
+        L'empreinte de l'extracteur : elle change avec sa version, le code des fonctions et des classes du
+        paquet qu'il appelle (ContexteExtraction compris), le contenu des lexiques et des données qu'elles
+        utilisent, les bases de normes et les lexiques de mots valides compilés ou importés s'il les lit, et
+        l'empreinte de ses dépendances.
+        """
+        description = [self.nom, str(self.version)]
+        references = _references(self.fonction)
+        references.update(_references(ContexteExtraction))
+        if any(cle.startswith("code:lingua_extraction.Normes_compilees.") for cle in references):
+            references["bases:compilees"] = _normaliser(empreinte_des_bases())
+        for cle, contenu in sorted(references.items()):
+            description.append(f"{cle}={contenu}")
+        description.extend(REGISTRE[dependance].empreinte for dependance in self.dependances)
+        return hashlib.sha256("\n".join(description).encode("utf-8")).hexdigest()
+
+
+# Registre ordonné de tous les extracteurs : un extracteur est toujours déclaré après ses dépendances
+REGISTRE = {}
+
+def extracteur(nom, categorie, variables, besoins=(TOKENS,), dependances=(), prechargement=None, version=1):
+    """
+    Décorateur qui enregistre une fonction d'extraction dans le registre.
+
+    La fonction reçoit le contexte d'extraction et le dictionnaire des résultats déjà calculés
+    (ceux de ses dépendances compris) et retourne un dictionnaire {variable: valeur}.
+    """
+    def decorer(fonction):
+        for dependance in dependances:
+            if dependance not in REGISTRE:
+                raise ValueError(f"L'extracteur '{nom}' dépend de '{dependance}', qui n'est pas encore enregistré.")
+        REGISTRE[nom] = Extracteur(nom, fonction, categorie, variables, besoins, dependances, prechargement, version)
+        return fonction
+    return decorer
+
+
+def _normaliser(valeur):
+    """Représentation stable d'une donnée (les ensembles et les dictionnaires sont triés)."""
+    if isinstance(valeur, dict):
+        return "{" + ",".join(sorted(f"{_normaliser(k)}:{_normaliser(v)}" for k, v in valeur.items())) + "}"
+    if isinstance(valeur, (set, frozenset)):
+        return "{" + ",".join(sorted(_normaliser(v) for v in valeur)) + "}"
+    if isinstance(valeur, (list, tuple)):
+        return "[" + ",".join(_normaliser(v) for v in valeur) + "]"
+    return repr(valeur)
+
+def _codes(code):
+    """Le code d'une fonction et ceux des fonctions, compréhensions et lambdas qu'elle contient."""
+    yield code
+    for constante in code.co_consts:
+        if isinstance(constante, types.CodeType):
+            yield from _codes(constante)
+
+def _du_paquet(objet):
+    """Indique si une fonction ou une classe est définie dans le paquet."""
+    return getattr(objet, "__module__", None) is not None and objet.__module__.startswith(__package__)
+
+def _references_classe(classe, vues):
+    """
+    Retourne le code source d'une classe du paquet (méthodes et propriétés comprises) et les références de
+    chacune de ses méthodes et de ses classes de base du paquet.
+    """
+    references = {}
+    if classe in vues:
+        return references
+    vues.add(classe)
+    try:
+        references[f"code:{classe.__module__}.{classe.__qualname__}"] = inspect.getsource(classe)
+    except (OSError, TypeError):
+        pass
+    for attribut in vars(classe).values():
+        # Propriétés, propriétés mises en cache, méthodes statiques et de classe
+        for nom in ("fget", "func", "__func__"):
+            attribut = getattr(attribut, nom, attribut)
+        references.update(_references(attribut, vues))
+    for base in classe.__mro__[1:]:
+        if _du_paquet(base):
+            references.update(_references_classe(base, vues))
+    return references
+
+def _references(fonction, vues=None):
+    """
+    Parcourt les fonctions et les classes du paquet appelées par une fonction et retourne leur code source
+    ainsi que le contenu des données globales qu'elles lisent (lexiques de Database_linguistique compris).
+    Les classes du paquet sont suivies jusque dans leurs méthodes et leurs propriétés, de même que la
+    classe des objets globaux du paquet (le gestionnaire des modèles HuggingFace, par exemple).
+
+    Returns:
+        dict: {"code:module.fonction": source, "lexique:nom": contenu, "donnee:module.nom": contenu}.
+    """
+    vues = set() if vues is None else vues
+    if isinstance(fonction, type):
+        return _references_classe(fonction, vues) if _du_paquet(fonction) else {}
+    fonction = inspect.unwrap(fonction)
+    references = {}
+    if not isinstance(fonction, types.FunctionType) or fonction in vues:
+        return references
+    vues.add(fonction)
+    try:
+        source = inspect.getsource(fonction)
+    except (OSError, TypeError):
+        source = fonction.__code__.co_code.hex()
+    references[f"code:{fonction.__module__}.{fonction.__qualname__}"] = source
+
+    for code in _codes(fonction.__code__):
+        for nom in code.co_names:
+            if nom not in fonction.__globals__:
+                continue
+            valeur = fonction.__globals__[nom]
+            if isinstance(valeur, (dict, list, set, frozenset, tuple, str, int, float)):
+                if getattr(Database_linguistique, nom, None) is valeur:
+                    references[f"lexique:{nom}"] = _normaliser(valeur)
+                else:
+                    references[f"donnee:{fonction.__module__}.{nom}"] = _normaliser(valeur)
+            elif isinstance(valeur, type) or (callable(valeur) and _du_paquet(inspect.unwrap(valeur))):
+                references.update(_references(valeur, vues))
+            elif _du_paquet(type(valeur)):
+                references.update(_references(type(valeur), vues))
+    return references
+
+@lru_cache(maxsize=None)
+def charger_base_de_normes(fichier, type_de_donnees):
+    """
+    Lit une base de données de normes lexicales du dossier Documents une seule fois par processus.
+
+    Returns:
+        pandas.DataFrame ou None: La base de données, ou None si le fichier n'est pas disponible.
+    """
+    chemin = importlib_resources.files(__package__) / "Documents" / fichier
+    if not chemin.is_file():
+        print(f"La base de données {fichier} n'est pas disponible.")
+        return None
+    return lire_base_de_donnees(chemin, type_de_donnees)
+
+def _prechargement_normes(base, fichier, type_de_donnees):
+    """
+    Retourne la fonction de préchargement d'une base de normes : la base compilée ou importée de chaque
+    langue si elle existe, sinon, pour l'anglais, le fichier Excel.
+    """
+    def precharger(langues):
+        for langue in langues:
+            moteur_normes(langue)
+            if langue == "English" and charger_normes_compilees(base) is None:
+                charger_base_de_normes(fichier, type_de_donnees)
+    return precharger
+
+def _moyennes_normes(contexte, prefixe, fonction, fichier, type_de_donnees):
+    """
+    Calcule une norme lexicale moyenne pour les mots, noms, verbes et adjectifs du texte. Avec les bases
+    compilées par `text2variable compile-norms` ou importées par `text2variable import-norms` pour la
+    langue du texte, toutes les normes sont calculées en un seul passage, partagé par les extracteurs de
+    normes ; sinon, pour l'anglais, la norme est calculée à partir du fichier Excel.
+    """
+    categories = ["mots", "noms", "verbes", "adjectifs"]
+    moteur = moteur_normes(contexte.langue)
+    if moteur.normes:
+        scores = contexte.partage("normes_moyennes", lambda: calculer_normes_moyennes(contexte, moteur))
+        if f"{prefixe}_mots" in scores:
+            return {cle: scores[cle] for categorie in categories
+                    for cle in (f"{prefixe}_{categorie}", f"{prefixe}_couverture_{categorie}")}
+    # La couverture n'est mesurée que par le moteur des bases compilées
+    sans_valeur = {f"{prefixe}_{type_de_sortie}{categorie}": None for type_de_sortie in ("", "couverture_")
+                   for categorie in categories}
+    if contexte.langue != "English":
+        return sans_valeur
+    base_de_donnees = charger_base_de_normes(fichier, type_de_donnees)
+    if base_de_donnees is None:
+        return sans_valeur
+    listes = analyser_texte(contexte)
+    return dict(sans_valeur, **{f"{prefixe}_{categorie}": fonction(liste, base_de_donnees)
+                                for categorie, liste in zip(categories, listes)})
+
+
+######## Mecanique de production de la parole ########
+
+@extracteur("lemmes", "mecanique", ["Nombre_de_lemmes"], besoins=(TAGGER,))
+def _lemmes(contexte, resultats):
+    return {"Nombre_de_lemmes": compter_lemmes(contexte.lemmes_sans_stop)}
+
+@extracteur("fragments", "mecanique", ["Nombre_de_fragments", "Nombre_de_fragments_autre_methode", "Fragments_en_contexte",
+                                      "Nombre_de_fragments_prefixes", "Couverture_lexique_valide"],
+            prechargement=lambda langues: [charger_lexique_valide(langue) for langue in langues
+                                           if langue in ('English', 'Francais')])
+def _fragments(contexte, resultats):
+    tokens_sans_ponctuation = [token for token in contexte.tokens
+                               if token not in string.punctuation and token not in type_des_marqueurs]
+    # Une seule recherche dans le lexique sert au nombre de fragments et à la couverture
+    valides = consulter_lexique_valide(tokens_sans_ponctuation, contexte.langue)
+    nombre_de_fragments = None if valides is None else int(len(valides) - valides.sum())
+    # Comme `detecter_fragments`, la couverture ne porte que sur les mots alphabétiques (ni nombres ni symboles)
+    valides_mots = None if valides is None else valides[[token.isalpha() for token in tokens_sans_ponctuation]]
+    fragments = detecter_fragments(contexte)
+    return {
+        "Nombre_de_fragments": nombre_de_fragments,
+        "Nombre_de_fragments_autre_methode": compteur_fragment_anciennce_version(contexte.tokens, contexte.langue),
+        "Fragments_en_contexte": sum(fragment["type"] == "repetition" for fragment in fragments),
+        # Sans lexique de mots valides, les préfixes ne peuvent pas être détectés
+        "Nombre_de_fragments_prefixes": (None if nombre_de_fragments is None
+                                         else sum(fragment["type"] == "prefixe" for fragment in fragments)),
+        # Part des mots cherchés qui figurent dans le lexique de mots valides
+        "Couverture_lexique_valide": (None if valides_mots is None or not len(valides_mots)
+                                      else float(valides_mots.mean())),
+    }
+
+@extracteur("nombre_de_mots", "mecanique", ["Nombre_de_mots"])
+def _nombre_de_mots(contexte, resultats):
+    return {"Nombre_de_mots": contexte.total_des_mots}
+
+######## Fluence ########
+
+@extracteur("pauses", "fluence", ["Nombre_de_pauses_silencieuses", "Nombre_de_pauses_remplies"])
+def _pauses(contexte, resultats):
+    return {
+        # "[pause]" et "[break]" sont des tokens uniques, et les pauses remplies des tokens typés
+        # 'pause_remplie' (voir Marqueurs_transcription)
+        "Nombre_de_pauses_silencieuses": pauses_silencieuses(contexte.tokens, contexte.langue),
+        "Nombre_de_pauses_remplies": pauses_remplies(contexte.doc, contexte.langue),
+    }
+
+@extracteur("repetitions", "fluence", ["Nombre_de_lemmes_differents", "Nombre_de_repetitions_mots"], besoins=(TAGGER,))
+def _repetitions(contexte, resultats):
+    nombre_lemmes_differents, nombre_repetitions = nombre_repetition_mot(contexte.lemmes_sans_stop)
+    return {
+        "Nombre_de_lemmes_differents": nombre_lemmes_differents,
+        "Nombre_de_repetitions_mots": nombre_repetitions,
+    }
+
+@extracteur("disfluences_ucsf", "fluence", ["UCSF_disfluency_*"])
+def _disfluences_ucsf(contexte, resultats):
+    # Les marqueurs UCSF sont comptés par le prétraitement, avant leur suppression
+    disfluency_counter = contexte.pretraitement.disfluences
+    return {
+        "UCSF_disfluency_single_repetition": disfluency_counter["="],
+        "UCSF_disfluency_multiple_repetitions": disfluency_counter["@"],
+        "UCSF_disfluency_repeated_phrase": disfluency_counter["&"],
+        "UCSF_disfluency_restart_rephrase": disfluency_counter["#"],
+        "UCSF_disfluency_partial_word_false_start": disfluency_counter["%"],
+        "UCSF_disfluency_spoonerism": disfluency_counter["$"],
+        "UCSF_disfluency_filled_pauses": pauses_remplies(contexte.texte, "UCSF"),
+        "UCSF_disfluency_silent_pauses": pauses_remplies(contexte.texte, "UCSF", "silent"),
+    }
+
+######## Caractéristiques lexicales ########
+
+@extracteur("parties_du_discours", "lexical",
+            ["*_count", "*_percentage"],
+            besoins=(TAGGER,))
+def _parties_du_discours(contexte, resultats):
+    sorties = {}
+    for key, value in Parts_of_Speech(contexte).items():
+        if isinstance(value, dict):
+            # Création des nouvelles clés pour le compte et le pourcentage
+            sorties[f"{key}_count"] = value.get("count", "N/A")
+            sorties[f"{key}_percentage"] = value.get("percentage", "N/A")
+        else:
+            # Gestion des valeurs "N/A"
+            sorties[f"{key}_count"] = "N/A"
+            sorties[f"{key}_percentage"] = "N/A"
+    return sorties
+
+@extracteur("classes_de_mots", "lexical", ["Mots_de_classe_ouverte", "Mots_de_classe_fermee"], besoins=(TAGGER,))
+def _classes_de_mots(contexte, resultats):
+    mot_ouvert, mot_ferme = count_open_closed_class_words(contexte)
+    return {"Mots_de_classe_ouverte": mot_ouvert, "Mots_de_classe_fermee": mot_ferme}
+
+@extracteur("gerondifs", "lexical", ["Nombre_de_gerondifs"], besoins=(TAGGER,))
+def _gerondifs(contexte, resultats):
+    return {"Nombre_de_gerondifs": compter_gerondifs(contexte)}
+
+@extracteur("verbes_inflexion", "lexical", ["Nombre_de_verbes_inflexion", "Verbe_inflection_relatif"], besoins=(TAGGER,))
+def _verbes_inflexion(contexte, resultats):
+    nombre_verbe_inflexion = compter_verbes_conjugues(contexte)
+    return {
+        "Nombre_de_verbes_inflexion": nombre_verbe_inflexion,
+        "Verbe_inflection_relatif": verbe_inflection_relatif(nombre_verbe_inflexion, contexte.total_des_mots),
+    }
+
+_cles_ratios = ['Pronoms/(Noms+Pronoms)', 'Noms/(Noms+Pronoms)', 'Noms/(Noms+Verbes)', 'Verbes/(Noms+Verbes)',
+                'Verbes_avec_inflexions/Total_Verbes', 'Mots_de_classe_ouverte/Total_Mots',
+                'Mots_de_classe_fermee/Total_Mots', 'Gerondifs/Total_Verbes', 'Gerondifs/Total_Mots']
+
+@extracteur("ratios", "lexical", _cles_ratios, besoins=(TAGGER,),
+            dependances=("parties_du_discours", "classes_de_mots", "gerondifs", "verbes_inflexion"))
+def _ratios(contexte, resultats):
+    # Les valeurs "count" des Verbes, Noms et Pronoms viennent des parties du discours
+    ratios = calculer_ratios(resultats.get("Verbe_count", 0), resultats.get("Nom_count", 0), resultats.get("Pronom_count", 0),
+                             resultats["Nombre_de_verbes_inflexion"], resultats["Mots_de_classe_ouverte"],
+                             resultats["Mots_de_classe_fermee"], resultats["Nombre_de_gerondifs"],
+                             contexte.total_des_mots)
+    return {cle: ratios.get(cle, "N/A") for cle in _cles_ratios}
+
+@extracteur("pronoms_deictiques", "lexical", ["Nombre_de_pronoms_deictiques*"])
+def _pronoms_deictiques(contexte, resultats):
+    nombre_de_pronoms_deictiques = count_deictic_pronouns(contexte)
+    return {
+        'Nombre_de_pronoms_deictiques': nombre_de_pronoms_deictiques.get("total_deictic_pronouns", "N/A"),
+        'Nombre_de_pronoms_deictiques_spatiaux': nombre_de_pronoms_deictiques.get("spatial", "N/A"),
+        'Nombre_de_pronoms_deictiques_personnels': nombre_de_pronoms_deictiques.get("personal", "N/A"),
+        'Nombre_de_pronoms_deictiques_temporels': nombre_de_pronoms_deictiques.get("temporal", "N/A"),
+    }
+
+@extracteur("termes_indefinis", "lexical", ["Nombre_de_termes_indefinis", "Ratio_termes_indefinis"])
+def _termes_indefinis(contexte, resultats):
+    ratio_nbre_termes_indefinis, nbre_termes_indefinis = ratio_termes_indefinis(contexte)
+    return {"Nombre_de_termes_indefinis": nbre_termes_indefinis, "Ratio_termes_indefinis": ratio_nbre_termes_indefinis}
+
+@extracteur("mattr", "lexical", ["MATTR_*"])
+def _mattr(contexte, resultats):
+    # Toutes les tailles de fenêtre (10, 25 et 40 par défaut) en un seul parcours
+    return {f"MATTR_{taille}": mattr for taille, mattr in calculer_mattrs(contexte, tailles_mattr).items()}
+
+@extracteur("diversite_lexicale", "lexical", ["Nombre_de_mots_uniques", "Statistique_R_de_Honore", "Brunet_W_indice"],
+            besoins=(TAGGER,), dependances=("repetitions",))
+def _diversite_lexicale(contexte, resultats):
+    nbres_mots_unique = calculer_nbres_mots_unique(contexte)
+    nombre_lemmes_differents = resultats["Nombre_de_lemmes_differents"]
+    return {
+        "Nombre_de_mots_uniques": nbres_mots_unique,
+        "Statistique_R_de_Honore": stat_R_Honore(contexte.total_des_mots, nombre_lemmes_differents, nbres_mots_unique),
+        "Brunet_W_indice": indice_de_Brunet(contexte.total_des_mots, nombre_lemmes_differents),
+    }
+
+@extracteur("familiarite", "normes", ["Familiarite_moyenne_*"], besoins=(TAGGER, NORMES),
+            prechargement=_prechargement_normes("familiarite", "Familiarity_Imageability_Database.xlsx", 'familiarite'))
+def _familiarite(contexte, resultats):
+    return _moyennes_normes(contexte, "Familiarite_moyenne", calculer_familiarite_moyenne,
+                            "Familiarity_Imageability_Database.xlsx", 'familiarite')
+
+@extracteur("imageabilite", "normes", ["Imageabilite_moyenne_*"], besoins=(TAGGER, NORMES),
+            prechargement=_prechargement_normes("familiarite", "Familiarity_Imageability_Database.xlsx", 'familiarite'))
+def _imageabilite(contexte, resultats):
+    return _moyennes_normes(contexte, "Imageabilite_moyenne", calculer_imageabilite_moyenne,
+                            "Familiarity_Imageability_Database.xlsx", 'familiarite')
+
+@extracteur("concretude", "normes", ["Concretude_moyenne_*"], besoins=(TAGGER, NORMES),
+            prechargement=_prechargement_normes("concretude", "Concreteness_Database.xlsx", 'concreteness'))
+def _concretude(contexte, resultats):
+    return _moyennes_normes(contexte, "Concretude_moyenne", calculer_concretude_moyenne,
+                            "Concreteness_Database.xlsx", 'concreteness')
+
+@extracteur("frequence", "normes", ["Frequence_moyenne_*"], besoins=(TAGGER, NORMES),
+            prechargement=_prechargement_normes("frequence", "Frequency_Database.xlsx", 'frequence'))
+def _frequence(contexte, resultats):
+    return _moyennes_normes(contexte, "Frequence_moyenne", calculer_frequence_moyenne,
+                            "Frequency_Database.xlsx", 'frequence')
+
+@extracteur("valence", "normes", ["Valence_moyenne_*"], besoins=(TAGGER, NORMES),
+            prechargement=_prechargement_normes("valence", "Valence_Database.xlsx", 'valence'))
+def _valence(contexte, resultats):
+    return _moyennes_normes(contexte, "Valence_moyenne", calculer_valence_moyenne,
+                            "Valence_Database.xlsx", 'valence')
+
+######## Caractéristiques sémantiques ########
+
+@extracteur("icu", "semantique", ["Nombre_ICU_TRUE", "Efficacite_ICU", "ICU *"], besoins=(TAGGER,))
+def _icu(contexte, resultats):
+    dict_info_contenu_T_or_F = analyse_text(contexte)
+    nombre_de_ICU_TRUE = nombre_ICU(dict_info_contenu_T_or_F)
+    sorties = {
+        "Nombre_ICU_TRUE": nombre_de_ICU_TRUE,
+        "Efficacite_ICU": calculer_ratio_mots_par_ICU_VRAI(contexte.total_des_mots, nombre_de_ICU_TRUE),
+    }
+    for mot, valeur in dict_info_contenu_T_or_F.items():
+        sorties["ICU " + mot] = valeur
+    return sorties
+
+@extracteur("densite_idees", "semantique", ["Densite_idees_*"], besoins=(VECTORS,))
+def _densite_idees(contexte, resultats):
+    return {f'Densite_idees_{cle}': valeur for cle, valeur in densite_idees(contexte, tailles_fenetres=[3, 10, 25, 40]).items()}
+
+######## Caractéristiques syntaxiques ########
+
+@extracteur("dependances", "syntaxe", ["Dep_absolue_*", "Dep_relative_*"], besoins=(PARSER,))
+def _dependances(contexte, resultats):
+    dependance_absolu, dependance_relative = analyze_text_dependencies(contexte)
+    return add_dependency_info({}, dependance_absolu, dependance_relative)
+
+@extracteur("longueur_dependances", "syntaxe", ["Longueur_moyenne_des_dependances", "Longueur_maximale_des_dependances"],
+            besoins=(PARSER,))
+def _longueur_dependances(contexte, resultats):
+    len_dep_syntaxique = main_dependency_analysis(contexte)
+    return {
+        'Longueur_moyenne_des_dependances': len_dep_syntaxique.get("Longueur_moyenne_des_dependances", "N/A"),
+        'Longueur_maximale_des_dependances': len_dep_syntaxique.get("Longueur_maximale_des_dependances", "N/A"),
+    }
+
+@extracteur("enfants", "syntaxe", ["Moyenne_enfants_*", "Total_enfants_*"], besoins=(PARSER,))
+def _enfants(contexte, resultats):
+    enfants_droite_gauche = analyze_children(contexte)
+    return {cle: enfants_droite_gauche.get(cle, "N/A") for cle in
+            ("Moyenne_enfants_gauches", "Moyenne_enfants_droits", "Total_enfants_gauches", "Total_enfants_droits")}
+
+_cles_clauses = ["Sujets_Clausaux", "Complements_Clausaux_Controles", "Complements_Clausaux_Non_Controles",
+                 "Modificateurs_Clauses_Adverbiaux", "Modificateurs_Clauses_Adnominaux"]
+
+@extracteur("clauses_subordonnees", "syntaxe",
+            [f"{cle}_{mesure}" for cle in _cles_clauses for mesure in ("absolu", "relatif")], besoins=(PARSER,))
+def _clauses_subordonnees(contexte, resultats):
+    clauses = translate_variables_subordinate_close_to_french(analyze_subordinate_clauses(contexte))
+    sorties = {}
+    for cle in _cles_clauses:
+        sorties[f"{cle}_absolu"] = clauses.get("Nombre_absolu", {}).get(cle, "N/A")
+        sorties[f"{cle}_relatif"] = clauses.get("Frequence_relative", {}).get(cle, "N/A")
+    return sorties
+
+@extracteur("longueur_phrases", "syntaxe", ["Longueur_moyenne_phrases"], besoins=(PARSER,))
+def _longueur_phrases(contexte, resultats):
+    return {"Longueur_moyenne_phrases": calculate_average_sentence_length(contexte)}
+
+@extracteur("phrases_incompletes", "syntaxe", ["Nombre_de_phrases_incompletes_*"], besoins=(TAGGER, PARSER))
+def _phrases_incompletes(contexte, resultats):
+    phrases = count_incomplete_sentences(contexte, contexte.total_des_mots)
+    return {
+        'Nombre_de_phrases_incompletes_absolu': phrases.get("Nombre_absolu_phrases_incompletes", "N/A"),
+        'Nombre_de_phrases_incompletes_relatif': phrases.get("Frequence_relative_phrases_incompletes", "N/A"),
+    }
+
+@extracteur("phrases_prepositionnelles", "syntaxe", ["Nombre_de_phrases_prepositionnelles_*"], besoins=(TAGGER, PARSER))
+def _phrases_prepositionnelles(contexte, resultats):
+    phrases = count_prepositional_sentences(contexte, contexte.total_des_mots)
+    return {
+        'Nombre_de_phrases_prepositionnelles_absolu': phrases.get("Nombre_absolu_phrases_prepositionnelles", "N/A"),
+        'Nombre_de_phrases_prepositionnelles_relatif': phrases.get("Frequence_relative_phrases_prepositionnelles", "N/A"),
+    }
+
+@extracteur("phrases_verbales", "syntaxe", ["Nombre_de_phrases_verbales_*"], besoins=(TAGGER, PARSER))
+def _phrases_verbales(contexte, resultats):
+    phrases = count_verbal_sentences(contexte, contexte.total_des_mots)
+    return {
+        'Nombre_de_phrases_verbales_absolu': phrases.get("Nombre_absolu_phrases_verbales", "N/A"),
+        'Nombre_de_phrases_verbales_relatif': phrases.get("Frequence_relative_phrases_verbales", "N/A"),
+    }
+
+@extracteur("phrases_nominales", "syntaxe",
+            ["Nombre_absolu_phrases_nominales", "Longueur_moyenne_phrases_nominales", "Frequence_relative_phrases_nominales"],
+            besoins=(TAGGER, PARSER))
+def _phrases_nominales(contexte, resultats):
+    phrases = analyze_nominal_sentences(contexte, contexte.total_des_mots)
+    return {cle: phrases.get(cle, "N/A") for cle in
+            ("Nombre_absolu_phrases_nominales", "Longueur_moyenne_phrases_nominales", "Frequence_relative_phrases_nominales")}
+
+@extracteur("temps_verbaux", "syntaxe", ["Nbre_verb_*"], besoins=(TAGGER,))
+def _temps_verbaux(contexte, resultats):
+    temps_verbes = count_verb_tenses(contexte, contexte.total_des_mots)
+    sorties = {}
+    for temps in ("present", "past", "future"):
+        sorties[f'Nbre_verb_{temps}_absolu'] = temps_verbes.get("Nombre_absolu", {}).get(temps, "N/A")
+        sorties[f'Nbre_verb_{temps}_relatif'] = temps_verbes.get("Frequence_relative", {}).get(temps, "N/A")
+    return sorties
+
+@extracteur("clauses_par_phrase", "syntaxe", ["Nbre_clauses_par_phrase"], besoins=(PARSER,))
+def _clauses_par_phrase(contexte, resultats):
+    return {"Nbre_clauses_par_phrase": calculate_clauses_per_sentence(contexte)}
+
+@extracteur("noms_determinants", "syntaxe", ["Proportion_noms_determinants"], besoins=(TAGGER, PARSER))
+def _noms_determinants(contexte, resultats):
+    return {"Proportion_noms_determinants": calculate_nouns_with_determiners_proportion(contexte)}
+
+@extracteur("phrases_coordonnees", "syntaxe", ["Nombre_de_phrases_coordonnees", "Frequence_relative_phrases_coordonnees"],
+            besoins=(PARSER,))
+def _phrases_coordonnees(contexte, resultats):
+    phrases = count_coordinated_sentences(contexte, contexte.total_des_mots)
+    return {
+        "Nombre_de_phrases_coordonnees": phrases.get("Nombre_absolu_phrases_coordonnees", "N/A"),
+        "Frequence_relative_phrases_coordonnees": phrases.get("Frequence_relative_phrases_coordonnees", "N/A"),
+    }
+
+######## Caractéristiques pragmatiques ########
+
+@extracteur("coherence_locale", "pragmatique", ["Coherence_*"], besoins=(PARSER, VECTORS))
+def _coherence_locale(contexte, resultats):
+    # Cohérence locale, décalages 2 et 3, cohérence globale et entre interventions
+    return calculer_coherence(contexte)
+
+@extracteur("sentiment", "pragmatique", ["Sentiment-valence"], besoins=(TRANSFORMER,),
+            prechargement=lambda langues: gestionnaire.precharger("sentiment"))
+def _sentiment(contexte, resultats):
+    return {"Sentiment-valence": get_sentiment(contexte.texte)}  # "Positive", "Negative", "Neutral
+
+@extracteur("emotion", "pragmatique", ["Emotion"], besoins=(TRANSFORMER,),
+            prechargement=lambda langues: gestionnaire.precharger("emotion"))
+def _emotion(contexte, resultats):
+    return {"Emotion": get_emotion(contexte.texte)}
+
+@extracteur("incertitude", "pragmatique", ["Nombre_de_mots_incertitude", "Frequence_relative_mots_incertitude"])
+def _incertitude(contexte, resultats):
+    mots = count_uncertainty_words(contexte, contexte.total_des_mots)
+    return {
+        "Nombre_de_mots_incertitude": mots.get("Nombre_absolu_mots_incertitude", "N/A"),
+        "Frequence_relative_mots_incertitude": mots.get("Frequence_relative_mots_incertitude", "N/A"),
+    }
+
+def _nombre_et_frequence(suffixe, mesures):
+    """Met en forme un dictionnaire {'Nombre_absolu', 'Frequence_relative'} avec les clés de sortie."""
+    return {
+        f"Nombre_de_mots_{suffixe}": mesures.get("Nombre_absolu", "N/A"),
+        f"Frequence_relative_mots_{suffixe}": mesures.get("Frequence_relative", "N/A"),
+    }
+
+@extracteur("acces_lexical", "pragmatique", ["*_mots_difficulte_acces_lexical"])
+def _acces_lexical(contexte, resultats):
+    return _nombre_et_frequence("difficulte_acces_lexical",
+                                count_lexical_access_difficulty_words(contexte, contexte.total_des_mots))
+
+@extracteur("expressions_formulaiques", "pragmatique", ["*_mots_expression_formulaiques"])
+def _expressions_formulaiques(contexte, resultats):
+    return _nombre_et_frequence("expression_formulaiques", count_formulaic_expressions(contexte, contexte.total_des_mots))
+
+@extracteur("modalisations", "pragmatique", ["*_mots_modalisations"])
+def _modalisations(contexte, resultats):
+    return _nombre_et_frequence("modalisations", analyze_modal_expressions(contexte))
+
+@extracteur("mots_de_remplissage", "pragmatique", ["*_mots_de_remplissage"])
+def _mots_de_remplissage(contexte, resultats):
+    return _nombre_et_frequence("de_remplissage", analyze_filler_words(contexte, contexte.total_des_mots))
+
+
+def _decouper(valeurs):
+    """Accepte une liste de chaînes ou de chaînes séparées par des virgules."""
+    if not valeurs:
+        return []
+    if isinstance(valeurs, str):
+        valeurs = [valeurs]
+    return [element.strip() for valeur in valeurs for element in valeur.split(",") if element.strip()]
+
+def _resoudre(element):
+    """Retourne les noms des extracteurs désignés par un nom d'extracteur, une catégorie ou une variable."""
+    if element in REGISTRE:
+        return [element]
+    noms = [nom for nom, ext in REGISTRE.items() if ext.categorie == element]
+    if not noms:
+        noms = [nom for nom, ext in REGISTRE.items() if ext.produit(element)]
+    if not noms:
+        raise ValueError(f"Variable, extracteur ou catégorie inconnu : '{element}'.")
+    return noms
+
+def selectionner_extracteurs(features=None, exclude=None):
+    """
+    Sélectionne les extracteurs à exécuter à partir des options --features et --exclude.
+
+    Args:
+        features (list ou str): Extracteurs, catégories ou variables (motifs glob acceptés) à calculer.
+                                Tous les extracteurs sont sélectionnés si la valeur est vide.
+        exclude (list ou str): Extracteurs, catégories ou variables à ne pas calculer.
+
+    Returns:
+        tuple: La liste ordonnée des extracteurs à exécuter (dépendances comprises) et l'ensemble
+               des noms des extracteurs demandés, dont les variables figureront dans la sortie.
+    """
+    demandes = _decouper(features)
+    if demandes:
+        selection = {nom for element in demandes for nom in _resoudre(element)}
+    else:
+        selection = set(REGISTRE)
+    for element in _decouper(exclude):
+        selection -= set(_resoudre(element))
+
+    # Ajout des dépendances (le registre est déjà ordonné topologiquement)
+    a_executer = set(selection)
+    for nom in reversed(list(REGISTRE)):
+        if nom in a_executer:
+            a_executer.update(REGISTRE[nom].dependances)
+
+    return [REGISTRE[nom] for nom in REGISTRE if nom in a_executer], selection
+
+def precharger_ressources(extracteurs, langues):
+    """
+    Charge à l'avance les bases de normes et les modèles HuggingFace des extracteurs donnés.
+
+    Args:
+        extracteurs (list): Les extracteurs sélectionnés.
+        langues (list): Les langues des transcriptions à traiter.
+    """
+    for ext in extracteurs:
+        if ext.prechargement is not None:
+            ext.prechargement(langues)
+
+def besoins_des_extracteurs(extracteurs):
+    """Retourne l'union des besoins des extracteurs donnés."""
+    besoins = {TOKENS}
+    for ext in extracteurs:
+        besoins |= ext.besoins
+    return besoins
+
+def calculer_extracteurs(contexte, extracteurs, en_cache=None):
+    """
+    Exécute les extracteurs dans l'ordre du registre sur un contexte d'extraction.
+
+    Args:
+        contexte (ContexteExtraction): Le contexte contenant le Doc spaCy de la transcription. Il peut être
+                                       None si les variables de tous les extracteurs sont en cache.
+        extracteurs (list): Les extracteurs à exécuter, tels que retournés par `selectionner_extracteurs`.
+        en_cache (dict): Les variables déjà calculées de certains extracteurs {nom: variables} (optionnel).
+                         Ces extracteurs ne sont pas exécutés à nouveau.
+
+    Returns:
+        dict: Les variables de chaque extracteur {nom: variables}, dans l'ordre d'exécution.
+    """
+    en_cache = en_cache or {}
+    resultats, par_extracteur = {}, {}
+    for ext in extracteurs:
+        if ext.nom in en_cache:
+            variables = en_cache[ext.nom]
+        else:
+            variables = ext.fonction(contexte, resultats)
+        resultats.update(variables)
+        par_extracteur[ext.nom] = variables
+    return par_extracteur
+
+_normes_ordonnees = ["Familiarite_moyenne", "Imageabilite_moyenne", "Concretude_moyenne", "Frequence_moyenne",
+                     "Valence_moyenne"]
+
+# Ordre des colonnes des fichiers JSON et Excel de sortie, tel qu'avant le registre des extracteurs. Une
+# entrée est un nom de variable ou un tuple de motifs dont les variables gardent l'ordre de l'extracteur ;
+# les variables absentes de la liste sont placées à la fin, dans l'ordre du registre.
+ordre_des_sorties = [
+    "Nombre_de_lemmes", "Nombre_de_fragments", "Nombre_de_fragments_autre_methode", "Fragments_en_contexte",
+    "Nombre_de_fragments_prefixes", "Couverture_lexique_valide", "Nombre_de_mots",
+    "Nombre_de_pauses_silencieuses", "Nombre_de_pauses_remplies", "Nombre_de_lemmes_differents",
+    "Nombre_de_repetitions_mots", "Mots_de_classe_ouverte", "Mots_de_classe_fermee", "Nombre_de_gerondifs",
+    *_cles_ratios,
+    "Nombre_de_pronoms_deictiques", "Nombre_de_pronoms_deictiques_spatiaux", "Nombre_de_pronoms_deictiques_personnels",
+    "Nombre_de_pronoms_deictiques_temporels", "Nombre_de_termes_indefinis", "Ratio_termes_indefinis",
+    ("MATTR_*",), "Nombre_de_mots_uniques", "Statistique_R_de_Honore",
+    *[f"{prefixe}_{type_de_sortie}{categorie}" for prefixe in _normes_ordonnees for type_de_sortie in ("", "couverture_")
+      for categorie in ("mots", "noms", "verbes", "adjectifs")],
+    "Brunet_W_indice", "Nombre_ICU_TRUE", "Efficacite_ICU",
+    "Longueur_moyenne_des_dependances", "Longueur_maximale_des_dependances", "Moyenne_enfants_gauches",
+    "Moyenne_enfants_droits", "Total_enfants_gauches", "Total_enfants_droits",
+    "Nombre_de_verbes_inflexion", "Verbe_inflection_relatif",
+    *[f"{cle}_{mesure}" for cle in _cles_clauses for mesure in ("absolu", "relatif")],
+    "Longueur_moyenne_phrases",
+    *[f"Nombre_de_phrases_{type_de_phrase}_{mesure}" for type_de_phrase in ("incompletes", "prepositionnelles", "verbales")
+      for mesure in ("absolu", "relatif")],
+    "Nombre_absolu_phrases_nominales", "Longueur_moyenne_phrases_nominales", "Frequence_relative_phrases_nominales",
+    *[f"Nbre_verb_{temps}_{mesure}" for temps in ("present", "past", "future") for mesure in ("absolu", "relatif")],
+    "Nbre_clauses_par_phrase", "Proportion_noms_determinants",
+    "Nombre_de_phrases_coordonnees", "Frequence_relative_phrases_coordonnees", "Coherence_locale", ("Coherence_*",),
+    "Sentiment-valence", "Emotion",
+    *[f"{mesure}_mots_{suffixe}" for suffixe in ("incertitude", "difficulte_acces_lexical", "expression_formulaiques",
+                                                 "modalisations", "de_remplissage")
+      for mesure in ("Nombre_de", "Frequence_relative")],
+    ("UCSF_disfluency_*",), ("*_count", "*_percentage"), ("Densite_idees_*",), ("ICU *",),
+    ("Dep_absolue_*", "Dep_relative_*"),
+]
+
+_rangs_des_sorties = {entree: rang for rang, entree in enumerate(ordre_des_sorties) if isinstance(entree, str)}
+_motifs_des_sorties = [(rang, entree) for rang, entree in enumerate(ordre_des_sorties) if isinstance(entree, tuple)]
+
+@lru_cache(maxsize=None)
+def _rang_sortie(variable):
+    """Position d'une variable dans `ordre_des_sorties` (après toutes les autres si elle n'y figure pas)."""
+    if variable in _rangs_des_sorties:
+        return _rangs_des_sorties[variable]
+    for rang, motifs in _motifs_des_sorties:
+        if any(fnmatch.fnmatchcase(variable, motif) for motif in motifs):
+            return rang
+    return len(ordre_des_sorties)
+
+def assembler_sorties(par_extracteur, selection=None):
+    """
+    Rassemble les variables des extracteurs sélectionnés, dans l'ordre des colonnes de `ordre_des_sorties`.
+
+    Args:
+        par_extracteur (dict): Les variables de chaque extracteur, retournées par `calculer_extracteurs`.
+        selection (set): Les noms des extracteurs dont les variables sont conservées dans la sortie.
+                         Toutes les variables sont conservées si la valeur est None.
+
+    Returns:
+        dict: Les variables de sortie.
+    """
+    sorties = {}
+    for nom, variables in par_extracteur.items():
+        if selection is None or nom in selection:
+            sorties.update(variables)
+    # Le tri est stable : les variables de même rang gardent l'ordre du registre
+    return {variable: sorties[variable] for variable in sorted(sorties, key=_rang_sortie)}
+
+def extraire_variables(contexte, extracteurs, selection=None):
+    """
+    Exécute les extracteurs dans l'ordre du registre sur un contexte d'extraction.
+
+    Args:
+        contexte (ContexteExtraction): Le contexte contenant le Doc spaCy de la transcription.
+        extracteurs (list): Les extracteurs à exécuter, tels que retournés par `selectionner_extracteurs`.
+        selection (set): Les noms des extracteurs dont les variables sont conservées dans la sortie.
+                         Toutes les variables sont conservées si la valeur est None.
+
+    Returns:
+        dict: Les variables calculées.
+    """
+    return assembler_sorties(calculer_extracteurs(contexte, extracteurs), selection)
+
+def decrire_registre():
+    """Retourne une description lisible des extracteurs du registre, utilisée par --list-features."""
+    lignes = []
+    for ext in REGISTRE.values():
+        lignes.append(f"{ext.nom} [{ext.categorie}] besoins={','.join(sorted(ext.besoins))}")
+        lignes.append(f"    {', '.join(ext.variables)}")
+    return "\n".join(lignes)
@@ -19,3 +19,38 @@ def save_json_file(output_path, data):
     except Exception as e:
         print(f"Une erreur s'est produite lors de l'enregistrement du fichier {output_path}: {str(e)}")
         return False
+
+def save_excel_file(output_path, rows):
+    """
+    Enregistre une ou plusieurs lignes de variables dans un fichier Excel.
+
+    Args:
+        output_path (str): Le chemin complet du fichier Excel de sortie.
+        rows (list): Les dictionnaires de variables, un par transcription.
+    """
+    import pandas as pd
+    # Convertissez les dictionnaires en un DataFrame pandas
+    df = pd.DataFrame(rows)
+
+    # Enregistrez le DataFrame dans un fichier Excel en utilisant openpyxl comme moteur
+    df.to_excel(output_path, index=False, engine='openpyxl')
+
+def save_results(output_dir, output_name, data):
+    """
+    Enregistre les variables d'une transcription dans le dossier de sortie, en le créant si besoin.
+
+    Args:
+        output_dir (str): Le dossier de sortie.
+        output_name (str): Le nom du fichier JSON de sortie.
+        data (dict): Les variables à enregistrer.
+
+    Returns:
+        str: Le chemin complet du fichier JSON de sortie.
+    """
+    # Créer le dossier de sortie s'il n'existe pas
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Composez le chemin complet du fichier de sortie
+    output_path = os.path.join(output_dir, output_name)
+    save_json_file(output_path, data)
+    return output_path
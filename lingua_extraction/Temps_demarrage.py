@@ -0,0 +1,76 @@
+import argparse
+import subprocess
+import sys
+
+# Dépendances lourdes qui ne doivent pas être importées par l'aide et l'analyse des arguments
+modules_lourds = ["spacy", "transformers", "torch", "tensorflow", "sklearn", "pandas", "nltk", "numpy"]
+
+# Budget par défaut, en millisecondes, de l'importation du paquet pour `text2variable --help`
+budget_par_defaut = 150
+
+def mesurer_demarrage(arguments=("--help",)):
+    """
+    Mesure, dans un nouvel interpréteur (`python -X importtime`), les importations faites par
+    `text2variable` pour les arguments donnés.
+
+    Args:
+        arguments (tuple): Les arguments passés à `text2variable`.
+
+    Returns:
+        tuple: (le temps cumulé d'importation de chaque module de premier niveau, en millisecondes, et la
+               liste de tous les modules importés, y compris ceux importés par un autre module).
+    """
+    code = ("import sys\n"
+            "from lingua_extraction.main import main\n"
+            "try:\n"
+            f"    main({list(arguments)!r})\n"
+            "except SystemExit:\n"
+            "    pass\n")
+    execution = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               capture_output=True, text=True)
+    temps, modules = {}, []
+    for ligne in execution.stderr.splitlines():
+        if not ligne.startswith("import time:") or "cumulative" in ligne:
+            continue
+        _, cumule, module = ligne[len("import time:"):].split("|")
+        modules.append(module.strip())
+        # Les modules importés par un autre module sont indentés
+        if not module.startswith("  "):
+            temps[module.strip()] = int(cumule) / 1000
+    return temps, modules
+
+def verifier_demarrage(arguments=("--help",), budget=budget_par_defaut):
+    """
+    Vérifie que le démarrage de `text2variable` reste sous le budget et n'importe aucune dépendance lourde.
+
+    Returns:
+        tuple: (True si la vérification réussit, temps d'importation du paquet en ms, modules lourds importés).
+    """
+    temps, modules = mesurer_demarrage(arguments)
+    temps_paquet = sum(duree for module, duree in temps.items() if module.split(".")[0] == "lingua_extraction")
+    # Une dépendance lourde importée par un module du paquet ou par une autre dépendance compte aussi
+    importes = list(dict.fromkeys(module.split(".")[0] for module in modules
+                                  if module.split(".")[0] in modules_lourds))
+    return temps_paquet <= budget and not importes, temps_paquet, importes
+
+def main_demarrage(argv):
+    """
+    Vérifie le temps de démarrage de l'aide et de l'analyse des arguments :
+
+        text2variable demarrage --budget 150
+    """
+    parser = argparse.ArgumentParser(prog="text2variable demarrage",
+                                     description="Vérifie le temps d'importation de text2variable (python -X importtime).")
+    parser.add_argument("--budget", type=float, default=budget_par_defaut,
+                        help=f"Budget en millisecondes (défaut : {budget_par_defaut})")
+    parser.add_argument("arguments", nargs="*", default=["--help"],
+                        help="Arguments de text2variable à mesurer (défaut : --help)")
+    args = parser.parse_args(argv)
+
+    reussi, temps_paquet, importes = verifier_demarrage(tuple(args.arguments), args.budget)
+    print(f"Importation de lingua_extraction pour '{' '.join(args.arguments)}' : {temps_paquet:.1f} ms "
+          f"(budget : {args.budget:.0f} ms)")
+    if importes:
+        print(f"Dépendances lourdes importées : {', '.join(importes)}")
+    if not reussi:
+        sys.exit(1)
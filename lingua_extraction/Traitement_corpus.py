@@ -0,0 +1,380 @@
+import csv
+import glob
+import math
+import multiprocessing
+import os
+from .load_models import SpaCyModelLoader, analyser_textes, composants_a_exclure
+from .Importation_database import lire_transcription, langues
+from .Preprocessing.Pretraitement import pretraiter
+from .Contexte_extraction import ContexteExtraction
+from .Cache_analyses import CacheAnalyses
+from .Cache_resultats import CacheResultats
+from .Cache_inferences import CacheInferences
+from .Modeles_transformers import gestionnaire
+from .Normes_compilees import extraire_hors_vocabulaire, fusionner_hors_vocabulaire
+from .Registre_variables import (
+    REGISTRE,
+    besoins_des_extracteurs,
+    calculer_extracteurs,
+    assembler_sorties,
+    precharger_ressources)
+
+# Extensions des fichiers de transcription reconnus dans un dossier
+extensions_transcriptions = (".json", ".txt")
+
+# Colonnes reconnues dans un manifeste CSV/TSV
+colonnes_manifeste = {
+    "chemin": ["chemin", "path", "fichier", "file"],
+    "langue": ["langue", "language"],
+    "participant_id": ["participant_id", "pid", "id"],
+    "tache": ["tache", "task"],
+}
+
+def lire_manifeste(chemin_manifeste):
+    """
+    Lit un manifeste CSV (ou TSV) listant les transcriptions d'un corpus.
+
+    Le manifeste doit contenir une colonne "chemin" (ou "path") et peut contenir les colonnes "langue",
+    "participant_id" et "tache" (ou "task"). Les chemins relatifs sont résolus par rapport au dossier du manifeste.
+
+    Args:
+        chemin_manifeste (str): Le chemin du manifeste.
+
+    Returns:
+        list: Une liste de dictionnaires {"chemin", "langue", "participant_id", "tache"}.
+    """
+    delimiteur = "\t" if chemin_manifeste.endswith(".tsv") else ","
+    dossier = os.path.dirname(os.path.abspath(chemin_manifeste))
+    entrees = []
+    with open(chemin_manifeste, "r", encoding="utf-8", newline="") as f:
+        for ligne in csv.DictReader(f, delimiter=delimiteur):
+            ligne = {cle.strip().lower(): (valeur or "").strip() for cle, valeur in ligne.items() if cle}
+            entree = {}
+            for champ, noms in colonnes_manifeste.items():
+                entree[champ] = next((ligne[nom] for nom in noms if ligne.get(nom)), None)
+            if entree["chemin"] is None:
+                raise ValueError(f"Le manifeste {chemin_manifeste} doit contenir une colonne 'chemin' ou 'path'.")
+            entree["chemin"] = os.path.join(dossier, entree["chemin"])
+            entrees.append(entree)
+    return entrees
+
+def collecter_fichiers(sources, manifeste=None):
+    """
+    Rassemble les transcriptions désignées par des dossiers, des motifs glob, des fichiers et un manifeste.
+
+    Args:
+        sources (list): Les dossiers (fichiers .json et .txt), motifs glob ou fichiers à traiter.
+        manifeste (str): Le chemin d'un manifeste CSV/TSV (optionnel).
+
+    Returns:
+        list: Une liste de dictionnaires contenant au moins la clé "chemin", dans un ordre déterministe.
+    """
+    entrees = []
+    for source in sources:
+        if os.path.isdir(source):
+            chemins = sorted(os.path.join(source, nom) for nom in os.listdir(source)
+                             if nom.endswith(extensions_transcriptions))
+        elif any(caractere in source for caractere in "*?["):
+            chemins = sorted(glob.glob(source, recursive=True))
+        else:
+            chemins = [source]
+        entrees.extend({"chemin": chemin} for chemin in chemins)
+    if manifeste:
+        entrees.extend(lire_manifeste(manifeste))
+    return entrees
+
+def preparer_transcription(entree, langue=None, participant_id=None, tache=None):
+    """
+    Lit une transcription et la prétraite (marqueurs UCSF comptés et retirés, mots relevés) avant l'analyse spaCy.
+
+    Args:
+        entree (dict): L'entrée retournée par `collecter_fichiers` (le chemin et, si le manifeste les fournit,
+                       la langue, l'identifiant du participant et la tâche).
+        langue (str): La langue par défaut des fichiers TXT (optionnel).
+        participant_id (str): L'identifiant du participant par défaut des fichiers TXT (optionnel).
+        tache (str): L'image utilisée pour la production du texte, par défaut (optionnel).
+
+    Returns:
+        dict ou None: La transcription prête pour l'extraction, ou None si le fichier ne peut pas être lu.
+    """
+    transcription = lire_transcription(entree["chemin"], entree.get("langue") or langue,
+                                       entree.get("participant_id") or participant_id)
+    if transcription is None:
+        return None
+    transcription["tache"] = entree.get("tache") or tache
+    # Le texte original, avec les marqueurs UCSF, reste disponible ; les statistiques du prétraitement
+    # sont transmises au contexte d'extraction
+    pretraitement = pretraiter(transcription["texte"])
+    transcription["texte_original"] = transcription["texte"]
+    transcription["texte"] = pretraitement.texte
+    transcription["pretraitement"] = pretraitement
+    return transcription
+
+def noms_des_sorties(transcriptions):
+    """
+    Choisit un nom de fichier de sortie distinct pour chaque transcription d'un corpus.
+
+    Le nom du fichier sans extension est conservé quand il est unique. Sinon, les transcriptions de même
+    nom sont nommées d'après leur chemin relatif au dossier commun, extension comprise, séparateurs remplacés
+    par "_" (Documents/BCG14703.json et Documents/fr/BCG14703.json donnent BCG14703_json et fr_BCG14703_json) ;
+    un suffixe numérique départage les noms encore identiques.
+
+    Args:
+        transcriptions (list): Les transcriptions retournées par `preparer_transcription`.
+
+    Returns:
+        list: Les noms des fichiers de sortie, "{nom}_lingua_extraction_metrics.json", dans l'ordre des transcriptions.
+    """
+    par_nom = {}
+    for position, transcription in enumerate(transcriptions):
+        par_nom.setdefault(transcription["nom"], []).append(position)
+    noms = [transcription["nom"] for transcription in transcriptions]
+    for positions in par_nom.values():
+        if len(positions) < 2:
+            continue
+        chemins = [os.path.abspath(transcriptions[position]["chemin"]) for position in positions]
+        racine = os.path.commonpath([os.path.dirname(chemin) for chemin in chemins])
+        for position, chemin in zip(positions, chemins):
+            noms[position] = os.path.relpath(chemin, racine).replace(os.sep, "_").replace(".", "_")
+    utilises, sorties = set(), []
+    for nom in noms:
+        candidat, numero = nom, 1
+        while candidat in utilises:
+            numero += 1
+            candidat = f"{nom}_{numero}"
+        utilises.add(candidat)
+        sorties.append(f"{candidat}_lingua_extraction_metrics.json")
+    return sorties
+
+def construire_sortie(transcription, nom_du_modele, variables):
+    """Ajoute les informations d'identification de la transcription aux variables extraites."""
+    output_data = {
+        "filename": transcription["nom"],
+        "participant_id": transcription["participant_id"],
+        "Langue": transcription["langue"],
+        "SpaCy_Model": nom_du_modele,
+    }
+    output_data.update(variables)
+    return output_data
+
+def extraire_corpus(transcriptions, taille_modele, extracteurs, selection=None, batch_size=64, loader=None, cache=None,
+                    cache_resultats=None):
+    """
+    Extrait les variables d'un ensemble de transcriptions en chargeant chaque modèle une seule fois.
+
+    Les transcriptions sont regroupées par langue, puis analysées par lots avec `nlp.pipe`. Une erreur
+    dans une transcription est signalée sans interrompre le traitement du reste du corpus. Avec un cache
+    d'analyses, les textes déjà analysés par le même modèle ne sont pas analysés à nouveau ; avec un cache
+    de résultats, seuls les extracteurs dont l'empreinte a changé sont exécutés.
+
+    Args:
+        transcriptions (list): Les transcriptions retournées par `preparer_transcription`.
+        taille_modele (str): La taille du modèle spaCy ('sm', 'md', 'lg' ou 'trf').
+        extracteurs (list): Les extracteurs à exécuter, tels que retournés par `selectionner_extracteurs`.
+        selection (set): Les noms des extracteurs dont les variables sont conservées dans la sortie (optionnel).
+        batch_size (int): Le nombre de textes envoyés ensemble au modèle spaCy.
+        loader (SpaCyModelLoader): Le chargeur de modèles à réutiliser (optionnel).
+        cache (CacheAnalyses): Le cache persistant des analyses spaCy (optionnel).
+        cache_resultats (CacheResultats): Le cache persistant des variables par extracteur (optionnel).
+
+    Yields:
+        tuple: (position de la transcription, transcription, variables ou None, message d'erreur ou None).
+    """
+    loader = loader or SpaCyModelLoader()
+    exclude = composants_a_exclure(besoins_des_extracteurs(extracteurs))
+
+    # Regroupement par langue en conservant l'ordre d'apparition
+    par_langue = {}
+    for position, transcription in enumerate(transcriptions):
+        par_langue.setdefault(transcription["langue"], []).append((position, transcription))
+
+    for langue, groupe in par_langue.items():
+        if langue not in langues.values():
+            for position, transcription in groupe:
+                yield position, transcription, None, f"Langue non reconnue pour le moment : {langue}"
+            continue
+
+        nom_du_modele = loader.get_model_name(langue, taille_modele)
+        if nom_du_modele is None:
+            for position, transcription in groupe:
+                yield position, transcription, None, f"Taille de modèle non valide : {taille_modele}"
+            continue
+
+        # Variables encore valides dans le cache de résultats : une transcription dont tous les
+        # extracteurs sont à jour n'a pas besoin d'être analysée par spaCy
+        entrees, en_cache = [], []
+        for _, transcription in groupe:
+            if cache_resultats is None:
+                entrees.append((None, {}))
+                en_cache.append({})
+                continue
+            cle = cache_resultats.cle(transcription, nom_du_modele)
+            entree = cache_resultats.lire(cle)
+            entrees.append((cle, entree))
+            en_cache.append(cache_resultats.a_jour(entree, extracteurs))
+        a_analyser = [len(valides) < len(extracteurs) for valides in en_cache]
+        textes = [transcription["texte"] for (_, transcription), analyse in zip(groupe, a_analyser) if analyse]
+
+        # Une erreur de chargement ou d'analyse est rendue à la place du Doc du texte concerné
+        if not textes:
+            docs = iter(())
+        elif cache is None:
+            try:
+                model, nom_du_modele = loader.load(langue, taille_modele, exclude=exclude)
+                docs = analyser_textes(model, textes, batch_size=batch_size)
+            except Exception as e:
+                docs = iter([e] * len(textes))
+        else:
+            # Le modèle n'est chargé que si un texte du groupe est absent du cache
+            docs = iter(cache.analyser(textes, nom_du_modele, exclude,
+                                       lambda langue=langue: loader.load(langue, taille_modele, exclude=exclude)[0],
+                                       batch_size=batch_size))
+
+        for (position, transcription), (cle, entree), valides, analyse in zip(groupe, entrees, en_cache, a_analyser):
+            try:
+                contexte = None
+                if analyse:
+                    doc = next(docs)
+                    if isinstance(doc, Exception):
+                        raise doc
+                    contexte = ContexteExtraction(doc, langue, transcription["tache"],
+                                                  transcription["texte_original"], transcription.get("pretraitement"),
+                                                  transcription.get("interventions"))
+                par_extracteur = calculer_extracteurs(contexte, extracteurs, valides)
+                if cache_resultats is not None:
+                    cache_resultats.reutilises += len(valides)
+                    cache_resultats.recalcules += len(extracteurs) - len(valides)
+                    cache_resultats.ecrire(cle, entree, par_extracteur, extracteurs)
+                variables = assembler_sorties(par_extracteur, selection)
+                yield position, transcription, construire_sortie(transcription, nom_du_modele, variables), None
+            except Exception as e:
+                yield position, transcription, None, f"{type(e).__name__}: {e}"
+
+# État propre à chaque processus de travail, rempli une seule fois par `_initialiser_travailleur`
+_etat_travailleur = {}
+
+# Compteurs de chaque cache, renvoyés par les processus de travail et additionnés dans le processus principal
+compteurs_caches = {
+    "analyses": ("succes", "echecs"),
+    "resultats": ("reutilises", "recalcules"),
+    "inferences": ("succes", "echecs"),
+}
+
+def _compteurs_travailleur():
+    """Relève les compteurs des caches du processus de travail : {cache: {compteur: valeur}}."""
+    caches = {"analyses": _etat_travailleur.get("cache"), "resultats": _etat_travailleur.get("cache_resultats"),
+              "inferences": gestionnaire.cache}
+    return {nom: {compteur: getattr(cache, compteur) for compteur in compteurs_caches[nom]}
+            for nom, cache in caches.items() if cache is not None}
+
+def _initialiser_travailleur(taille_modele, noms_extracteurs, selection, langues_corpus, batch_size, dossier_cache=None,
+                             dossier_cache_resultats=None, chemin_cache_inferences=None, afficher_modeles=False):
+    """
+    Prépare un processus de travail : le modèle spaCy de chaque langue, les bases de normes et les
+    modèles HuggingFace sont chargés une seule fois, puis réutilisés pour tous les documents du processus.
+    Avec un cache d'analyses, le modèle spaCy n'est chargé qu'au premier texte absent du cache.
+    """
+    try:
+        import torch
+        # Chaque processus utilise un seul thread pour ne pas surcharger les cœurs
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    if chemin_cache_inferences:
+        gestionnaire.activer_cache(CacheInferences(chemin_cache_inferences))
+    extracteurs = [REGISTRE[nom] for nom in noms_extracteurs]
+    loader = SpaCyModelLoader()
+    exclude = composants_a_exclure(besoins_des_extracteurs(extracteurs))
+    # Un échec de préchargement ne doit pas empêcher le démarrage du processus : l'erreur sera
+    # signalée pour chaque document au moment où la ressource est réellement utilisée
+    try:
+        for langue in langues_corpus:
+            if langue in langues.values() and dossier_cache is None and dossier_cache_resultats is None:
+                loader.load(langue, taille_modele, exclude=exclude)
+        precharger_ressources(extracteurs, langues_corpus)
+    except Exception as e:
+        print(f"Préchargement incomplet dans le processus {os.getpid()} : {type(e).__name__}: {e}")
+    if afficher_modeles:
+        loader.display_loaded_models()
+    _etat_travailleur.update({
+        "taille_modele": taille_modele,
+        "extracteurs": extracteurs,
+        "selection": selection,
+        "batch_size": batch_size,
+        "loader": loader,
+        "cache": CacheAnalyses(dossier_cache) if dossier_cache else None,
+        "cache_resultats": CacheResultats(dossier_cache_resultats) if dossier_cache_resultats else None,
+    })
+
+def _traiter_lot(lot):
+    """
+    Extrait les variables d'un lot de transcriptions dans un processus de travail.
+
+    Seules les variables (ou le message d'erreur), les mots hors vocabulaire des bases de normes et
+    l'évolution des compteurs des caches pendant le lot sont renvoyés au processus principal, pas les Doc spaCy.
+    """
+    positions = [position for position, _ in lot]
+    resultats = []
+    avant = _compteurs_travailleur()
+    try:
+        for position_lot, _, output_data, erreur in extraire_corpus(
+                [transcription for _, transcription in lot], _etat_travailleur["taille_modele"],
+                _etat_travailleur["extracteurs"], _etat_travailleur["selection"],
+                batch_size=_etat_travailleur["batch_size"], loader=_etat_travailleur["loader"],
+                cache=_etat_travailleur["cache"], cache_resultats=_etat_travailleur["cache_resultats"]):
+            resultats.append((positions[position_lot], output_data, erreur))
+    except Exception as e:
+        # Une erreur hors d'un document (chargement du modèle, analyse spaCy) n'invalide que ce lot
+        traitees = {position for position, _, _ in resultats}
+        resultats.extend((position, None, f"{type(e).__name__}: {e}")
+                         for position in positions if position not in traitees)
+    compteurs = {nom: {compteur: valeur - avant[nom][compteur] for compteur, valeur in valeurs.items()}
+                 for nom, valeurs in _compteurs_travailleur().items()}
+    return resultats, extraire_hors_vocabulaire(), compteurs
+
+def extraire_corpus_parallele(transcriptions, taille_modele, extracteurs, selection=None, batch_size=64, workers=2,
+                              dossier_cache=None, dossier_cache_resultats=None, chemin_cache_inferences=None,
+                              afficher_modeles=False, caches=None):
+    """
+    Extrait les variables d'un ensemble de transcriptions avec plusieurs processus de travail.
+
+    Chaque processus charge les modèles et les bases de normes une seule fois, puis traite des lots de
+    transcriptions pris dans une file commune. Les résultats sont rendus dans l'ordre des transcriptions,
+    quel que soit le nombre de processus, et une erreur dans une transcription n'interrompt pas le corpus.
+
+    Args:
+        transcriptions (list): Les transcriptions retournées par `preparer_transcription`.
+        taille_modele (str): La taille du modèle spaCy ('sm', 'md', 'lg' ou 'trf').
+        extracteurs (list): Les extracteurs à exécuter, tels que retournés par `selectionner_extracteurs`.
+        selection (set): Les noms des extracteurs dont les variables sont conservées dans la sortie (optionnel).
+        batch_size (int): Le nombre maximal de textes envoyés ensemble au modèle spaCy.
+        workers (int): Le nombre de processus de travail.
+        dossier_cache (str): Le dossier du cache persistant des analyses spaCy, partagé par les processus (optionnel).
+        dossier_cache_resultats (str): Le dossier du cache persistant des variables par extracteur (optionnel).
+        chemin_cache_inferences (str): La base SQLite du cache des étiquettes d'émotion et de sentiment (optionnel).
+        afficher_modeles (bool): Affiche les modèles spaCy préchargés par chaque processus.
+        caches (dict): Les caches du processus principal {"analyses", "resultats", "inferences"}, auxquels
+                       les compteurs des processus de travail sont ajoutés (optionnel).
+
+    Yields:
+        tuple: (position de la transcription, transcription, variables ou None, message d'erreur ou None).
+    """
+    # Des lots assez petits pour répartir la charge entre les processus
+    taille_lot = max(1, min(batch_size, math.ceil(len(transcriptions) / (workers * 4))))
+    indexees = list(enumerate(transcriptions))
+    lots = [indexees[debut:debut + taille_lot] for debut in range(0, len(indexees), taille_lot)]
+    langues_corpus = list(dict.fromkeys(transcription["langue"] for transcription in transcriptions))
+    initargs = (taille_modele, [ext.nom for ext in extracteurs], selection, langues_corpus, batch_size, dossier_cache,
+                dossier_cache_resultats, chemin_cache_inferences, afficher_modeles)
+
+    with multiprocessing.Pool(processes=workers, initializer=_initialiser_travailleur, initargs=initargs) as pool:
+        # imap rend les lots dans l'ordre de soumission
+        for resultats, hors_vocabulaire, compteurs in pool.imap(_traiter_lot, lots):
+            fusionner_hors_vocabulaire(hors_vocabulaire)
+            for nom, valeurs in compteurs.items():
+                cache = (caches or {}).get(nom)
+                if cache is not None:
+                    for compteur, valeur in valeurs.items():
+                        setattr(cache, compteur, getattr(cache, compteur) + valeur)
+            for position, output_data, erreur in resultats:
+                yield position, transcriptions[position], output_data, erreur
@@ -1,4 +1,64 @@
 import spacy
+from .Marqueurs_transcription import preparer_modele
+
+# Composants spaCy nécessaires pour chaque besoin déclaré par les extracteurs de variables
+composants_par_besoin = {
+    "tokens": set(),
+    "tagger": {"tok2vec", "transformer", "tagger", "morphologizer", "attribute_ruler", "lemmatizer"},
+    "parser": {"tok2vec", "transformer", "parser"},
+    "vectors": {"tok2vec", "transformer"},
+}
+
+# Composants présents dans les modèles sm, md, lg et trf anglais et français
+composants_connus = ["tok2vec", "transformer", "tagger", "morphologizer", "attribute_ruler",
+                     "lemmatizer", "parser", "senter", "ner"]
+
+def composants_a_exclure(besoins):
+    """
+    Détermine les composants spaCy qui peuvent être exclus du chargement pour un ensemble de besoins.
+
+    Args:
+        besoins (set): Les besoins des extracteurs sélectionnés ('tokens', 'tagger', 'parser', 'vectors', ...).
+                       Les besoins sans lien avec spaCy ('transformer', 'normes') sont ignorés.
+
+    Returns:
+        list: La liste des composants à passer à `spacy.load(..., exclude=...)`.
+    """
+    necessaires = set()
+    for besoin in besoins:
+        necessaires |= composants_par_besoin.get(besoin, set())
+    return [composant for composant in composants_connus if composant not in necessaires]
+
+def analyser_textes(model, textes, batch_size=64):
+    """
+    Analyse des textes par lots avec `model.pipe`, sans qu'un texte invalide n'interrompe les suivants.
+
+    Une erreur dans un lot arrête le générateur de `model.pipe` : les textes de ce lot sont alors analysés
+    un par un, pour ne signaler que le texte fautif, puis l'analyse par lots reprend au lot suivant.
+
+    Args:
+        model (spacy.Language): Le modèle spaCy.
+        textes (list): Les textes à analyser.
+        batch_size (int): Le nombre de textes envoyés ensemble au modèle spaCy.
+
+    Yields:
+        Doc ou Exception: L'analyse de chaque texte, ou l'erreur levée par le modèle, dans l'ordre des textes.
+    """
+    debut = 0
+    while debut < len(textes):
+        try:
+            for doc in model.pipe(textes[debut:], batch_size=batch_size):
+                debut += 1
+                yield doc
+        except Exception:
+            fin = min(debut + batch_size, len(textes))
+            for texte in textes[debut:fin]:
+                try:
+                    doc = model(texte)
+                except Exception as e:
+                    doc = e
+                yield doc
+            debut = fin
 
 class ModelNotDownloadedException(Exception):
     """Exception personnalisée levée lorsqu'un modèle n'est pas téléchargé."""
@@ -23,17 +83,26 @@ class SpaCyModelLoader:
             },
         }
 
-    def load(self, langue, model_size):
+    def load(self, langue, model_size, exclude=None):
         """
-        ...
+        Charge le modèle spaCy correspondant à la langue et à la taille demandées.
+
+        Args:
+            langue (str): La langue du modèle ('Francais' ou 'English').
+            model_size (str): La taille du modèle ('sm', 'md', 'lg' ou 'trf').
+            exclude (list): Les composants du pipeline à ne pas charger (optionnel).
+
+        Returns:
+            tuple: Le modèle chargé et son nom complet, ou None si la langue ou la taille n'est pas valide.
         """
         if langue in self.model_dict:
             model_name = self.model_dict[langue].get(model_size)
         
             if model_name:
                 alias = f"{langue.lower()}_{model_size}"
-                self._load_model(model_name, alias=alias)
-                self.display_loaded_models()
+                # Le modèle n'est rechargé que si les composants exclus ont changé
+                if self.models.get(alias, {}).get("exclude") != list(exclude or []):
+                    self._load_model(model_name, alias=alias, exclude=exclude)
                 return self.get_model(alias), self.models[alias]["full_name"]
             else:
                 print("Taille de modèle non valide. Les tailles valides sont : sm, md, lg, trf.")
@@ -41,14 +110,20 @@ class SpaCyModelLoader:
             print("Langue non reconnue, contactez l'administrateur du programme pour ajouter votre langue.")
         return None
     
-    def _load_model(self, model_name: str, alias: str = None) -> None:
-        """Charge le modèle SpaCy spécifié."""
+    def get_model_name(self, langue, model_size):
+        """Retourne le nom du modèle spaCy correspondant à la langue et à la taille, sans le charger."""
+        return self.model_dict.get(langue, {}).get(model_size)
+
+    def _load_model(self, model_name: str, alias: str = None, exclude: list = None) -> None:
+        """Charge le modèle SpaCy spécifié, sans les composants exclus, et le prépare pour les marqueurs de transcription."""
         alias = alias or model_name
+        exclude = list(exclude or [])
         try:
-            model = spacy.load(model_name)
+            model = preparer_modele(spacy.load(model_name, exclude=exclude))
             self.models[alias] = {
                 "model": model,
-                "full_name": model_name
+                "full_name": model_name,
+                "exclude": exclude
             }
         except Exception as e:
             raise ModelNotDownloadedException(f"Erreur lors du chargement du modèle '{model_name}': {e}")
@@ -62,7 +137,7 @@ class SpaCyModelLoader:
         if self.models:
             print("Modèles chargés avec succès :")
             for alias, model_info in self.models.items():
-                print(f"- Nom personnalisé : {alias}, Modèle : {model_info['full_name']}")
+                print(f"- Nom personnalisé : {alias}, Modèle : {model_info['full_name']}, Composants : {model_info['model'].pipe_names}")
         else:
             print("Aucun modèle chargé.")
 
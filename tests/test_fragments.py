@@ -0,0 +1,41 @@
+import spacy
+from lingua_extraction import Mecanique_de_production_de_la_parole as mecanique
+from lingua_extraction.Contexte_extraction import ContexteExtraction
+from lingua_extraction.Marqueurs_transcription import preparer_modele
+from lingua_extraction.Mecanique_de_production_de_la_parole import detecter_fragments
+from lingua_extraction.Registre_variables import _fragments
+
+nlp = preparer_modele(spacy.blank("en"))
+
+
+def _repetitions(texte):
+    contexte = ContexteExtraction.depuis_texte(texte, nlp, "English")
+    return [(fragment["fragment"], fragment["mot"]) for fragment in detecter_fragments(contexte)
+            if fragment["type"] == "repetition"]
+
+
+def test_mots_vides_prefixes_du_mot_suivant_ignores():
+    assert _repetitions("she sat on one chair and we went to today so some he helps") == []
+
+
+def test_repetition_malgre_une_pause_remplie():
+    assert _repetitions("the boy will cook uh cookie") == [("cook", "cookie")]
+
+
+def test_seul_le_mot_suivant_est_compare():
+    assert _repetitions("cook the cookie") == []
+
+
+def test_couverture_limitee_aux_mots_cherches(tmp_path, monkeypatch):
+    monkeypatch.setenv("LINGUA_NORMES_COMPILEES", str(tmp_path))
+    monkeypatch.setattr(mecanique, "_source_lexique",
+                        lambda langue: ("test", "empreinte", lambda: ["the", "boy", "has", "cookies"]))
+    mecanique.charger_lexique_valide.cache_clear()
+    try:
+        contexte = ContexteExtraction.depuis_texte("the boy has 3 cookies and a", nlp, "English")
+        resultats = _fragments(contexte, {})
+    finally:
+        mecanique.charger_lexique_valide.cache_clear()
+    # Le nombre « 3 » compte parmi les fragments mais pas dans la couverture : 4 mots trouvés sur 6 cherchés
+    assert resultats["Nombre_de_fragments"] == 3
+    assert resultats["Couverture_lexique_valide"] == 4 / 6
@@ -0,0 +1,39 @@
+import random
+import spacy
+from lingua_extraction.Caracteristiques_lexicales import calculer_mattr, calculer_mattrs
+from lingua_extraction.Contexte_extraction import ContexteExtraction
+
+nlp = spacy.blank("en")
+
+
+def mattr_de_reference(tokens, taille_fenetre):
+    """Le MATTR recalculé fenêtre par fenêtre, comme avant le calcul incrémental."""
+    ttr_valeurs = []
+    for i in range(len(tokens) - taille_fenetre + 1):
+        fenetre = tokens[i:i + taille_fenetre]
+        ttr_valeurs.append(len(set(fenetre)) / len(fenetre))
+    return sum(ttr_valeurs) / len(ttr_valeurs) if ttr_valeurs else 0
+
+
+def _contexte(texte):
+    return ContexteExtraction.depuis_texte(texte, nlp, "English")
+
+
+def test_identique_au_calcul_par_fenetre():
+    generateur = random.Random(0)
+    vocabulaire = ["the", "boy", "girl", "cookie", "jar", "stool", "water", "sink", "mother", "dish", "is", "a"]
+    tailles = [1, 3, 10, 25, 40]
+    for _ in range(200):
+        mots = [generateur.choice(vocabulaire[:generateur.randint(2, len(vocabulaire))])
+                for _ in range(generateur.randint(0, 150))]
+        contexte = _contexte(" ".join(mots))
+        mattrs = calculer_mattrs(contexte, tailles)
+        for taille in tailles:
+            # Égalité exacte : les TTR sont additionnés par `sum`, comme dans le calcul de référence
+            assert mattrs[taille] == mattr_de_reference(contexte.tokens_alpha, taille)
+
+
+def test_texte_plus_court_que_la_fenetre():
+    contexte = _contexte("the boy, the girl")
+    assert calculer_mattrs(contexte, [10, 2]) == {10: 0, 2: mattr_de_reference(["the", "boy", "the", "girl"], 2)}
+    assert calculer_mattr(contexte, 10) == 0
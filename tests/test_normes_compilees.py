@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+import pytest
+from lingua_extraction import Mecanique_de_production_de_la_parole as mecanique
+from lingua_extraction.Normes_compilees import NormesCompilees, importer_normes
+
+mots_du_lexique = [f"mot{numero}" for numero in range(20000)]
+
+
+def _importer(dossier, chemin, lignes):
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write("ortho\tfreqfilms2\n" + "".join(f"{mot}\t{valeur}\n" for mot, valeur in lignes))
+    return importer_normes(chemin, "Francais", "frequence", "ortho", {"SUBTLWF": "freqfilms2"}, destination=dossier)
+
+
+def test_reimportation_pendant_la_lecture(tmp_path):
+    dossier = str(tmp_path / "normes")
+    _importer(dossier, str(tmp_path / "a.tsv"), [("chat", 1), ("chien", 2)])
+    base = os.path.join(dossier, "Francais", "frequence")
+    ancienne = NormesCompilees(base)
+
+    _importer(dossier, str(tmp_path / "b.tsv"), [("maison", 3), ("chat", 4), ("eau", 5)])
+    # Les fichiers déjà projetés en mémoire ne sont ni tronqués ni réécrits
+    assert list(ancienne.vocabulaire) == ["chat", "chien"]
+    assert ancienne.valeurs(["chien"], "SUBTLWF").tolist() == [2]
+    nouvelle = NormesCompilees(base)
+    assert list(nouvelle.vocabulaire) == ["chat", "eau", "maison"]
+    assert nouvelle.valeurs(["chat", "chien"], "SUBTLWF").tolist()[0] == 4
+    # Seules la génération courante et meta.json restent dans le dossier
+    assert sorted(os.listdir(base)) == sorted([nouvelle.meta["generation"], "meta.json"])
+
+
+def _charger_lexique(barriere, file):
+    try:
+        barriere.wait()
+        lexique = mecanique.charger_lexique_valide("English")
+        file.put(bool(lexique.contient(["mot0", "mot19999"]).all()) and not lexique.contient(["absent"])[0])
+    except BaseException as e:
+        file.put(repr(e))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="nécessite le démarrage par fork")
+def test_compilation_simultanee_du_lexique(tmp_path, monkeypatch):
+    monkeypatch.setattr(mecanique, "_source_lexique", lambda langue: ("test", "empreinte", lambda: mots_du_lexique))
+    contexte = multiprocessing.get_context("fork")
+    for essai in range(5):
+        # Démarrage à froid : chaque processus trouve le lexique absent et le compile en même temps
+        monkeypatch.setenv("LINGUA_NORMES_COMPILEES", str(tmp_path / f"essai{essai}"))
+        mecanique.charger_lexique_valide.cache_clear()
+        barriere, file = contexte.Barrier(4), contexte.Queue()
+        processus = [contexte.Process(target=_charger_lexique, args=(barriere, file)) for _ in range(4)]
+        for p in processus:
+            p.start()
+        resultats = [file.get(timeout=60) for _ in processus]
+        for p in processus:
+            p.join(timeout=60)
+        assert resultats == [True] * 4
+        assert [p.exitcode for p in processus] == [0] * 4
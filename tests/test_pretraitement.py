@@ -0,0 +1,53 @@
+from lingua_extraction.Preprocessing.Pretraitement import pretraiter
+
+
+def test_marqueurs_comptes_et_retires():
+    pretraitement = pretraiter("the =boy @is &taking #a %cookie $now")
+    assert pretraitement.texte == "the boy is taking a cookie now"
+    assert pretraitement.disfluences == {"=": 1, "@": 1, "&": 1, "#": 1, "%": 1, "$": 1}
+
+
+def test_mots_sans_crochets_ni_ponctuation():
+    pretraitement = pretraiter("Well, the [pause] boy's stool... is tipping-over.")
+    assert pretraitement.mots == ["Well", "the", "boy's", "stool", "is", "tipping-over"]
+    assert pretraitement.nombre_de_mots == 6
+
+
+def test_mot_coupe_par_un_marqueur():
+    pretraitement = pretraiter("the wa=ter is =over=flowing")
+    assert pretraitement.texte == "the water is overflowing"
+    assert pretraitement.mots == ["the", "water", "is", "overflowing"]
+    assert pretraitement.disfluences["="] == 3
+
+
+def test_position_originale_apres_les_marqueurs():
+    texte_brut = "the =boy @@is wa=ter"
+    pretraitement = pretraiter(texte_brut)
+    texte = pretraitement.texte
+    assert texte == "the boy is water"
+    for position, caractere in enumerate(texte):
+        assert texte_brut[pretraitement.position_originale(position)] == caractere
+
+
+def test_position_originale_sans_marqueur():
+    pretraitement = pretraiter("the boy is taking a cookie")
+    assert [pretraitement.position_originale(position) for position in (0, 4, 25)] == [0, 4, 25]
+
+
+def test_intervalle_original_d_un_mot_coupe():
+    texte_brut = "the =boy is wa=ter."
+    pretraitement = pretraiter(texte_brut)
+    debut = pretraitement.texte.index("water")
+    intervalle = pretraitement.intervalle_original(debut, debut + len("water"))
+    assert intervalle == (12, 18)
+    assert texte_brut[slice(*intervalle)] == "wa=ter"
+
+
+def test_intervalle_original_d_une_phrase():
+    texte_brut = "#the =boy falls. the @girl laughs."
+    pretraitement = pretraiter(texte_brut)
+    texte = pretraitement.texte
+    debut = texte.index("the girl")
+    debut_brut, fin_brut = pretraitement.intervalle_original(debut, len(texte))
+    assert texte_brut[debut_brut:fin_brut] == "the @girl laughs."
+    assert pretraitement.intervalle_original(0, texte.index(".") + 1) == (1, texte_brut.index(".") + 1)